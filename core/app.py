@@ -18,9 +18,9 @@ class SystemMonitorX:
         """Initialisiert die Anwendung"""
         self.config_manager = ConfigManager()
         self.theme_manager = ThemeManager()
-        self.system_monitor = SystemMonitor()
+        self.system_monitor = SystemMonitor(self.config_manager)
         self.widget_manager = WidgetManager(self.config_manager, self.theme_manager)
-        self.data_logger = DataLogger()
+        self.data_logger = DataLogger(config_manager=self.config_manager)
         self.tray_manager = None
         self.dashboard = None
         self.root = None
@@ -69,7 +69,7 @@ class SystemMonitorX:
         if self.tray_manager:
             self.tray_manager.stop()
         if self.data_logger:
-            self.data_logger.stop_logging()
+            self.data_logger.close()
             
     def _setup_tray(self):
         """Richtet die Tray-Integration ein"""
@@ -0,0 +1,262 @@
+"""
+Komprimiertes Block-Format für die Log-Daten von SystemMonitorX
+Zeitstempel als Delta-of-Delta, Messwerte als XOR zum Vorgänger, konstante Spalten einmal pro Block
+"""
+
+import json
+import struct
+import zlib
+import numpy as np
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional, Sequence, Tuple
+from .log_rotation import open_log_file, reopen_truncated
+
+# Aufbau einer Block-Datei:
+#   0 magic (4 Bytes) | 4 version (u16) | 6 reserviert (u16) | 8 header_len (u32) | 12 JSON-Header (Spalten)
+#   danach Blöcke: magic (4 Bytes) | payload_len (u32) | row_count (u32) | crc32 (u32)
+#                  | erster Zeitstempel (f64) | letzter Zeitstempel (f64) | zlib-Payload
+MAGIC = b'SMXT'
+BLOCK_MAGIC = b'SMXB'
+VERSION = 2
+# Version 1 speicherte Zeitstempel als gerundete Mikrosekunden, ab Version 2 exakt (Bitmuster des float64)
+MICROSECOND_VERSION = 1
+BLOCK_HEADER = struct.Struct('<4sIIIdd')
+FILE_SUFFIX = '.smxt'
+
+# Numerische Spalten (float64) und Textspalten eines Log-Eintrags
+NUMERIC_COLUMNS = [
+    'cpu_percent', 'cpu_count', 'memory_percent', 'memory_used_gb', 'memory_total_gb',
+    'disk_percent', 'disk_used_gb', 'disk_total_gb'
+]
+TEXT_COLUMNS = ['platform', 'machine']
+
+# Kodierung einer Spalte im Block
+CONSTANT = 0
+XOR = 1
+
+def _shuffle(values: np.ndarray) -> bytes:
+    """Ordnet die Bytes spaltenweise an (alle ersten Bytes, alle zweiten, ...), damit zlib Nullen zusammenfasst"""
+    return values.view(np.uint8).reshape(-1, values.itemsize).T.tobytes()
+
+def _unshuffle(data: bytes, dtype: str, count: int) -> np.ndarray:
+    """Kehrt _shuffle um"""
+    itemsize = np.dtype(dtype).itemsize
+    raw = np.frombuffer(data, dtype=np.uint8, count=count * itemsize).reshape(itemsize, count)
+    return np.ascontiguousarray(raw.T).view(dtype).reshape(count)
+
+def encode_block(timestamps: np.ndarray, columns: Dict[str, np.ndarray], texts: Dict[str, List[str]]) -> bytes:
+    """Kodiert einen Block (Zeitstempel in Epoch-Sekunden) und gibt die unkomprimierte Payload zurück"""
+    count = len(timestamps)
+    parts = []
+    
+    # Zeitstempel als Bitmuster des float64 (exakt; bei positiven Werten monoton wie die Zeit selbst):
+    # erster Wert, erstes Delta, danach Delta-of-Delta (meist 0 oder klein)
+    bits = np.ascontiguousarray(timestamps, dtype=np.float64).view(np.int64)
+    deltas = np.diff(bits)
+    first_delta = deltas[0] if count > 1 else 0
+    parts.append(struct.pack('<qq', bits[0], first_delta))
+    parts.append(_shuffle(np.diff(deltas)))
+    
+    # Messwerte: konstant (ein Wert) oder XOR zum Vorgänger (gleiche Werte ergeben 0)
+    for name in NUMERIC_COLUMNS:
+        values = np.asarray(columns[name], dtype=np.float64)
+        bits = values.view(np.uint64)
+        if np.all(bits == bits[0]):
+            parts.append(struct.pack('<Bd', CONSTANT, values[0]))
+        else:
+            parts.append(struct.pack('<Bd', XOR, values[0]))
+            parts.append(_shuffle(bits[1:] ^ bits[:-1]))
+            
+    # Textspalten: konstant einmal, sonst als JSON-Liste
+    for name in TEXT_COLUMNS:
+        values = texts[name]
+        if all(value == values[0] for value in values):
+            data = json.dumps(values[0]).encode('utf-8')
+            parts.append(struct.pack('<BI', CONSTANT, len(data)) + data)
+        else:
+            data = json.dumps(values).encode('utf-8')
+            parts.append(struct.pack('<BI', XOR, len(data)) + data)
+            
+    return b''.join(parts)
+
+def decode_block(payload: bytes, count: int, fields: Optional[Sequence[str]] = None,
+                 version: int = VERSION) -> Dict[str, Any]:
+    """Dekodiert eine Payload in Spalten-Arrays (Textspalten als Liste bzw. Einzelwert unter 'constants')
+    
+    version ist die Version der Datei (Zeitstempel von Version 1 sind Mikrosekunden).
+    """
+    offset = 0
+    first, first_delta = struct.unpack_from('<qq', payload, offset)
+    offset += 16
+    dod = _unshuffle(payload[offset:], 'int64', max(0, count - 2))
+    offset += 8 * max(0, count - 2)
+    
+    deltas = np.empty(max(0, count - 1), dtype=np.int64)
+    if count > 1:
+        deltas[0] = first_delta
+        np.cumsum(dod, out=deltas[1:])
+        deltas[1:] += first_delta
+    stamps = np.empty(count, dtype=np.int64)
+    stamps[0] = first
+    np.cumsum(deltas, out=stamps[1:])
+    stamps[1:] += first
+    timestamps = stamps / 1e6 if version == MICROSECOND_VERSION else stamps.view(np.float64)
+    result: Dict[str, Any] = {'timestamp': timestamps}
+    
+    for name in NUMERIC_COLUMNS:
+        kind, value = struct.unpack_from('<Bd', payload, offset)
+        offset += 9
+        if kind == CONSTANT:
+            if fields is None or name in fields:
+                result[name] = np.full(count, value)
+            continue
+        size = 8 * (count - 1)
+        if fields is None or name in fields:
+            bits = np.empty(count, dtype=np.uint64)
+            bits[0] = np.float64(value).view(np.uint64)
+            bits[1:] = _unshuffle(payload[offset:offset + size], 'uint64', count - 1)
+            result[name] = np.bitwise_xor.accumulate(bits).view(np.float64)
+        offset += size
+        
+    constants = {}
+    for name in TEXT_COLUMNS:
+        kind, length = struct.unpack_from('<BI', payload, offset)
+        offset += 5
+        value = json.loads(payload[offset:offset + length].decode('utf-8'))
+        offset += length
+        if fields is not None and name not in fields:
+            continue
+        if kind == CONSTANT:
+            constants[name] = value
+        else:
+            result[name] = value
+    result['constants'] = constants
+    return result
+
+class BlockSegmentWriter:
+    """Hängt Log-Einträge als komprimierte Blöcke an eine Datei an (ein Block pro Schreibvorgang)"""
+    
+    def __init__(self, path: Path, level: int = 6):
+        """Legt die Block-Datei an und schreibt den Header"""
+        self.path = Path(path)
+        self.level = level
+        self.row_count = 0
+        
+        header = json.dumps({'numeric': NUMERIC_COLUMNS, 'text': TEXT_COLUMNS}).encode('utf-8')
+        self.handle = open(self.path, 'wb')
+        self.handle.write(MAGIC + struct.pack('<HHI', VERSION, 0, len(header)) + header)
+        self.handle.flush()
+        
+    def append(self, entries: List[Dict[str, Any]]):
+        """Schreibt Einträge (Zeitstempel als Epoch-Sekunden) als einen Block"""
+        if not entries:
+            return
+        timestamps = np.fromiter((entry['timestamp'] for entry in entries), dtype=float, count=len(entries))
+        columns = {
+            name: np.fromiter((entry.get(name) or 0 for entry in entries), dtype=float, count=len(entries))
+            for name in NUMERIC_COLUMNS
+        }
+        texts = {name: [entry.get(name, '') for entry in entries] for name in TEXT_COLUMNS}
+        
+        payload = zlib.compress(encode_block(timestamps, columns, texts), self.level)
+        header = BLOCK_HEADER.pack(BLOCK_MAGIC, len(payload), len(entries), zlib.crc32(payload),
+                                   timestamps[0], timestamps[-1])
+        offset = self.handle.tell()
+        try:
+            self.handle.write(header + payload)
+            self.handle.flush()
+        except OSError:
+            # Kein halber Block mitten in der Datei: auf die Größe vor dem Block zurücksetzen
+            self.handle = reopen_truncated(self.handle, self.path, offset)
+            raise
+        self.row_count += len(entries)
+        
+    def tell(self) -> int:
+        """Aktuelle Dateigröße in Bytes"""
+        return self.handle.tell() if self.handle else 0
+        
+    def close(self):
+        """Schließt die Block-Datei"""
+        if self.handle:
+            self.handle.close()
+            self.handle = None
+
+def _skip_file_header(handle, path: Path) -> int:
+    """Prüft den Datei-Header, setzt die Position auf den ersten Block und gibt die Version zurück"""
+    prefix = handle.read(12)
+    if len(prefix) < 12 or prefix[:4] != MAGIC:
+        raise ValueError(f"Keine gültige Block-Datei: {path}")
+    version, _, header_len = struct.unpack('<HHI', prefix[4:12])
+    if version > VERSION:
+        raise ValueError(f"Block-Datei mit unbekannter Version {version}: {path}")
+    handle.seek(12 + header_len)
+    return version
+
+def iter_block_headers(path: Path) -> Iterator[Tuple[int, int, float, float]]:
+    """Liefert (Offset der Payload, Zeilen, erster, letzter Zeitstempel) je Block, ohne Payloads zu lesen
+    
+    Ein unvollständiger letzter Block (Abbruch beim Schreiben) beendet die Aufzählung.
+    """
+    with open_log_file(path, 'rb') as handle:
+        _skip_file_header(handle, path)
+        
+        while True:
+            raw = handle.read(BLOCK_HEADER.size)
+            if len(raw) < BLOCK_HEADER.size:
+                return
+            magic, payload_len, count, _, first, last = BLOCK_HEADER.unpack(raw)
+            if magic != BLOCK_MAGIC:
+                return
+            offset = handle.tell()
+            handle.seek(payload_len, 1)
+            if handle.tell() < offset + payload_len:
+                return
+            yield offset, count, first, last
+
+def iter_blocks(path: Path, start: Optional[float] = None, end: Optional[float] = None,
+                fields: Optional[Sequence[str]] = None) -> Iterator[Dict[str, Any]]:
+    """Dekodiert die Blöcke, die den Zeitraum überschneiden, und schneidet sie auf den Zeitraum zu"""
+    with open_log_file(path, 'rb') as handle:
+        version = _skip_file_header(handle, path)
+        
+        while True:
+            raw = handle.read(BLOCK_HEADER.size)
+            if len(raw) < BLOCK_HEADER.size:
+                return
+            magic, payload_len, count, crc, first, last = BLOCK_HEADER.unpack(raw)
+            if magic != BLOCK_MAGIC:
+                return
+            if (end is not None and first > end) or (start is not None and last < start):
+                handle.seek(payload_len, 1)
+                continue
+                
+            payload = handle.read(payload_len)
+            if len(payload) < payload_len or zlib.crc32(payload) != crc:
+                # Unvollständiger letzter Block
+                return
+            block = decode_block(zlib.decompress(payload), count, fields, version)
+            
+            timestamps = block['timestamp']
+            lo = 0 if start is None else int(np.searchsorted(timestamps, start, side='left'))
+            hi = count if end is None else int(np.searchsorted(timestamps, end, side='right'))
+            if lo > 0 or hi < count:
+                for name, values in block.items():
+                    if name != 'constants':
+                        block[name] = values[lo:hi]
+            yield block
+
+def read_block_file(path: Path, start: Optional[float] = None, end: Optional[float] = None,
+                    fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """Liest einen Zeitraum einer Block-Datei als zusammenhängende Spalten-Arrays"""
+    blocks = [block for block in iter_blocks(path, start, end, fields) if len(block['timestamp'])]
+    if not blocks:
+        return {'timestamp': np.empty(0), 'constants': {}}
+    result = {'constants': blocks[-1]['constants']}
+    for name in blocks[0]:
+        if name == 'constants':
+            continue
+        if isinstance(blocks[0][name], list):
+            result[name] = [value for block in blocks for value in block[name]]
+        else:
+            result[name] = np.concatenate([block[name] for block in blocks])
+    return result
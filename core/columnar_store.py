@@ -0,0 +1,164 @@
+"""
+Binäres spaltenbasiertes Log-Format für SystemMonitorX
+Segment-Dateien mit festen float64/int64-Spalten, lesbar per np.memmap ohne Parsen
+"""
+
+import json
+import os
+import struct
+import numpy as np
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+from .log_rotation import is_compressed, open_log_file
+
+# Aufbau einer Segment-Datei:
+#   0  magic (4 Bytes) | 4 version (u16) | 6 reserviert (u16) | 8 row_count (u64) | 16 header_len (u32)
+#   20 JSON-Header (Spalten, Kapazität, Konstanten)
+#   DATA_OFFSET: Spalte 0 (capacity * 8 Bytes), Spalte 1, ...
+MAGIC = b'SMXC'
+VERSION = 1
+ROW_COUNT_OFFSET = 8
+DATA_OFFSET = 4096
+FILE_SUFFIX = '.smxc'
+
+# Numerische Spalten eines Log-Eintrags (platform/machine stehen einmal im Header)
+COLUMNS: List[Tuple[str, str]] = [
+    ('timestamp', 'float64'),
+    ('cpu_percent', 'float64'),
+    ('cpu_count', 'int64'),
+    ('memory_percent', 'float64'),
+    ('memory_used_gb', 'float64'),
+    ('memory_total_gb', 'float64'),
+    ('disk_percent', 'float64'),
+    ('disk_used_gb', 'float64'),
+    ('disk_total_gb', 'float64')
+]
+
+class ColumnarSegmentWriter:
+    """Schreibt Log-Einträge spaltenweise in eine Segment-Datei mit fester Kapazität"""
+    
+    def __init__(self, path: Path, capacity: int = 21600, constants: Optional[Dict[str, Any]] = None,
+                 columns: Sequence[Tuple[str, str]] = COLUMNS, fsync: bool = True):
+        """Legt die Segment-Datei an und reserviert Platz für alle Spalten
+        
+        Mit fsync werden die Spaltendaten vor jeder neuen Zeilenanzahl auf die Platte geschrieben.
+        """
+        self.path = Path(path)
+        self.capacity = capacity
+        self.fsync = fsync
+        self.columns = list(columns)
+        self.constants = constants or {}
+        self.row_count = 0
+        
+        header = json.dumps({
+            'columns': self.columns,
+            'capacity': self.capacity,
+            'constants': self.constants
+        }).encode('utf-8')
+        if 20 + len(header) > DATA_OFFSET:
+            raise ValueError("Header der Segment-Datei zu groß")
+            
+        self.handle = open(self.path, 'w+b')
+        self.handle.write(MAGIC + struct.pack('<HHQI', VERSION, 0, 0, len(header)) + header)
+        self.handle.truncate(DATA_OFFSET + len(self.columns) * self.capacity * 8)
+        self.handle.flush()
+        
+    @property
+    def is_full(self) -> bool:
+        """Gibt zurück, ob das Segment keine weiteren Zeilen aufnehmen kann"""
+        return self.row_count >= self.capacity
+        
+    def append(self, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Hängt Einträge an und gibt die Einträge zurück, die nicht mehr ins Segment passen"""
+        count = min(len(entries), self.capacity - self.row_count)
+        if count <= 0:
+            return entries
+            
+        batch = entries[:count]
+        for i, (name, dtype) in enumerate(self.columns):
+            values = np.fromiter((entry[name] for entry in batch), dtype=dtype, count=count)
+            self.handle.seek(DATA_OFFSET + (i * self.capacity + self.row_count) * 8)
+            self.handle.write(values.tobytes())
+            
+        # Zeilenanzahl erst aktualisieren, wenn die Daten auf der Platte sind; sonst könnte nach einem
+        # Stromausfall die neue Anzahl auf vorab allozierte Nullen zeigen
+        self.handle.flush()
+        if self.fsync:
+            getattr(os, 'fdatasync', os.fsync)(self.handle.fileno())
+        self.row_count += count
+        self.handle.seek(ROW_COUNT_OFFSET)
+        self.handle.write(struct.pack('<Q', self.row_count))
+        self.handle.flush()
+        return entries[count:]
+        
+    def close(self):
+        """Schließt die Segment-Datei"""
+        if self.handle:
+            self.handle.close()
+            self.handle = None
+
+def read_segment_header(path: Path) -> Dict[str, Any]:
+    """Liest den Header einer Segment-Datei (auch komprimiert)"""
+    with open_log_file(path, 'rb') as handle:
+        prefix = handle.read(20)
+        if len(prefix) < 20 or prefix[:4] != MAGIC:
+            raise ValueError(f"Keine gültige Segment-Datei: {path}")
+        version, _, row_count, header_len = struct.unpack('<HHQI', prefix[4:20])
+        header = json.loads(handle.read(header_len).decode('utf-8'))
+        
+    header['version'] = version
+    header['row_count'] = row_count
+    return header
+
+def read_segment(path: Path, start: Optional[float] = None, end: Optional[float] = None,
+                 fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """Liest einen Zeitraum eines Segments als Spalten-Arrays (Views auf die gemappte Datei, keine Kopie)
+    
+    Komprimierte Segmente werden einmal entpackt, die Spalten sind dann Views auf diesen Puffer.
+    """
+    header = read_segment_header(path)
+    capacity = header['capacity']
+    row_count = min(header['row_count'], capacity)
+    columns = {name: (i, dtype) for i, (name, dtype) in enumerate(header['columns'])}
+    
+    buffer = None
+    if is_compressed(path):
+        with open_log_file(path, 'rb') as handle:
+            buffer = handle.read()
+            
+    def column(name: str) -> np.ndarray:
+        index, dtype = columns[name]
+        offset = DATA_OFFSET + index * capacity * 8
+        if row_count == 0:
+            return np.empty(0, dtype=dtype)
+        if buffer is not None:
+            return np.frombuffer(buffer, dtype=dtype, count=row_count, offset=offset)
+        return np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=(row_count,))
+        
+    timestamps = column('timestamp')
+    lo = 0 if start is None else int(np.searchsorted(timestamps, start, side='left'))
+    hi = row_count if end is None else int(np.searchsorted(timestamps, end, side='right'))
+    
+    result = {'timestamp': timestamps[lo:hi]}
+    for name in (fields if fields is not None else columns):
+        if name != 'timestamp' and name in columns:
+            result[name] = column(name)[lo:hi]
+    result['constants'] = header.get('constants', {})
+    return result
+
+def read_segments(paths: Sequence[Path], start: Optional[float] = None, end: Optional[float] = None,
+                  fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """Liest mehrere Segmente einer Sitzung und hängt die Spalten zeitlich aneinander"""
+    parts = [read_segment(path, start, end, fields) for path in paths]
+    parts = [part for part in parts if len(part['timestamp'])]
+    if not parts:
+        return {'timestamp': np.empty(0), 'constants': {}}
+    if len(parts) == 1:
+        return parts[0]
+        
+    parts.sort(key=lambda part: part['timestamp'][0])
+    result = {'constants': parts[-1]['constants']}
+    for name in parts[0]:
+        if name != 'constants':
+            result[name] = np.concatenate([part[name] for part in parts])
+    return result
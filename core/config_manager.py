@@ -45,7 +45,8 @@ class ConfigManager:
                 "show_logging_controls": True,
                 "show_graph_controls": True,
                 "auto_start_logging": False,
-                "log_format": "both"  # csv, json, both
+                "log_format": "both",  # csv, json, jsonl, binary, compressed, sqlite, both (csv + jsonl)
+                "prewarm_graphs": True  # matplotlib nach dem Start im Hintergrund laden
             },
             "monitoring": {
                 "cpu_enabled": True,
@@ -60,7 +61,15 @@ class ConfigManager:
                 "auto_start": False,
                 "buffer_size": 1000,
                 "save_interval": 60,  # Sekunden
-                "max_log_files": 10
+                "max_buffered_records": 100000,  # Obergrenze, falls das Schreiben fehlschlägt
+                "overflow_policy": "spill",  # drop_oldest, downsample, spill
+                "max_log_files": 10,
+                "max_file_size_mb": 50,  # Neue Datei ab dieser Größe
+                "rotate_interval": 86400,  # Sekunden bis zur nächsten Datei
+                "max_total_size_mb": 500,
+                "compression": "gzip",  # gzip, lzma, none
+                "fsync": "always",  # always, interval, never
+                "fsync_interval": 60  # Sekunden (bei fsync = interval)
             },
             "tray": {
                 "enabled": True,
@@ -0,0 +1,122 @@
+"""
+Sparse-Index für CSV-Logs von SystemMonitorX
+Begleitdatei mit Byte-Offset und Zeitstempel jeder N-ten Zeile, damit Leser direkt zum Zeitraum springen
+"""
+
+import struct
+import numpy as np
+from pathlib import Path
+from typing import Optional
+from .log_rotation import open_log_file, reopen_truncated, sidecar_path
+
+# Aufbau der Index-Datei:
+#   0 magic (4 Bytes) | 4 Intervall in Zeilen (u32)
+#   8 Einträge: Byte-Offset der Zeile (u64), Zeitstempel in Epoch-Sekunden (f64)
+MAGIC = b'SMXI'
+INDEX_SUFFIX = '.idx'
+HEADER_SIZE = 8
+ENTRY = struct.Struct('<Qd')
+ENTRY_DTYPE = np.dtype([('offset', '<u8'), ('timestamp', '<f8')])
+
+# Standard-Abstand zwischen zwei Index-Einträgen
+DEFAULT_INTERVAL = 1000
+
+def index_path(csv_path: Path) -> Path:
+    """Gibt den Pfad der Index-Datei zu einer (auch komprimierten) CSV-Datei zurück"""
+    return sidecar_path(csv_path, INDEX_SUFFIX)
+
+class CsvIndexWriter:
+    """Schreibt den Index einer CSV-Datei mit, während Zeilen angehängt werden"""
+    
+    def __init__(self, csv_path: Path, interval: int = DEFAULT_INTERVAL):
+        """Legt die Index-Datei an"""
+        self.path = index_path(csv_path)
+        self.interval = max(1, interval)
+        self.row_count = 0
+        self.handle = open(self.path, 'wb')
+        self.handle.write(MAGIC + struct.pack('<I', self.interval))
+        self.handle.flush()
+        
+    def add_rows(self, offsets, timestamps):
+        """Nimmt geschriebene Zeilen (Byte-Offset und Zeitstempel in Epoch-Sekunden) auf und indexiert jede N-te"""
+        entries = []
+        row_count = self.row_count
+        for offset, timestamp in zip(offsets, timestamps):
+            if row_count % self.interval == 0:
+                entries.append(ENTRY.pack(offset, timestamp))
+            row_count += 1
+        if entries:
+            self.handle.write(b''.join(entries))
+            self.handle.flush()
+        self.row_count = row_count
+        
+    def tell(self) -> int:
+        """Aktuelle Größe der Index-Datei in Bytes"""
+        return self.handle.tell()
+        
+    def truncate(self, size: int, row_count: int):
+        """Setzt den Index nach einem fehlgeschlagenen Schreibvorgang auf Größe und Zeilenanzahl davor zurück"""
+        self.handle = reopen_truncated(self.handle, self.path, size)
+        self.row_count = row_count
+        
+    def close(self):
+        """Schließt die Index-Datei"""
+        if self.handle:
+            self.handle.close()
+            self.handle = None
+
+def read_index(csv_path: Path) -> Optional[np.ndarray]:
+    """Liest den Index einer CSV-Datei (None, wenn keiner existiert oder er ungültig ist)"""
+    path = index_path(csv_path)
+    if not path.exists():
+        return None
+    data = path.read_bytes()
+    if len(data) < HEADER_SIZE or data[:4] != MAGIC:
+        return None
+    # Ein abgeschnittener letzter Eintrag wird ignoriert
+    count = (len(data) - HEADER_SIZE) // ENTRY_DTYPE.itemsize
+    return np.frombuffer(data, dtype=ENTRY_DTYPE, count=count, offset=HEADER_SIZE)
+
+def build_index(csv_path: Path, interval: int = DEFAULT_INTERVAL) -> Optional[np.ndarray]:
+    """Erstellt den Index einer vorhandenen CSV-Datei mit einem einzigen Lesedurchlauf"""
+    from .log_reader import parse_timestamp
+    entries = []
+    with open_log_file(csv_path, 'rb') as handle:
+        header = handle.readline().decode('utf-8').strip().split(',')
+        if 'timestamp' not in header:
+            return None
+        time_index = header.index('timestamp')
+        offset = handle.tell()
+        row = 0
+        for line in handle:
+            if row % interval == 0:
+                try:
+                    value = line.split(b',')[time_index].decode('utf-8')
+                    entries.append(ENTRY.pack(offset, parse_timestamp(value)))
+                except (ValueError, IndexError):
+                    # Unvollständige letzte Zeile
+                    break
+            offset += len(line)
+            row += 1
+            
+    with open(index_path(csv_path), 'wb') as index_file:
+        index_file.write(MAGIC + struct.pack('<I', interval) + b''.join(entries))
+    return read_index(csv_path)
+
+def load_index(csv_path: Path) -> Optional[np.ndarray]:
+    """Gibt den Index einer CSV-Datei zurück und erstellt ihn beim ersten Lesen älterer Dateien"""
+    index = read_index(csv_path)
+    if index is None:
+        try:
+            index = build_index(csv_path)
+        except Exception as e:
+            print(f"Fehler beim Erstellen des CSV-Index für {Path(csv_path).name}: {e}")
+            return None
+    return index
+
+def find_offset(index: np.ndarray, start: float) -> int:
+    """Gibt den Byte-Offset des letzten Index-Eintrags vor dem Zeitraum zurück (0 = Dateianfang)"""
+    position = int(np.searchsorted(index['timestamp'], start, side='left')) - 1
+    if position < 0:
+        return 0
+    return int(index['offset'][position])
@@ -1,47 +1,196 @@
 """
 Data-Logger für SystemMonitorX
+
+Alte JSON-Logs in JSON Lines umwandeln:
+    python -m core.data_logger --convert-json --log-dir logs
 """
 
+import argparse
 import csv
+import io
 import json
 import os
+import sys
+import tempfile
+import threading
 import time
+import numpy as np
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, Callable, List, Iterator, Optional
 from pathlib import Path
+from .sample import SystemSample
+from . import columnar_store, block_store
+from .sqlite_store import SQLiteLogStore, DEFAULT_FILE as SQLITE_DEFAULT_FILE
+from .csv_index import CsvIndexWriter
+from .rollup_store import RollupStore
+from .log_query import LogQueryEngine, QueryCancelled, check_cancelled, merge_segments
+from .log_recovery import FSYNC_POLICIES, atomic_write, recover_log_dir
+from .log_catalog import LogCatalog
+from . import log_reader
+from .log_rotation import LogCompressor, apply_retention, glob_logs, list_log_files, open_log_file
+from .log_rotation import part_key, reopen_truncated
 
 class DataLogger:
-    """Loggt Systemdaten in CSV und JSON Format"""
+    """Loggt Systemdaten in CSV, JSON, JSON Lines, Binär-, Block- und SQLite-Format"""
+    
+    # Felder eines Log-Eintrags (Reihenfolge = CSV-Spalten)
+    LOG_FIELDS = [
+        'timestamp', 'cpu_percent', 'cpu_count', 'memory_percent',
+        'memory_used_gb', 'memory_total_gb', 'disk_percent',
+        'disk_used_gb', 'disk_total_gb', 'platform', 'machine'
+    ]
+    
+    # Zeilen pro Segment im Binärformat (6 h bei 1 Hz)
+    BINARY_SEGMENT_ROWS = 21600
+    
+    # Gemeinsame Datenbank aller Sitzungen im SQLite-Format
+    SQLITE_FILE = SQLITE_DEFAULT_FILE
+    
+    # Zeitraum für Graphen aus Log-Dateien (Sekunden)
+    GRAPH_RANGE = 86400
+    
+    # Mindestanzahl Punkte, ab der eine Aggregationsstufe statt der Rohdaten gelesen wird
+    MIN_GRAPH_POINTS = 300
     
-    def __init__(self, log_dir: str = "logs"):
+    # Verhalten bei vollem Buffer (z.B. weil das Schreiben dauerhaft fehlschlägt):
+    # drop_oldest: älteste Einträge verwerfen
+    # downsample:  die ältere Hälfte des Buffers auf jeden zweiten Eintrag ausdünnen
+    # spill:       die ältere Hälfte in eine temporäre Datei auslagern (bei Fehler: drop_oldest)
+    OVERFLOW_POLICIES = ("drop_oldest", "downsample", "spill")
+    
+    def __init__(self, log_dir: str = "logs", config_manager=None):
         """Initialisiert den Data-Logger"""
         self.log_dir = Path(log_dir)
         self.log_dir.mkdir(exist_ok=True)
+        self.config_manager = config_manager
         
         self.csv_file = None
         self.json_file = None
+        self.jsonl_file = None
+        self.binary_file = None
+        self.block_file = None
+        self.sqlite_store = None
+        self._sqlite_reader = None
         self.logging_enabled = False
         self.data_buffer = []
-        self.max_buffer_size = 1000  # Maximale Anzahl Einträge im Buffer
+        self.max_buffer_size = 1000  # Einträge, ab denen geschrieben wird (höchstens so viele pro Schreibvorgang)
+        self.save_interval = 60.0  # Sekunden bis zum spätesten Schreiben
+        self.max_buffered_records = 100000  # Obergrenze des Buffers, falls das Schreiben nicht vorankommt
+        self.overflow_policy = "spill"
+        
+        # Rotation und Aufbewahrung
+        self.max_file_size_mb = 50  # Neue Datei ab dieser Größe
+        self.rotate_interval = 86400  # Neue Datei nach dieser Zeit (Sekunden)
+        self.max_log_files = 10
+        self.max_total_size_mb = 500
+        compression = "gzip"
+        
+        # Absturzsicherheit: always, interval oder never
+        self.fsync_policy = "always"
+        self.fsync_interval = 60.0
+        
+        if self.config_manager:
+            self.max_buffer_size = self.config_manager.get_config("logging.buffer_size") or self.max_buffer_size
+            self.save_interval = self.config_manager.get_config("logging.save_interval") or self.save_interval
+            self.max_buffered_records = self.config_manager.get_config("logging.max_buffered_records") or self.max_buffered_records
+            self.overflow_policy = self.config_manager.get_config("logging.overflow_policy") or self.overflow_policy
+            self.max_file_size_mb = self.config_manager.get_config("logging.max_file_size_mb") or self.max_file_size_mb
+            self.rotate_interval = self.config_manager.get_config("logging.rotate_interval") or self.rotate_interval
+            self.max_log_files = self.config_manager.get_config("logging.max_log_files") or self.max_log_files
+            self.max_total_size_mb = self.config_manager.get_config("logging.max_total_size_mb") or self.max_total_size_mb
+            compression = self.config_manager.get_config("logging.compression") or compression
+            self.fsync_policy = self.config_manager.get_config("logging.fsync") or self.fsync_policy
+            self.fsync_interval = self.config_manager.get_config("logging.fsync_interval") or self.fsync_interval
+            
+        if self.fsync_policy not in FSYNC_POLICIES:
+            print(f"Unbekannte fsync-Strategie: {self.fsync_policy}, verwende 'always'")
+            self.fsync_policy = "always"
+            
+        if self.overflow_policy not in self.OVERFLOW_POLICIES:
+            print(f"Unbekannte Überlauf-Strategie: {self.overflow_policy}, verwende 'spill'")
+            self.overflow_policy = "spill"
+        self.max_buffered_records = max(self.max_buffered_records, self.max_buffer_size)
+        
+        self.compressor = LogCompressor(compression)
+        self.rollups = RollupStore(self.log_dir)
+        self.catalog = LogCatalog(self.log_dir, fsync=self.fsync_policy != "never")
+        self.query_engine = LogQueryEngine(self.log_dir)
+        self._rollups_open = False
+        self.format_type = None
+        self._session_stamp = None
+        self._part = 0
+        self._part_started = 0.0
+        self._last_sync = 0.0
+        
+        # Zeitgrenzen und Zeilen des aktuellen Teils (für den Katalog)
+        self._part_first = None
+        self._part_last = None
+        self._part_rows = 0
+        
+        # Offene Datei-Handles (bleiben zwischen den Schreibvorgängen geöffnet)
+        self._csv_handle = None
+        self._csv_writer = None
+        self._csv_row_buffer = None
+        self._csv_offset = 0
+        self._csv_index = None
+        self._jsonl_handle = None
+        self._binary_writer = None
+        self._block_writer = None
+        
+        # Überlauf: laufender bzw. fehlgeschlagener Schreibblock, ausgelagerte Einträge und Zähler
+        self._write_batch = []
+        self._batch_progress: Dict[str, int] = {}  # je Format bereits geschriebene Einträge des Blocks
+        self._spill_handle = None
+        self._spill_path = None
+        self._spill_read_offset = 0
+        self._spill_pending = 0
+        self.dropped_count = 0
+        self.spilled_count = 0
+        
+        # Schreib-Thread
+        self.buffer_condition = threading.Condition()
+        self.writer_thread = None
+        self._writer_running = False
         
+        # Nach einem Absturz einmal reparieren, bevor der Kompressor temporäre Dateien anlegt
+        self._recover()
+        
+    def _recover(self):
+        """Repariert nicht sauber geschlossene Log-Dateien und zieht den Katalog nach
+        
+        Nur als offen eingetragene Dateien werden neu gezählt; fehlende (z.B. Logs älterer Versionen)
+        bekommen günstig gelesene Zeitgrenzen, damit der Start nicht auf das Lesen großer Logs wartet.
+        """
+        try:
+            unclean = self.catalog.unclean_files()
+            recover_log_dir(self.log_dir, only=unclean)
+            self.catalog.refresh()
+            self.catalog.add_estimated(unclean)
+        except Exception as e:
+            print(f"Fehler bei der Wiederherstellung der Log-Dateien: {e}")
+            
     def start_logging(self, format_type: str = "csv"):
         """Startet das Logging"""
         try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            if self.logging_enabled:
+                self.stop_logging()
+                
+            self.format_type = format_type
+            self._session_stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            self._part = 0
+            self.sqlite_store = None
             
-            if format_type == "csv":
-                self.csv_file = self.log_dir / f"system_data_{timestamp}.csv"
-                self._create_csv_header()
-            elif format_type == "json":
-                self.json_file = self.log_dir / f"system_data_{timestamp}.json"
-                self._create_json_header()
-            else:
-                # Beide Formate
-                self.csv_file = self.log_dir / f"system_data_{timestamp}.csv"
-                self.json_file = self.log_dir / f"system_data_{timestamp}.json"
-                self._create_csv_header()
-                self._create_json_header()
+            if format_type == "sqlite":
+                self.sqlite_store = SQLiteLogStore(self.log_dir / self.SQLITE_FILE)
                 
+            self._assign_part_files()
+            self._open_files()
+            self._open_rollups()
+            
+            self._writer_running = True
+            self.writer_thread = threading.Thread(target=self._writer_loop, name="DataLogger-Writer", daemon=True)
+            self.writer_thread.start()
+            
             self.logging_enabled = True
             print(f"Logging gestartet: {format_type.upper()}")
             
@@ -53,59 +202,444 @@ class DataLogger:
         try:
             self.logging_enabled = False
             
-            # Verbleibende Daten schreiben
-            if self.data_buffer:
-                self._flush_buffer()
+            # Schreib-Thread beenden, er schreibt verbleibende Daten noch weg
+            with self.buffer_condition:
+                self._writer_running = False
+                self.buffer_condition.notify_all()
+            if self.writer_thread:
+                self.writer_thread.join()
+                self.writer_thread = None
+                
+            # Falls der Thread nicht lief oder der letzte Schreibvorgang fehlschlug
+            if self._unwritten_count() and not self._flush_buffer():
+                self._discard_unwritten()
                 
+            self._finish_files(self._close_files())
+            if self._rollups_open:
+                self.rollups.close()
+                self._rollups_open = False
             print("Logging gestoppt")
             
         except Exception as e:
             print(f"Fehler beim Stoppen des Loggings: {e}")
             
-    def log_data(self, data: Dict[str, Any]):
-        """Loggt Systemdaten"""
+    def log_data(self, data: SystemSample):
+        """Loggt Systemdaten (nur Einreihen, geschrieben wird im Schreib-Thread)"""
         if not self.logging_enabled:
             return
             
         try:
-            # Timestamp hinzufügen
+            # Zeitpunkt der Messung als Epoch-Sekunden (nicht der Zeitpunkt des Einreihens)
+            gb = 1024**3
             log_entry = {
-                'timestamp': datetime.now().isoformat(),
-                'cpu_percent': data.get('cpu', {}).get('percent', 0),
-                'cpu_count': data.get('cpu', {}).get('count', 0),
-                'memory_percent': data.get('memory', {}).get('percent', 0),
-                'memory_used_gb': data.get('memory', {}).get('used', 0) / (1024**3),
-                'memory_total_gb': data.get('memory', {}).get('total', 0) / (1024**3),
-                'disk_percent': data.get('disk', {}).get('percent', 0),
-                'disk_used_gb': data.get('disk', {}).get('used', 0) / (1024**3),
-                'disk_total_gb': data.get('disk', {}).get('total', 0) / (1024**3),
-                'platform': data.get('system', {}).get('platform', ''),
-                'machine': data.get('system', {}).get('machine', '')
+                'timestamp': data.timestamp or time.time(),
+                'cpu_percent': data.cpu_percent or 0,
+                'cpu_count': data.cpu_count or 0,
+                'memory_percent': data.memory_percent or 0,
+                'memory_used_gb': (data.memory_used or 0) / gb,
+                'memory_total_gb': (data.memory_total or 0) / gb,
+                'disk_percent': data.disk_percent or 0,
+                'disk_used_gb': (data.disk_used or 0) / gb,
+                'disk_total_gb': (data.disk_total or 0) / gb,
+                'platform': data.platform,
+                'machine': data.machine
             }
             
-            # Daten zum Buffer hinzufügen
-            self.data_buffer.append(log_entry)
+            # Daten zum Buffer hinzufügen, Schreib-Thread wecken wenn voll
+            with self.buffer_condition:
+                self.data_buffer.append(log_entry)
+                if len(self.data_buffer) > self.max_buffered_records:
+                    self._enforce_buffer_limit()
+                if len(self.data_buffer) >= self.max_buffer_size:
+                    self.buffer_condition.notify()
+                    
+        except Exception as e:
+            print(f"Fehler beim Loggen der Daten: {e}")
+            
+    def _enforce_buffer_limit(self):
+        """Hält den Buffer unter max_buffered_records (Aufruf mit gehaltenem buffer_condition)"""
+        excess = len(self.data_buffer) - self.max_buffered_records
+        if excess <= 0:
+            return
+            
+        if self.overflow_policy == "downsample":
+            # Ältere Hälfte ausdünnen; wiederholtes Ausdünnen senkt die Auflösung mit dem Alter der Daten
+            half = len(self.data_buffer) // 2
+            kept = self.data_buffer[:half:2]
+            self.dropped_count += half - len(kept)
+            self.data_buffer[:half] = kept
+            return
             
-            # Buffer schreiben wenn voll
-            if len(self.data_buffer) >= self.max_buffer_size:
-                self._flush_buffer()
+        if self.overflow_policy == "spill":
+            # Gleich die ältere Hälfte auslagern, damit nicht bei jedem neuen Eintrag geschrieben wird
+            count = max(excess, len(self.data_buffer) // 2)
+            if self._spill(self.data_buffer[:count]):
+                del self.data_buffer[:count]
+                return
                 
+        del self.data_buffer[:excess]
+        self.dropped_count += excess
+        
+    def _spill(self, entries: List[Dict[str, Any]]) -> bool:
+        """Hängt Einträge an die Auslagerungsdatei an (Aufruf mit gehaltenem buffer_condition)"""
+        try:
+            if self._spill_handle is None:
+                # Im temporären Verzeichnis, da das Log-Verzeichnis gerade voll oder gesperrt sein kann
+                descriptor, path = tempfile.mkstemp(prefix="systemmonitorx_spill_", suffix=".jsonl")
+                self._spill_handle = os.fdopen(descriptor, 'w+b')
+                self._spill_path = Path(path)
+                self._spill_read_offset = 0
+            self._spill_handle.seek(0, os.SEEK_END)
+            self._spill_handle.write(''.join(json.dumps(entry) + '\n' for entry in entries).encode('utf-8'))
+            self._spill_handle.flush()
         except Exception as e:
-            print(f"Fehler beim Loggen der Daten: {e}")
+            print(f"Fehler beim Auslagern des Buffers: {e}")
+            return False
             
-    def _create_csv_header(self):
-        """Erstellt CSV-Header"""
-        if self.csv_file:
-            fieldnames = [
-                'timestamp', 'cpu_percent', 'cpu_count', 'memory_percent',
-                'memory_used_gb', 'memory_total_gb', 'disk_percent',
-                'disk_used_gb', 'disk_total_gb', 'platform', 'machine'
-            ]
+        self._spill_pending += len(entries)
+        self.spilled_count += len(entries)
+        return True
+        
+    def _read_spill(self, count: int) -> List[Dict[str, Any]]:
+        """Entnimmt die ältesten ausgelagerten Einträge (Aufruf mit gehaltenem buffer_condition)"""
+        entries = []
+        try:
+            self._spill_handle.seek(self._spill_read_offset)
+            while len(entries) < min(count, self._spill_pending):
+                entries.append(json.loads(self._spill_handle.readline()))
+            self._spill_read_offset = self._spill_handle.tell()
+            self._spill_pending -= len(entries)
+            if not self._spill_pending:
+                # Alles entnommen: Datei leeren statt sie weiter wachsen zu lassen
+                self._spill_handle.seek(0)
+                self._spill_handle.truncate()
+                self._spill_read_offset = 0
+        except Exception as e:
+            print(f"Fehler beim Lesen der ausgelagerten Einträge: {e}")
+            self.dropped_count += self._spill_pending
+            self._spill_pending = 0
+            self._close_spill()
+        return entries
+        
+    def _close_spill(self):
+        """Schließt und löscht die Auslagerungsdatei"""
+        if self._spill_handle:
+            self._spill_handle.close()
+            self._spill_handle = None
+        if self._spill_path:
+            try:
+                self._spill_path.unlink()
+            except OSError as e:
+                print(f"Fehler beim Löschen der Auslagerungsdatei: {e}")
+            self._spill_path = None
+            
+    def _unwritten_count(self) -> int:
+        """Anzahl noch nicht geschriebener Einträge (Schreibblock, ausgelagert und im Buffer)"""
+        with self.buffer_condition:
+            return len(self._write_batch) + self._spill_pending + len(self.data_buffer)
             
-            with open(self.csv_file, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
+    def _discard_unwritten(self):
+        """Verwirft nicht schreibbare Einträge beim Stoppen und räumt die Auslagerungsdatei auf"""
+        with self.buffer_condition:
+            lost = len(self._write_batch) + self._spill_pending + len(self.data_buffer)
+            self.dropped_count += lost
+            self._write_batch = []
+            self._batch_progress = {}
+            self._spill_pending = 0
+            self.data_buffer = []
+            self._close_spill()
+        print(f"{lost} Einträge konnten nicht geschrieben werden und wurden verworfen")
+        
+    def get_buffer_stats(self) -> Dict[str, Any]:
+        """Gibt Füllstand und Verlustzähler des Buffers zurück (für die Anzeige im Dashboard)"""
+        with self.buffer_condition:
+            return {
+                'buffered': len(self._write_batch) + len(self.data_buffer),
+                'max_buffered': self.max_buffered_records,
+                'policy': self.overflow_policy,
+                'spill_pending': self._spill_pending,
+                'spilled': self.spilled_count,
+                'dropped': self.dropped_count
+            }
+            
+    def _writer_loop(self):
+        """Schreibt den Buffer nach save_interval oder bei vollem Buffer, je nachdem was zuerst eintritt"""
+        while True:
+            deadline = time.monotonic() + self.save_interval
+            with self.buffer_condition:
+                while self._writer_running and len(self.data_buffer) < self.max_buffer_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.buffer_condition.wait(remaining)
+                running = self._writer_running
+                
+            written = self._flush_buffer()
+            
+            if not running:
+                return
+                
+            if written and self._rotation_due():
+                self._rotate()
                 
+            if not written:
+                # Nach einem Schreibfehler kurz warten statt sofort erneut zu versuchen
+                with self.buffer_condition:
+                    if self._writer_running:
+                        self.buffer_condition.wait(min(5.0, self.save_interval))
+                        
+    def _open_rollups(self):
+        """Öffnet die Aggregationsstufen; ohne sie wird weiter geloggt"""
+        try:
+            self.rollups.open()
+            self._rollups_open = True
+        except Exception as e:
+            print(f"Fehler beim Öffnen der Aggregationsstufen: {e}")
+            self._rollups_open = False
+            
+    def _part_path(self, suffix: str) -> Path:
+        """Gibt den Pfad des aktuellen Teils der Sitzung zurück (system_data_<start>[_NNN].<endung>)"""
+        part = f"_{self._part:03d}" if self._part else ""
+        return self.log_dir / f"system_data_{self._session_stamp}{part}{suffix}"
+        
+    def _assign_part_files(self):
+        """Setzt die Dateipfade des aktuellen Teils je nach Format"""
+        self.csv_file = None
+        self.json_file = None
+        self.jsonl_file = None
+        self.binary_file = None
+        self.block_file = None
+        
+        if self.format_type == "csv":
+            self.csv_file = self._part_path(".csv")
+        elif self.format_type == "json":
+            self.json_file = self._part_path(".json")
+        elif self.format_type == "jsonl":
+            self.jsonl_file = self._part_path(".jsonl")
+        elif self.format_type == "binary":
+            self.binary_file = self._part_path(columnar_store.FILE_SUFFIX)
+        elif self.format_type == "compressed":
+            self.block_file = self._part_path(block_store.FILE_SUFFIX)
+        elif self.format_type != "sqlite":
+            # Beide Formate (JSON als anhängbares JSON Lines)
+            self.csv_file = self._part_path(".csv")
+            self.jsonl_file = self._part_path(".jsonl")
+            
+    def _rotation_due(self) -> bool:
+        """Prüft, ob die aktuelle Datei ihre Größen- oder Zeitgrenze erreicht hat"""
+        if self.format_type == "sqlite":
+            # Die Datenbank wird nicht rotiert
+            return False
+        if self.rotate_interval and time.monotonic() - self._part_started >= self.rotate_interval:
+            return True
+            
+        max_bytes = self.max_file_size_mb * 1024 * 1024
+        if not max_bytes:
+            return False
+        if self._csv_handle and self._csv_handle.tell() >= max_bytes:
+            return True
+        if self._jsonl_handle and self._jsonl_handle.tell() >= max_bytes:
+            return True
+        if self._block_writer and self._block_writer.tell() >= max_bytes:
+            return True
+        if self.json_file and self.json_file.exists() and self.json_file.stat().st_size >= max_bytes:
+            return True
+        return False
+        
+    def _rotate(self):
+        """Schließt die aktuellen Dateien und setzt die Sitzung in neuen Dateien fort"""
+        closed = self._close_files()
+        self._part += 1
+        self._assign_part_files()
+        self._open_files()
+        self._finish_files(closed)
+        
+    def _finish_files(self, closed: List[Path]):
+        """Reiht geschlossene Dateien zur Komprimierung ein und setzt die Aufbewahrungsregeln durch"""
+        for path in closed:
+            self.compressor.submit(path)
+            
+        try:
+            # Offene und noch zu komprimierende Dateien nicht löschen (os.replace würde sie sonst neu anlegen)
+            keep = (self._part_files() if self.logging_enabled else []) + self.compressor.pending_paths()
+            apply_retention(self.log_dir, self.max_log_files, self.max_total_size_mb * 1024 * 1024, keep=keep)
+        except Exception as e:
+            print(f"Fehler bei der Log-Aufbewahrung: {e}")
+            
+    def _part_files(self) -> List[Path]:
+        """Gibt die Dateien des aktuellen Teils zurück"""
+        return [path for path in (self.csv_file, self.json_file, self.jsonl_file, self.binary_file,
+                                  self.block_file) if path]
+                                  
+    def _open_files(self):
+        """Öffnet die Log-Dateien, schreibt die Header und trägt sie in den Katalog ein"""
+        self._part_started = time.monotonic()
+        self._part_first = None
+        self._part_last = None
+        self._part_rows = 0
+        
+        if self.csv_file:
+            self._csv_handle = open(self.csv_file, 'w', newline='', encoding='utf-8')
+            csv.DictWriter(self._csv_handle, fieldnames=self.LOG_FIELDS).writeheader()
+            self._csv_handle.flush()
+            
+            # Zeilen werden einzeln formatiert, damit ihre Byte-Offsets für den Index bekannt sind
+            self._csv_row_buffer = io.StringIO()
+            self._csv_writer = csv.DictWriter(self._csv_row_buffer, fieldnames=self.LOG_FIELDS)
+            self._csv_offset = self._csv_handle.tell()
+            self._csv_index = CsvIndexWriter(self.csv_file)
+            
+        if self.json_file:
+            self._create_json_header()
+            
+        if self.jsonl_file:
+            self._jsonl_handle = open(self.jsonl_file, 'w', encoding='utf-8')
+            header = {
+                'metadata': {
+                    'created': datetime.now().isoformat(),
+                    'version': '1.1',
+                    'format': 'jsonl',
+                    'fields': self.LOG_FIELDS,
+                    'description': 'SystemMonitorX Log Data'
+                }
+            }
+            self._jsonl_handle.write(json.dumps(header) + '\n')
+            self._jsonl_handle.flush()
+            
+        if self.binary_file:
+            self._binary_writer = None  # Wird mit dem ersten Eintrag angelegt (Konstanten)
+            
+        if self.block_file:
+            self._block_writer = block_store.BlockSegmentWriter(self.block_file)
+            
+        self.catalog.add_files(self._part_files(), self.LOG_FIELDS)
+        
+    def _open_handles(self) -> list:
+        """Gibt alle offenen Datei-Handles zurück, in die angehängt wird"""
+        handles = [self._csv_handle, self._jsonl_handle]
+        for writer in (self._csv_index, self._binary_writer, self._block_writer):
+            if writer:
+                handles.append(writer.handle)
+        if self._rollups_open:
+            handles += [stream.handle for stream in self.rollups.streams]
+        return [handle for handle in handles if handle]
+        
+    def _sync_files(self, force: bool = False):
+        """Schreibt angehängte Daten gemäß fsync-Strategie auf die Platte"""
+        if self.fsync_policy == "never":
+            return
+        now = time.monotonic()
+        if self.fsync_policy == "interval" and not force and now - self._last_sync < self.fsync_interval:
+            return
+        for handle in self._open_handles():
+            try:
+                os.fsync(handle.fileno())
+            except (OSError, ValueError) as e:
+                print(f"Fehler bei fsync: {e}")
+        self._last_sync = now
+        
+    def _close_files(self) -> List[Path]:
+        """Schließt alle offenen Log-Dateien und gibt deren Pfade zurück"""
+        self._sync_files(force=True)
+        closed = [path for path in (self.csv_file, self.json_file, self.jsonl_file) if path and path.exists()]
+        for handle in (self._csv_handle, self._jsonl_handle):
+            if handle:
+                try:
+                    handle.close()
+                except Exception as e:
+                    print(f"Fehler beim Schließen der Log-Datei: {e}")
+        self._csv_handle = None
+        self._csv_writer = None
+        self._csv_row_buffer = None
+        self._jsonl_handle = None
+        
+        if self._csv_index:
+            self._csv_index.close()
+        self._csv_index = None
+        
+        if self._binary_writer:
+            self._binary_writer.close()
+            closed.append(self._binary_writer.path)
+        self._binary_writer = None
+        
+        if self._block_writer:
+            self._block_writer.close()
+            closed.append(self._block_writer.path)
+        self._block_writer = None
+        
+        if self.sqlite_store:
+            self.sqlite_store.close_session()
+            
+        self.catalog.close_files(closed, self._part_first, self._part_last, self._part_rows)
+        return closed
+        
+    def _open_binary_segment(self, entry: Dict[str, Any]):
+        """Legt das Segment des aktuellen Teils der Binär-Sitzung an"""
+        constants = {'platform': entry.get('platform', ''), 'machine': entry.get('machine', '')}
+        self._binary_writer = columnar_store.ColumnarSegmentWriter(self.binary_file, self.BINARY_SEGMENT_ROWS, constants,
+                                                                   fsync=self.fsync_policy != "never")
+                                                                   
+    def _count_written(self, entries: List[Dict[str, Any]]):
+        """Nimmt geschriebene Einträge in Zeitgrenzen und Zeilenanzahl des aktuellen Teils auf"""
+        if not entries:
+            return
+        if self._part_first is None:
+            self._part_first = entries[0]['timestamp']
+        self._part_last = entries[-1]['timestamp']
+        self._part_rows += len(entries)
+        
+    def _write_binary(self, rows: List[Dict[str, Any]]):
+        """Hängt Einträge an die Binär-Segmente an und beginnt bei vollem Segment ein neues"""
+        while rows:
+            if self._binary_writer and self._binary_writer.is_full:
+                # Volles Segment: Sitzung im nächsten Teil fortsetzen
+                self._rotate()
+            if self._binary_writer is None:
+                self._open_binary_segment(rows[0])
+            remaining = self._binary_writer.append(rows)
+            self._count_written(rows[:len(rows) - len(remaining)])
+            self._batch_progress['binary'] = self._batch_progress.get('binary', 0) + len(rows) - len(remaining)
+            rows = remaining
+            
+    def _write_csv(self, entries: List[Dict[str, Any]]):
+        """Hängt Einträge an die CSV-Datei an und nimmt ihre Byte-Offsets in den Index auf
+        
+        Schlägt das Schreiben fehl, werden CSV-Datei und Index auf den Stand davor gekürzt.
+        """
+        rows = []
+        offsets = []
+        offset = self._csv_offset
+        for entry in entries:
+            self._csv_writer.writerow(entry)
+            row = self._csv_row_buffer.getvalue()
+            self._csv_row_buffer.seek(0)
+            self._csv_row_buffer.truncate()
+            rows.append(row)
+            offsets.append(offset)
+            offset += len(row.encode('utf-8'))
+            
+        index_state = (self._csv_index.tell(), self._csv_index.row_count)
+        try:
+            self._csv_handle.write(''.join(rows))
+            self._csv_handle.flush()
+            self._csv_index.add_rows(offsets, (entry['timestamp'] for entry in entries))
+        except Exception:
+            self._csv_handle = reopen_truncated(self._csv_handle, self.csv_file, self._csv_offset, 'a',
+                                                newline='', encoding='utf-8')
+            self._csv_index.truncate(*index_state)
+            raise
+        self._csv_offset = offset
+        
+    def _write_jsonl(self, entries: List[Dict[str, Any]]):
+        """Hängt Einträge an die JSON-Lines-Datei an (bei Fehler auf den Stand davor gekürzt)"""
+        size = os.fstat(self._jsonl_handle.fileno()).st_size
+        try:
+            self._jsonl_handle.writelines(json.dumps(entry) + '\n' for entry in entries)
+            self._jsonl_handle.flush()
+        except Exception:
+            self._jsonl_handle = reopen_truncated(self._jsonl_handle, self.jsonl_file, size, 'a', encoding='utf-8')
+            raise
+            
     def _create_json_header(self):
         """Erstellt JSON-Header"""
         if self.json_file:
@@ -118,29 +652,72 @@ class DataLogger:
                 'data': []
             }
             
-            with open(self.json_file, 'w', encoding='utf-8') as jsonfile:
-                json.dump(header, jsonfile, indent=2)
-                
-    def _flush_buffer(self):
-        """Schreibt Buffer-Daten in Dateien"""
-        if not self.data_buffer:
-            return
+            atomic_write(self.json_file, json.dumps(header, indent=2).encode('utf-8'),
+                         fsync=self.fsync_policy != "never")
+                         
+    def _next_batch(self) -> List[Dict[str, Any]]:
+        """Gibt die ältesten ungeschriebenen Einträge zurück: fehlgeschlagener Block, Auslagerung, dann Buffer"""
+        with self.buffer_condition:
+            if not self._write_batch:
+                if self._spill_pending:
+                    self._write_batch = self._read_spill(self.max_buffer_size)
+                else:
+                    self._write_batch = self.data_buffer[:self.max_buffer_size]
+                    del self.data_buffer[:self.max_buffer_size]
+                if not self._spill_pending and self._spill_handle and not self.logging_enabled:
+                    self._close_spill()
+            return self._write_batch
             
+    def _flush_buffer(self) -> bool:
+        """Schreibt Buffer-Daten blockweise in Dateien (False bei Schreibfehler)
+        
+        Ein fehlgeschlagener Block bleibt als nächster Block stehen, damit die Reihenfolge in den Dateien
+        erhalten bleibt; der Buffer zählt ihn nicht mit, er ist höchstens max_buffer_size groß.
+        """
+        while True:
+            entries = self._next_batch()
+            if not entries:
+                return True
+            if not self._write_entries(entries):
+                return False
+            with self.buffer_condition:
+                self._write_batch = []
+                self._batch_progress = {}
+                
+    def _write_entries(self, entries: List[Dict[str, Any]]) -> bool:
+        """Schreibt einen Block in alle geöffneten Formate (False bei Schreibfehler)
+        
+        Jedes Format schreibt den Block ganz oder gar nicht; nach einem Fehler schreibt die Wiederholung
+        nur noch die Formate, die ihn nicht schon haben (_batch_progress).
+        """
+        done = self._batch_progress
         try:
-            # CSV schreiben
-            if self.csv_file:
-                fieldnames = [
-                    'timestamp', 'cpu_percent', 'cpu_count', 'memory_percent',
-                    'memory_used_gb', 'memory_total_gb', 'disk_percent',
-                    'disk_used_gb', 'disk_total_gb', 'platform', 'machine'
-                ]
+            # CSV anhängen, danach den Index (er zeigt nie hinter die geschriebenen Daten)
+            if self._csv_writer and 'csv' not in done:
+                self._write_csv(entries)
+                done['csv'] = len(entries)
+                
+            # JSON Lines anhängen (nur neue Einträge)
+            if self._jsonl_handle and 'jsonl' not in done:
+                self._write_jsonl(entries)
+                done['jsonl'] = len(entries)
+                
+            # Binär-Segmente anhängen (ein Block kann über einen Teilwechsel gehen, daher zeilengenau)
+            if self.binary_file and done.get('binary', 0) < len(entries):
+                self._write_binary(entries[done.get('binary', 0):])
+                
+            # Komprimierte Blöcke: ein Block pro Flush
+            if self._block_writer and 'blocks' not in done:
+                self._block_writer.append(entries)
+                done['blocks'] = len(entries)
+                
+            # SQLite: ein executemany pro Flush (eine Transaktion)
+            if self.sqlite_store and 'sqlite' not in done:
+                self.sqlite_store.insert(entries)
+                done['sqlite'] = len(entries)
                 
-                with open(self.csv_file, 'a', newline='', encoding='utf-8') as csvfile:
-                    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                    writer.writerows(self.data_buffer)
-                    
             # JSON schreiben
-            if self.json_file:
+            if self.json_file and 'json' not in done:
                 # JSON-Datei lesen und erweitern
                 try:
                     with open(self.json_file, 'r', encoding='utf-8') as jsonfile:
@@ -154,40 +731,58 @@ class DataLogger:
                         },
                         'data': []
                     }
-                
+                    
                 # Neue Daten hinzufügen
-                json_data['data'].extend(self.data_buffer)
+                json_data['data'].extend(entries)
+                
+                # Über temporäre Datei ersetzen, ein Abbruch lässt die alte Fassung intakt
+                atomic_write(self.json_file, json.dumps(json_data, indent=2).encode('utf-8'),
+                             fsync=self.fsync_policy != "never")
+                done['json'] = len(entries)
                 
-                # Zurück schreiben
-                with open(self.json_file, 'w', encoding='utf-8') as jsonfile:
-                    json.dump(json_data, jsonfile, indent=2)
-                    
-            # Buffer leeren
-            self.data_buffer.clear()
-            
         except Exception as e:
             print(f"Fehler beim Schreiben der Log-Daten: {e}")
+            return False
             
+        # Binär-Segmente zählen selbst, da ein Block über einen Teilwechsel gehen kann
+        if not self.binary_file:
+            self._count_written(entries)
+            
+        # Aggregationsstufen erst nach erfolgreichem Schreiben, damit kein Eintrag doppelt zählt
+        if self._rollups_open:
+            try:
+                self.rollups.add_entries(entries)
+            except Exception as e:
+                print(f"Fehler beim Aktualisieren der Aggregationsstufen: {e}")
+                
+        self._sync_files()
+        return True
+        
     def get_log_files(self) -> List[Path]:
-        """Gibt alle Log-Dateien zurück"""
-        return list(self.log_dir.glob("*.csv")) + list(self.log_dir.glob("*.json"))
+        """Gibt alle Log-Dateien zurück (auch komprimierte)"""
+        return list_log_files(self.log_dir) + list(self.log_dir.glob("*.sqlite"))
         
     def get_latest_log_data(self, format_type: str = "csv") -> List[Dict[str, Any]]:
         """Gibt die neuesten Log-Daten zurück"""
         try:
-            if format_type == "csv":
-                files = list(self.log_dir.glob("*.csv"))
-            else:
-                files = list(self.log_dir.glob("*.json"))
+            if format_type == "sqlite":
+                return self._read_sqlite_latest_session()
                 
-            if not files:
-                return []
+            if format_type not in ("csv", "json", "jsonl"):
+                format_type = "json"
+                
+            # Neueste Datei laut Katalog, sonst nach Namen (enthält Startzeit und Teil der Sitzung)
+            latest_file = self.catalog.latest_file(format_type)
+            if latest_file is None:
+                files = glob_logs(self.log_dir, f".{format_type}")
+                if not files:
+                    return []
+                latest_file = max(files, key=lambda file: file.name)
                 
-            # Neueste Datei
-            latest_file = max(files, key=os.path.getctime)
-            
             if format_type == "csv":
                 return self._read_csv_data(latest_file)
+            elif format_type == "jsonl":
+                return list(self.iter_jsonl_data(latest_file))
             else:
                 return self._read_json_data(latest_file)
                 
@@ -195,11 +790,190 @@ class DataLogger:
             print(f"Fehler beim Lesen der Log-Daten: {e}")
             return []
             
+    def _get_sqlite_store(self) -> Optional[SQLiteLogStore]:
+        """Gibt die SQLite-Datenbank zurück, falls vorhanden (ohne eigenen Schreiber schreibgeschützt)"""
+        if self.sqlite_store:
+            return self.sqlite_store
+        if self._sqlite_reader is None:
+            db_path = self.log_dir / self.SQLITE_FILE
+            if not db_path.exists():
+                return None
+            self._sqlite_reader = SQLiteLogStore(db_path, read_only=True)
+        return self._sqlite_reader
+        
+    def _read_sqlite_latest_session(self) -> List[Dict[str, Any]]:
+        """Liest die neueste Sitzung aus der SQLite-Datenbank als Zeilen"""
+        store = self._get_sqlite_store()
+        if store is None:
+            return []
+        session_id = store.get_latest_session_id()
+        if session_id is None:
+            return []
+        columns = store.query_range(session_id=session_id)
+        names = list(columns)
+        return [dict(zip(names, values)) for values in zip(*columns.values())]
+        
+    def query_range(self, start: Optional[float] = None, end: Optional[float] = None,
+                    fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Fragt einen Zeitraum aus der SQLite-Datenbank ab (Spalten-Arrays)"""
+        store = self._get_sqlite_store()
+        if store is None:
+            return {}
+        return store.query_range(start, end, fields)
+        
+    def query_aggregate(self, fields: List[str], bucket_seconds: float, start: Optional[float] = None,
+                        end: Optional[float] = None, percentiles: List[int] = ()) -> Dict[str, Any]:
+        """Fragt pro Zeit-Bucket aggregierte Werte (avg, min, max, Perzentile) aus der SQLite-Datenbank ab"""
+        store = self._get_sqlite_store()
+        if store is None:
+            return {}
+        return store.query_aggregate(fields, bucket_seconds, start, end, percentiles)
+        
+    def get_graph_data(self, max_points: int = 2000, cancel_event: Optional[threading.Event] = None,
+                       progress: Optional[Callable[[int, int], None]] = None,
+                       recent: Optional[Dict[str, np.ndarray]] = None) -> Dict[str, Any]:
+        """Gibt die letzten 24 Stunden für Graphen zurück (aus den Aggregationsstufen, sonst Rohdaten)
+        
+        recent sind Spalten aus dem Verlaufsspeicher (HistoryStore.get_series); Log-Dateien werden dann nur
+        für den Zeitraum davor gelesen und vorangestellt. Liegt in den Logs nichts, wird die neueste
+        SQLite-Sitzung auf max_points reduziert geladen.
+        cancel_event und progress werden an die Abfrage weitergereicht (QueryCancelled bei Abbruch).
+        """
+        end = time.time()
+        start = end - self.GRAPH_RANGE
+        covered = float(recent['timestamp'][0]) if recent is not None and len(recent['timestamp']) else None
+        if covered is not None and covered <= start:
+            return recent
+            
+        older = {}
+        try:
+            log_end = covered if covered is not None else end
+            older = self.get_series(start, log_end, cancel_event=cancel_event, progress=progress)
+            if not len(older['timestamp']):
+                older = self._get_latest_sqlite_graph_data(max_points)
+                
+        except QueryCancelled:
+            raise
+        except Exception as e:
+            print(f"Fehler beim Laden der Graph-Daten: {e}")
+            
+        if covered is None:
+            return older
+        return self._prepend_log_data(older, recent, covered)
+        
+    def _get_latest_sqlite_graph_data(self, max_points: int) -> Dict[str, Any]:
+        """Gibt die neueste SQLite-Sitzung zurück, bei mehr als max_points Zeilen zu Buckets zusammengefasst"""
+        store = self._get_sqlite_store()
+        if store is None:
+            return {}
+        session_id = store.get_latest_session_id()
+        bounds = store.get_time_bounds(session_id) if session_id is not None else None
+        if not bounds:
+            return {}
+        first, last, count = bounds
+        if count <= max_points:
+            return store.query_range(session_id=session_id)
+        bucket_seconds = max(1.0, (last - first) / max_points)
+        return store.query_aggregate(store.NUMERIC_FIELDS, bucket_seconds, session_id=session_id)
+        
+    @staticmethod
+    def _prepend_log_data(older: Dict[str, Any], recent: Dict[str, np.ndarray],
+                          covered: float) -> Dict[str, np.ndarray]:
+        """Stellt Log-Spalten vor covered (Beginn des Verlaufsspeichers) vor die Spalten des Verlaufs"""
+        if not older or not len(older.get('timestamp', ())):
+            return recent
+        # Nur Felder, die beide Quellen haben (Rohdaten kennen z.B. kein <feld>_min)
+        fields = [name for name in recent if name != 'timestamp' and name in older]
+        timestamps = np.asarray(older['timestamp'], dtype=float)
+        keep = timestamps < covered
+        head = {name: np.asarray(older[name], dtype=float)[keep] for name in ['timestamp'] + fields}
+        return merge_segments([head, {name: recent[name] for name in ['timestamp'] + fields}], fields)
+        
+    def iter_range(self, start: Optional[float] = None, end: Optional[float] = None,
+                   fields: Optional[List[str]] = None, cancel_event: Optional[threading.Event] = None,
+                   progress: Optional[Callable[[int, int], None]] = None) -> Iterator[Dict[str, Any]]:
+        """Liefert alle Log-Einträge eines Zeitraums über alle Dateien und Sitzungen, zeitlich sortiert
+        
+        Start und Ende sind Epoch-Sekunden, die Einträge enthalten den Zeitstempel als Epoch-Sekunden
+        und nur die angeforderten Felder. Dateien außerhalb des Zeitraums werden nicht geöffnet.
+        Vor jedem Segment wird cancel_event geprüft (QueryCancelled), danach progress(erledigt, gesamt) gemeldet.
+        """
+        segments = self.catalog.find_segments(start, end)
+        
+        store = self._get_sqlite_store()
+        if store is not None:
+            for session_id, first, last in store.get_sessions(start, end):
+                segments.append((first, last, session_id))
+        segments.sort(key=lambda segment: segment[0])
+        
+        sqlite_fields = [field for field in fields if field in SQLiteLogStore.NUMERIC_FIELDS] \
+            if fields is not None else None
+        for done, (_, _, source) in enumerate(segments, 1):
+            check_cancelled(cancel_event)
+            if isinstance(source, Path):
+                yield from log_reader.iter_file(source, start, end, fields)
+            else:
+                yield from store.iter_range(start, end, sqlite_fields, session_id=source)
+            if progress:
+                progress(done, len(segments))
+                
+    def get_log_sessions(self) -> List[Dict[str, Any]]:
+        """Gibt die Sitzungen der Log-Dateien aus dem Katalog zurück (Formate, Zeitgrenzen, Zeilen), neueste zuerst"""
+        return self.catalog.get_sessions()
+        
+    def get_range_columns(self, start: Optional[float] = None, end: Optional[float] = None,
+                          fields: Optional[List[str]] = None, cancel_event: Optional[threading.Event] = None,
+                          progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, np.ndarray]:
+        """Gibt einen Zeitraum aller Sitzungen als Spalten-Arrays zurück (Dateien parallel im Prozess-Pool gelesen)"""
+        return self.query_engine.query(start, end, fields, cancel_event=cancel_event, progress=progress)
+        
+    def close(self):
+        """Stoppt das Logging und beendet den Prozess-Pool der Abfragen"""
+        if self.logging_enabled:
+            self.stop_logging()
+        self.query_engine.close()
+        
+    def get_series(self, start: float, end: float, fields: Optional[List[str]] = None,
+                   min_points: Optional[int] = None, cancel_event: Optional[threading.Event] = None,
+                   progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, np.ndarray]:
+        """Gibt einen Zeitraum aus der gröbsten Aggregationsstufe zurück, die noch genug Punkte liefert
+        
+        Reichen die Stufen nicht (kurzer Zeitraum oder ältere Logs ohne Stufen), werden die Rohdaten gelesen.
+        """
+        resolution = self.rollups.choose_resolution(start, end, min_points or self.MIN_GRAPH_POINTS)
+        if resolution:
+            try:
+                columns = self.rollups.read(resolution, start, end, fields)
+                if len(columns['timestamp']):
+                    if progress:
+                        progress(1, 1)
+                    return columns
+            except Exception as e:
+                print(f"Fehler beim Lesen der Aggregationsstufe: {e}")
+        return self.get_range_columns(start, end, fields, cancel_event=cancel_event, progress=progress)
+        
+    def get_latest_log_columns(self, start: Optional[float] = None, end: Optional[float] = None,
+                               fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Gibt einen Zeitraum der neuesten Binär-Sitzung als Spalten-Arrays zurück"""
+        try:
+            files = glob_logs(self.log_dir, columnar_store.FILE_SUFFIX)
+            if not files:
+                return {}
+                
+            # Segmente der neuesten Sitzung (system_data_YYYYMMDD_HHMMSS[_NNN].smxc)
+            session = max(file.name[:len("system_data_YYYYMMDD_HHMMSS")] for file in files)
+            segments = sorted(file for file in files if file.name.startswith(session))
+            return columnar_store.read_segments(segments, start, end, fields)
+            
+        except Exception as e:
+            print(f"Fehler beim Lesen der Binär-Log-Daten: {e}")
+            return {}
+            
     def _read_csv_data(self, file_path: Path) -> List[Dict[str, Any]]:
         """Liest CSV-Daten"""
         data = []
         try:
-            with open(file_path, 'r', encoding='utf-8') as csvfile:
+            with open_log_file(file_path) as csvfile:
                 reader = csv.DictReader(csvfile)
                 for row in reader:
                     data.append(row)
@@ -210,9 +984,95 @@ class DataLogger:
     def _read_json_data(self, file_path: Path) -> List[Dict[str, Any]]:
         """Liest JSON-Daten"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as jsonfile:
+            with open_log_file(file_path) as jsonfile:
                 json_data = json.load(jsonfile)
                 return json_data.get('data', [])
         except Exception as e:
             print(f"Fehler beim Lesen der JSON-Datei: {e}")
-            return [] 
\ No newline at end of file
+            return []
+            
+    def iter_jsonl_data(self, file_path: Path) -> Iterator[Dict[str, Any]]:
+        """Liest JSON-Lines-Daten zeilenweise (ohne die ganze Datei in den Speicher zu laden)"""
+        try:
+            with open_log_file(file_path) as jsonlfile:
+                for line in jsonlfile:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    record = json.loads(line)
+                    if 'metadata' in record:
+                        continue
+                    yield record
+        except Exception as e:
+            print(f"Fehler beim Lesen der JSON-Lines-Datei: {e}")
+            
+    def convert_json_to_jsonl(self, json_path: Path, jsonl_path: Optional[Path] = None) -> Optional[Path]:
+        """Konvertiert ein bestehendes JSON-Log in das JSON-Lines-Format"""
+        try:
+            json_path = Path(json_path)
+            if not jsonl_path:
+                jsonl_path = json_path.with_name(part_key(json_path) + '.jsonl')
+            jsonl_path = Path(jsonl_path)
+            
+            with open_log_file(json_path) as jsonfile:
+                json_data = json.load(jsonfile)
+                
+            metadata = dict(json_data.get('metadata', {}))
+            metadata.update({'version': '1.1', 'format': 'jsonl', 'fields': self.LOG_FIELDS,
+                             'converted_from': json_path.name})
+                             
+            # Über temporäre Datei ersetzen, ein Abbruch hinterlässt keine halbe JSON-Lines-Datei
+            lines = [json.dumps({'metadata': metadata})]
+            lines += [json.dumps(entry) for entry in json_data.get('data', [])]
+            atomic_write(jsonl_path, ('\n'.join(lines) + '\n').encode('utf-8'), fsync=self.fsync_policy != "never")
+            
+            # Zeitgrenzen und Zeilen in den Katalog, damit Abfragen die neue Datei finden
+            if jsonl_path.parent == self.log_dir:
+                self.catalog.refresh([jsonl_path])
+                
+            print(f"Log konvertiert: {json_path.name} -> {jsonl_path.name}")
+            return jsonl_path
+            
+        except Exception as e:
+            print(f"Fehler beim Konvertieren der JSON-Datei: {e}")
+            return None
+            
+    def convert_all_json_logs(self) -> List[Path]:
+        """Konvertiert alle JSON-Logs im Log-Verzeichnis, die noch kein JSON-Lines-Gegenstück haben
+        
+        Nur Log-Dateien (system_data_*.json, auch komprimiert), nicht catalog.json;
+        die gerade geschriebene Datei bleibt unberührt.
+        """
+        converted = []
+        existing = {part_key(path) for path in glob_logs(self.log_dir, ".jsonl")}
+        for json_path in sorted(glob_logs(self.log_dir, ".json")):
+            if part_key(json_path) in existing or json_path == self.json_file:
+                continue
+            jsonl_path = self.convert_json_to_jsonl(json_path)
+            if jsonl_path:
+                converted.append(jsonl_path)
+        return converted
+
+def main(argv: Optional[List[str]] = None):
+    """Kommandozeile: Wartungsaufgaben am Log-Verzeichnis"""
+    parser = argparse.ArgumentParser(prog="python -m core.data_logger",
+                                     description="Wartung der Log-Dateien von SystemMonitorX")
+    parser.add_argument('--log-dir', default="logs", help="Log-Verzeichnis (Standard: logs)")
+    parser.add_argument('--convert-json', action='store_true',
+                        help="JSON-Logs ohne JSON-Lines-Gegenstück nach JSON Lines konvertieren")
+    args = parser.parse_args(argv)
+    
+    if not args.convert_json:
+        parser.print_help()
+        return 1
+        
+    data_logger = DataLogger(args.log_dir)
+    try:
+        converted = data_logger.convert_all_json_logs()
+    finally:
+        data_logger.close()
+    print(f"{len(converted)} Logs konvertiert")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""
+Hintergrund-Aufbereitung von Graphen für SystemMonitorX
+Laden der Daten, Reduktion auf die Pixelbreite und Layout laufen in einem Worker-Thread;
+der Tk-Hauptthread hängt nur die fertige Figure in ein Fenster ein
+"""
+
+import threading
+from typing import Any, Callable, Optional
+
+class GraphJobCancelled(Exception):
+    """Die Aufbereitung wurde abgebrochen"""
+
+class GraphJob:
+    """Bereitet einen Graphen in einem Worker-Thread vor, mit Fortschritt und Abbruch
+    
+    graph_viewer ist ein GraphViewer oder eine Funktion, die ihn liefert (dann wird matplotlib erst im
+    Worker-Thread importiert). load(cancel_event, progress) liefert die Daten (Verlauf oder Log-Dateien),
+    prüft cancel_event je Segment und meldet progress(erledigt, gesamt). on_done wird im Worker-Thread
+    aufgerufen und muss Tk-Arbeit selbst per root.after in den Hauptthread verlagern.
+    Zustände: pending, running, done, cancelled, failed.
+    """
+    
+    # Anteil des Fortschritts für das Laden der Daten (danach folgt nur noch das Füllen der Figure)
+    LOAD_START = 0.1
+    LOAD_END = 0.9
+    
+    def __init__(self, graph_viewer, graph_type: str,
+                 load: Callable[[threading.Event, Callable[[int, int], None]], Any],
+                 on_done: Optional[Callable[['GraphJob'], None]] = None):
+        """Initialisiert den Auftrag (gestartet wird mit start())"""
+        self.graph_viewer = graph_viewer
+        self.graph_type = graph_type
+        self.load = load
+        self.on_done = on_done
+        
+        self.state = "pending"
+        self.progress = 0.0  # 0..1
+        self.message = ""
+        self.figure = None
+        self.error: Optional[Exception] = None
+        self._cancel_event = threading.Event()
+        self.thread = None
+        
+    def start(self) -> 'GraphJob':
+        """Startet den Worker-Thread"""
+        self.state = "running"
+        self.thread = threading.Thread(target=self._run, name=f"GraphJob-{self.graph_type}", daemon=True)
+        self.thread.start()
+        return self
+        
+    def cancel(self):
+        """Fordert den Abbruch an (wirksam beim nächsten Schritt oder Segment)"""
+        self._cancel_event.set()
+        
+    @property
+    def cancelled(self) -> bool:
+        """Gibt zurück, ob der Abbruch angefordert wurde"""
+        return self._cancel_event.is_set()
+        
+    @property
+    def active(self) -> bool:
+        """Gibt zurück, ob der Auftrag noch läuft"""
+        return self.state in ("pending", "running")
+        
+    def _step(self, progress: float, message: str):
+        """Meldet einen neuen Schritt und bricht ab, falls angefordert"""
+        if self.cancelled:
+            raise GraphJobCancelled()
+        self.progress = progress
+        self.message = message
+        
+    def _load_progress(self, done: int, total: int):
+        """Bildet den Fortschritt des Ladens (Segmente) auf LOAD_START..LOAD_END ab"""
+        if total:
+            self.progress = self.LOAD_START + (self.LOAD_END - self.LOAD_START) * min(done, total) / total
+            self.message = f"Lade Daten ({done}/{total})"
+            
+    def _run(self):
+        """Lädt die Daten und baut die Figure (Worker-Thread, keine Tk-Aufrufe)"""
+        try:
+            if callable(self.graph_viewer):
+                self._step(0.0, "Lade Graph-Modul")
+                self.graph_viewer = self.graph_viewer()
+                
+            self._step(self.LOAD_START, "Lade Daten")
+            data = self.load(self._cancel_event, self._load_progress)
+            if not data:
+                raise ValueError("Keine Daten verfügbar")
+                
+            self._step(self.LOAD_END, "Baue Graph auf")
+            self.figure = self.graph_viewer.create_graph(self.graph_type, data)
+            
+            self._step(1.0, "Fertig")
+            self.state = "done"
+        except GraphJobCancelled:
+            self.state = "cancelled"
+            self.message = "Abgebrochen"
+        except Exception as e:
+            # Der Loader bricht mit eigener Ausnahme ab (z.B. log_query.QueryCancelled)
+            if self.cancelled:
+                self.state = "cancelled"
+                self.message = "Abgebrochen"
+            else:
+                self.state = "failed"
+                self.error = e
+                self.message = f"Fehler: {e}"
+                print(f"Fehler beim Aufbereiten des Graphen: {e}")
+                
+        # Bereits gebaute Figure bei Abbruch an den Pool zurückgeben
+        if self.state == "cancelled" and self.figure is not None:
+            self.graph_viewer.release_figure(self.figure)
+            self.figure = None
+            
+        if self.on_done:
+            self.on_done(self)
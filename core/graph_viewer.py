@@ -2,79 +2,258 @@
 Graph-Viewer für SystemMonitorX
 """
 
-import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
-from datetime import datetime, timedelta
+import threading
+import time
 import numpy as np
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Callable, Optional, Sequence, Tuple, Union
 import tkinter as tk
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.backend_bases import FigureCanvasBase
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 from matplotlib.figure import Figure
+from matplotlib.text import Text
+from .history_store import RingBuffer
+from .log_reader import to_datetime64
+
+# Reihen und Grundzustand der Achsen hängen an der Figure selbst: Linien und Achsen verweisen auf die Figure,
+# ein Verzeichnis außerhalb (auch mit schwachen Schlüsseln) hielte sonst jede gebaute Figure am Leben
+LAYOUT_ATTRIBUTE = '_smx_layout'
+
+# Log-Zeilen (Liste von Dicts) oder Spalten-Arrays aus dem Verlaufsspeicher
+GraphData = Union[List[Dict[str, Any]], Dict[str, np.ndarray]]
+
+def downsample_minmax(x: np.ndarray, y: np.ndarray, buckets: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Reduziert eine Reihe auf ersten, letzten, kleinsten und größten Punkt je Pixelspalte (M4)
+    
+    Spitzen bleiben damit exakt sichtbar, die Linie sieht bei gleicher Pixelbreite aus wie mit allen Punkten.
+    x muss aufsteigend sortiert sein (datetime64 oder Zahlen); kurze Reihen werden unverändert zurückgegeben.
+    """
+    count = len(x)
+    if buckets <= 0 or count <= 4 * buckets:
+        return x, y
+    positions = (x.view('int64') if x.dtype.kind == 'M' else x).astype(float)
+    span = positions[-1] - positions[0]
+    if span <= 0:
+        return x, y
+        
+    # Pixelspalte jedes Punkts (nach Zeit, damit Lücken Lücken bleiben)
+    bucket = np.minimum(((positions - positions[0]) * (buckets / span)).astype(np.int64), buckets - 1)
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    lengths = np.diff(np.r_[starts, count])
+    ends = starts + lengths - 1
+    
+    # Index von Minimum und Maximum je Spalte (Spalten nur aus NaN behalten ersten und letzten Punkt als Lücke)
+    owner = np.repeat(np.arange(len(starts)), lengths)
+    with np.errstate(invalid='ignore'):
+        mins = np.fmin.reduceat(y, starts)
+        maxs = np.fmax.reduceat(y, starts)
+    keep = [starts, ends]
+    for extremes in (mins, maxs):
+        hits = np.flatnonzero(y == extremes[owner])
+        _, first = np.unique(owner[hits], return_index=True)
+        keep.append(hits[first])
+    keep = np.unique(np.concatenate(keep))
+    return x[keep], y[keep]
+
+class FigurePool:
+    """Hält Figures geschlossener Fenster je Graph-Typ und Theme zur Wiederverwendung bereit
+    
+    Achsen, Linien, Legenden und Beschriftungen bleiben erhalten; beim erneuten Öffnen werden nur die Daten getauscht.
+    """
+    
+    def __init__(self, max_idle: int = 2):
+        """Initialisiert den Pool (höchstens max_idle freie Figures je Schlüssel)"""
+        self.max_idle = max_idle
+        self.idle: Dict[Tuple[str, str], List[Figure]] = {}
+        self.created_count = 0
+        self.reused_count = 0
+        self.lock = threading.Lock()
+        
+    def acquire(self, key: Tuple[str, str], build: Callable[[], Figure]) -> Figure:
+        """Gibt eine freie Figure zum Schlüssel zurück oder baut eine neue"""
+        with self.lock:
+            figures = self.idle.get(key)
+            if figures:
+                self.reused_count += 1
+                return figures.pop()
+            self.created_count += 1
+        return build()
+        
+    def release(self, key: Tuple[str, str], figure: Figure):
+        """Nimmt eine nicht mehr angezeigte Figure zurück; überzählige werden verworfen"""
+        # Leinwand des geschlossenen Fensters lösen, damit Tk-Widget und Bildpuffer freigegeben werden
+        FigureCanvasBase(figure)
+        with self.lock:
+            figures = self.idle.setdefault(key, [])
+            if len(figures) < self.max_idle and figure not in figures:
+                figures.append(figure)
+                
+    def get_stats(self) -> Dict[str, int]:
+        """Gibt die Anzahl gebauter, wiederverwendeter und freier Figures zurück"""
+        with self.lock:
+            return {
+                'created': self.created_count,
+                'reused': self.reused_count,
+                'idle': sum(len(figures) for figures in self.idle.values())
+            }
 
 class GraphViewer:
-    """Erstellt Graphen aus Systemdaten"""
+    """Erstellt Graphen aus Systemdaten
+    
+    Figures entstehen ohne pyplot (kein globaler Figure-Manager, der sie bis Programmende festhält).
+    Die Theme-Farben werden direkt an Figure und Achsen gesetzt; die globalen rcParams bleiben unverändert,
+    damit ein GraphJob im Worker-Thread nicht in gleichzeitig gezeichnete Fenster hineinwirkt.
+    """
     
-    def __init__(self, theme_manager=None):
+    # Benötigte Felder und Meldung ohne Daten je Graph-Typ
+    GRAPH_FIELDS = {
+        'overview': ['cpu_percent', 'memory_percent', 'disk_percent'],
+        'cpu': ['cpu_percent'],
+        'memory': ['memory_percent', 'memory_used_gb', 'memory_total_gb'],
+        'disk': ['disk_percent', 'disk_used_gb', 'disk_total_gb']
+    }
+    EMPTY_MESSAGES = {
+        'overview': "Keine Daten verfügbar",
+        'cpu': "Keine CPU-Daten verfügbar",
+        'memory': "Keine Memory-Daten verfügbar",
+        'disk': "Keine Disk-Daten verfügbar"
+    }
+    
+    # Farben je Theme (dunkel wie der matplotlib-Stil dark_background)
+    THEME_COLORS = {
+        'light': {'figure': '#f0f0f0', 'axes': '#ffffff', 'text': '#000000', 'edge': '#000000', 'grid': '#b0b0b0'},
+        'dark': {'figure': '#1a1a1a', 'axes': '#2b2b2b', 'text': '#ffffff', 'edge': '#ffffff', 'grid': '#ffffff'}
+    }
+    
+    def __init__(self, theme_manager=None, pool_size: int = 2):
         """Initialisiert den Graph-Viewer"""
         self.theme_manager = theme_manager
-        self.setup_matplotlib_style()
-        
-    def setup_matplotlib_style(self):
-        """Konfiguriert das matplotlib-Styling"""
-        plt.style.use('dark_background' if self.theme_manager and 
-                     self.theme_manager.current_theme == "dark" else 'default')
-        
-        # Custom Styling
-        plt.rcParams['figure.facecolor'] = '#1a1a1a' if self.theme_manager and \
-            self.theme_manager.current_theme == "dark" else '#f0f0f0'
-        plt.rcParams['axes.facecolor'] = '#2b2b2b' if self.theme_manager and \
-            self.theme_manager.current_theme == "dark" else '#ffffff'
-        plt.rcParams['text.color'] = '#ffffff' if self.theme_manager and \
-            self.theme_manager.current_theme == "dark" else '#000000'
-        plt.rcParams['axes.labelcolor'] = '#ffffff' if self.theme_manager and \
-            self.theme_manager.current_theme == "dark" else '#000000'
-        plt.rcParams['xtick.color'] = '#ffffff' if self.theme_manager and \
-            self.theme_manager.current_theme == "dark" else '#000000'
-        plt.rcParams['ytick.color'] = '#ffffff' if self.theme_manager and \
-            self.theme_manager.current_theme == "dark" else '#000000'
-        
-    def create_system_overview_graph(self, data: List[Dict[str, Any]], 
+        self.downsample = True  # Reihen vor dem Zeichnen auf die Pixelbreite reduzieren
+        self.pool = FigurePool(pool_size)
+        
+    def _theme(self) -> str:
+        """Name des aktuellen Themes"""
+        return self.theme_manager.current_theme if self.theme_manager else "light"
+        
+    def _apply_theme(self, fig: Figure):
+        """Setzt die Farben des aktuellen Themes an Figure, Achsen, Texten und Legenden"""
+        colors = self.THEME_COLORS.get(self._theme(), self.THEME_COLORS['light'])
+        fig.set_facecolor(colors['figure'])
+        for text in fig.findobj(Text):
+            text.set_color(colors['text'])
+        for ax in fig.axes:
+            ax.set_facecolor(colors['axes'])
+            # Auch für Ticks, die erst beim Zeichnen entstehen
+            ax.tick_params(colors=colors['text'])
+            for spine in ax.spines.values():
+                spine.set_edgecolor(colors['edge'])
+            # Gitterfarbe bleibt auch für später erzeugte Ticks erhalten (ohne Achsen, z.B. leere Figure, kein Gitter)
+            if ax.axison:
+                ax.grid(True, color=colors['grid'], alpha=0.3)
+            legend = ax.get_legend()
+            if legend is not None:
+                legend.get_frame().set_facecolor(colors['axes'])
+                legend.get_frame().set_edgecolor(colors['edge'])
+                
+                
+    def prewarm(self):
+        """Zeichnet eine leere Figure mit Agg, damit Schriften und Renderer beim ersten Graphen schon geladen sind"""
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        FigureCanvasAgg(self._create_empty_figure("SystemMonitorX")).draw()
+        
+    def create_system_overview_graph(self, data: GraphData, 
                                    save_path: Optional[str] = None) -> Figure:
         """Erstellt einen Überblicksgraphen für alle Systemdaten"""
+        return self.create_graph("overview", data, save_path)
+        
+    def create_cpu_graph(self, data: GraphData, 
+                        save_path: Optional[str] = None) -> Figure:
+        """Erstellt einen detaillierten CPU-Graphen"""
+        return self.create_graph("cpu", data, save_path)
+        
+    def create_memory_graph(self, data: GraphData, 
+                           save_path: Optional[str] = None) -> Figure:
+        """Erstellt einen detaillierten Memory-Graphen"""
+        return self.create_graph("memory", data, save_path)
+        
+    def create_disk_graph(self, data: GraphData, 
+                         save_path: Optional[str] = None) -> Figure:
+        """Erstellt einen detaillierten Disk-Graphen"""
+        return self.create_graph("disk", data, save_path)
+        
+    def create_range_graph(self, graph_type: str, query_engine, start: Optional[float] = None,
+                           end: Optional[float] = None, save_path: Optional[str] = None) -> Figure:
+        """Fragt einen Zeitraum über alle Log-Dateien und Sitzungen ab (log_query.LogQueryEngine) und zeichnet ihn
+        
+        Es werden nur die Felder des Graph-Typs gelesen; Start und Ende sind Epoch-Sekunden.
+        """
+        data = query_engine.query(start, end, self.GRAPH_FIELDS[graph_type])
+        return self.create_graph(graph_type, data, save_path)
+        
+    def create_graph(self, graph_type: str, data: GraphData, save_path: Optional[str] = None) -> Figure:
+        """Füllt eine wiederverwendete oder neu gebaute Figure des Graph-Typs mit den Daten
         
-        if not data:
-            return self._create_empty_figure("Keine Daten verfügbar")
+        Ohne Tk-Aufrufe, kann daher auch in einem Worker-Thread laufen (siehe graph_job.GraphJob).
+        """
+        columns = self._prepare_columns(data, self.GRAPH_FIELDS[graph_type])
+        if columns is None:
+            return self._create_empty_figure(self.EMPTY_MESSAGES[graph_type])
             
-        # Daten vorbereiten
-        timestamps = [datetime.fromisoformat(entry['timestamp']) for entry in data]
-        cpu_percent = [float(entry['cpu_percent']) for entry in data]
-        memory_percent = [float(entry['memory_percent']) for entry in data]
-        disk_percent = [float(entry['disk_percent']) for entry in data]
-        
-        # Figure erstellen
-        fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=(12, 8), 
-                                            sharex=True, height_ratios=[1, 1, 1])
+        key = (graph_type, self._theme())
+        fig = self.pool.acquire(key, lambda: self._build_figure(graph_type, key))
+        self._set_data(fig, columns)
+        
+        if save_path:
+            fig.savefig(save_path, dpi=300, bbox_inches='tight', 
+                       facecolor=fig.get_facecolor())
+                       
+        return fig
+        
+    def release_figure(self, fig: Figure):
+        """Gibt die Figure eines geschlossenen Fensters zur Wiederverwendung zurück
+        
+        Die vollen Datenreihen werden freigegeben; Figures ohne Pool-Eintrag (z.B. leere) verwirft der Garbage Collector.
+        """
+        layout = getattr(fig, LAYOUT_ATTRIBUTE, None)
+        if layout is None:
+            return
+        for state in layout['series']:
+            state['timestamps'] = state['values'] = None
+        self.pool.release(layout['key'], fig)
+        
+    def _build_figure(self, graph_type: str, key: Tuple[str, str]) -> Figure:
+        """Baut Achsen, Beschriftungen und leere Linien eines Graph-Typs"""
+        fig, series = getattr(self, f"_build_{graph_type}")()
+        self._apply_theme(fig)
+        # Y-Grenzen fester Achsen merken, Zoomen im vorherigen Fenster soll beim nächsten nicht nachwirken
+        axes = [(ax, ax.get_autoscaley_on(), ax.get_ylim()) for ax in fig.axes]
+        setattr(fig, LAYOUT_ATTRIBUTE, {'key': key, 'series': series, 'axes': axes})
+        return fig
+        
+    def _build_overview(self) -> Tuple[Figure, List[Dict[str, Any]]]:
+        """Systemübersicht: CPU, RAM und Festplatte untereinander"""
+        fig = Figure(figsize=(12, 8))
+        ax1, ax2, ax3 = fig.subplots(3, 1, sharex=True, height_ratios=[1, 1, 1])
         fig.suptitle('SystemMonitorX - Systemübersicht', fontsize=16, fontweight='bold')
         
         # CPU-Graph
-        ax1.plot(timestamps, cpu_percent, color='#00ff00', linewidth=2, label='CPU')
-        ax1.fill_between(timestamps, cpu_percent, alpha=0.3, color='#00ff00')
+        series = [self._add_series(ax1, 'cpu_percent', fill_alpha=0.3, color='#00ff00', linewidth=2, label='CPU')]
         ax1.set_ylabel('CPU (%)', fontweight='bold')
         ax1.set_ylim(0, 100)
         ax1.grid(True, alpha=0.3)
         ax1.legend()
         
         # Memory-Graph
-        ax2.plot(timestamps, memory_percent, color='#007acc', linewidth=2, label='RAM')
-        ax2.fill_between(timestamps, memory_percent, alpha=0.3, color='#007acc')
+        series.append(self._add_series(ax2, 'memory_percent', fill_alpha=0.3, color='#007acc', linewidth=2,
+                                       label='RAM'))
         ax2.set_ylabel('RAM (%)', fontweight='bold')
         ax2.set_ylim(0, 100)
         ax2.grid(True, alpha=0.3)
         ax2.legend()
         
         # Disk-Graph
-        ax3.plot(timestamps, disk_percent, color='#ff6600', linewidth=2, label='Festplatte')
-        ax3.fill_between(timestamps, disk_percent, alpha=0.3, color='#ff6600')
+        series.append(self._add_series(ax3, 'disk_percent', fill_alpha=0.3, color='#ff6600', linewidth=2,
+                                       label='Festplatte'))
         ax3.set_ylabel('Festplatte (%)', fontweight='bold')
         ax3.set_xlabel('Zeit', fontweight='bold')
         ax3.set_ylim(0, 100)
@@ -82,32 +261,16 @@ class GraphViewer:
         ax3.legend()
         
         # X-Achse formatieren
-        ax3.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M'))
-        ax3.xaxis.set_major_locator(mdates.MinuteLocator(interval=5))
-        plt.setp(ax3.xaxis.get_majorticklabels(), rotation=45)
-        
-        plt.tight_layout()
-        
-        if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight', 
-                       facecolor=fig.get_facecolor())
-            
-        return fig
-        
-    def create_cpu_graph(self, data: List[Dict[str, Any]], 
-                        save_path: Optional[str] = None) -> Figure:
-        """Erstellt einen detaillierten CPU-Graphen"""
-        
-        if not data:
-            return self._create_empty_figure("Keine CPU-Daten verfügbar")
-            
-        timestamps = [datetime.fromisoformat(entry['timestamp']) for entry in data]
-        cpu_percent = [float(entry['cpu_percent']) for entry in data]
-        
-        fig, ax = plt.subplots(figsize=(12, 6))
-        ax.plot(timestamps, cpu_percent, color='#00ff00', linewidth=3, label='CPU-Auslastung')
-        ax.fill_between(timestamps, cpu_percent, alpha=0.4, color='#00ff00')
-        
+        self._format_time_axis(ax3)
+        return fig, series
+        
+    def _build_cpu(self) -> Tuple[Figure, List[Dict[str, Any]]]:
+        """CPU-Auslastung"""
+        fig = Figure(figsize=(12, 6))
+        ax = fig.add_subplot()
+        series = [self._add_series(ax, 'cpu_percent', fill_alpha=0.4, color='#00ff00', linewidth=3,
+                                   label='CPU-Auslastung')]
+                                   
         ax.set_title('CPU-Auslastung über Zeit', fontsize=16, fontweight='bold')
         ax.set_ylabel('CPU (%)', fontweight='bold')
         ax.set_xlabel('Zeit', fontweight='bold')
@@ -116,146 +279,333 @@ class GraphViewer:
         ax.legend()
         
         # X-Achse formatieren
-        ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M'))
-        ax.xaxis.set_major_locator(mdates.MinuteLocator(interval=5))
-        plt.setp(ax.xaxis.get_majorticklabels(), rotation=45)
-        
-        plt.tight_layout()
-        
-        if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight', 
-                       facecolor=fig.get_facecolor())
-            
-        return fig
+        self._format_time_axis(ax)
+        return fig, series
         
-    def create_memory_graph(self, data: List[Dict[str, Any]], 
-                           save_path: Optional[str] = None) -> Figure:
-        """Erstellt einen detaillierten Memory-Graphen"""
+    def _build_memory(self) -> Tuple[Figure, List[Dict[str, Any]]]:
+        """RAM in Prozent und in GB"""
+        return self._build_usage_graph('memory', 'RAM', '#007acc', '#ff6600')
         
-        if not data:
-            return self._create_empty_figure("Keine Memory-Daten verfügbar")
-            
-        timestamps = [datetime.fromisoformat(entry['timestamp']) for entry in data]
-        memory_percent = [float(entry['memory_percent']) for entry in data]
-        memory_used = [float(entry['memory_used_gb']) for entry in data]
-        memory_total = [float(entry['memory_total_gb']) for entry in data]
+    def _build_disk(self) -> Tuple[Figure, List[Dict[str, Any]]]:
+        """Festplatte in Prozent und in GB"""
+        return self._build_usage_graph('disk', 'Festplatte', '#ff6600', '#ff4444')
         
-        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 8), sharex=True)
+    def _build_usage_graph(self, prefix: str, name: str, percent_color: str,
+                           used_color: str) -> Tuple[Figure, List[Dict[str, Any]]]:
+        """Auslastung in Prozent (oben) und belegte/gesamte Größe in GB (unten)"""
+        fig = Figure(figsize=(12, 8))
+        ax1, ax2 = fig.subplots(2, 1, sharex=True)
         
         # Prozent-Graph
-        ax1.plot(timestamps, memory_percent, color='#007acc', linewidth=3, label='RAM-Auslastung')
-        ax1.fill_between(timestamps, memory_percent, alpha=0.4, color='#007acc')
-        ax1.set_title('RAM-Auslastung über Zeit', fontsize=16, fontweight='bold')
-        ax1.set_ylabel('RAM (%)', fontweight='bold')
+        series = [self._add_series(ax1, f"{prefix}_percent", fill_alpha=0.4, color=percent_color, linewidth=3,
+                                   label=f"{name}-Auslastung")]
+        ax1.set_title(f"{name}-Auslastung über Zeit", fontsize=16, fontweight='bold')
+        ax1.set_ylabel(f"{name} (%)", fontweight='bold')
         ax1.set_ylim(0, 100)
         ax1.grid(True, alpha=0.3)
         ax1.legend()
         
         # GB-Graph
-        ax2.plot(timestamps, memory_used, color='#ff6600', linewidth=3, label='Verwendet')
-        ax2.plot(timestamps, memory_total, color='#00ff00', linewidth=3, label='Gesamt')
-        ax2.fill_between(timestamps, memory_used, alpha=0.4, color='#ff6600')
-        ax2.set_ylabel('RAM (GB)', fontweight='bold')
+        series.append(self._add_series(ax2, f"{prefix}_used_gb", fill_alpha=0.4, color=used_color, linewidth=3,
+                                       label='Verwendet'))
+        series.append(self._add_series(ax2, f"{prefix}_total_gb", color='#00ff00', linewidth=3, label='Gesamt'))
+        ax2.set_ylabel(f"{name} (GB)", fontweight='bold')
         ax2.set_xlabel('Zeit', fontweight='bold')
         ax2.grid(True, alpha=0.3)
         ax2.legend()
         
         # X-Achse formatieren
-        ax2.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M'))
-        ax2.xaxis.set_major_locator(mdates.MinuteLocator(interval=5))
-        plt.setp(ax2.xaxis.get_majorticklabels(), rotation=45)
-        
-        plt.tight_layout()
+        self._format_time_axis(ax2)
+        return fig, series
         
-        if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight', 
-                       facecolor=fig.get_facecolor())
+    def _prepare_columns(self, data: GraphData, fields: Sequence[str]) -> Optional[Dict[str, np.ndarray]]:
+        """Bringt Log-Zeilen oder Verlaufs-Spalten in ein einheitliches Spaltenformat"""
+        if data is None:
+            return None
             
-        return fig
-        
-    def create_disk_graph(self, data: List[Dict[str, Any]], 
-                         save_path: Optional[str] = None) -> Figure:
-        """Erstellt einen detaillierten Disk-Graphen"""
-        
-        if not data:
-            return self._create_empty_figure("Keine Disk-Daten verfügbar")
-            
-        timestamps = [datetime.fromisoformat(entry['timestamp']) for entry in data]
-        disk_percent = [float(entry['disk_percent']) for entry in data]
-        disk_used = [float(entry['disk_used_gb']) for entry in data]
-        disk_total = [float(entry['disk_total_gb']) for entry in data]
-        
-        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 8), sharex=True)
-        
-        # Prozent-Graph
-        ax1.plot(timestamps, disk_percent, color='#ff6600', linewidth=3, label='Festplatten-Auslastung')
-        ax1.fill_between(timestamps, disk_percent, alpha=0.4, color='#ff6600')
-        ax1.set_title('Festplatten-Auslastung über Zeit', fontsize=16, fontweight='bold')
-        ax1.set_ylabel('Festplatte (%)', fontweight='bold')
-        ax1.set_ylim(0, 100)
-        ax1.grid(True, alpha=0.3)
-        ax1.legend()
-        
-        # GB-Graph
-        ax2.plot(timestamps, disk_used, color='#ff4444', linewidth=3, label='Verwendet')
-        ax2.plot(timestamps, disk_total, color='#00ff00', linewidth=3, label='Gesamt')
-        ax2.fill_between(timestamps, disk_used, alpha=0.4, color='#ff4444')
-        ax2.set_ylabel('Festplatte (GB)', fontweight='bold')
-        ax2.set_xlabel('Zeit', fontweight='bold')
-        ax2.grid(True, alpha=0.3)
-        ax2.legend()
-        
-        # X-Achse formatieren
-        ax2.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M'))
-        ax2.xaxis.set_major_locator(mdates.MinuteLocator(interval=5))
-        plt.setp(ax2.xaxis.get_majorticklabels(), rotation=45)
-        
-        plt.tight_layout()
-        
-        if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight', 
-                       facecolor=fig.get_facecolor())
+        if isinstance(data, dict):
+            if len(data.get('timestamp', [])) == 0:
+                return None
+            columns = {'timestamp': to_datetime64(data['timestamp'])}
+            for field in fields:
+                columns[field] = np.asarray(data[field], dtype=float)
+        else:
+            if not data:
+                return None
+            # Zeilen nur einsammeln, die Umwandlung erfolgt je Spalte in einem Schritt
+            columns = {'timestamp': to_datetime64([entry['timestamp'] for entry in data])}
+            for field in fields:
+                columns[field] = np.array([entry[field] for entry in data], dtype=float)
+                
+        return columns
+        
+    def _add_series(self, ax, field: str, fill_alpha: Optional[float] = None, **style) -> Dict[str, Any]:
+        """Legt eine leere Linie für ein Feld an (die Fläche folgt mit den ersten Daten)
+        
+        Beim Zoomen und Verschieben wird der sichtbare Ausschnitt aus den vollen Daten neu reduziert.
+        """
+        # Leere datetime64-Reihe, damit die Zeitachse ihre Einheit schon vor den ersten Daten kennt
+        line, = ax.plot(np.array([], dtype='datetime64[us]'), [], **style)
+        state = {
+            'field': field, 'line': line, 'fill': None, 'fill_alpha': fill_alpha, 'color': style.get('color'),
+            'timestamps': None, 'values': None, 'range': None
+        }
+        ax.callbacks.connect('xlim_changed', lambda axes: self._refresh_series(axes, state))
+        return state
+        
+    def _set_data(self, fig: Figure, columns: Dict[str, np.ndarray]):
+        """Tauscht die Daten aller Reihen aus und setzt die Achsen auf den neuen Zeitraum"""
+        layout = getattr(fig, LAYOUT_ATTRIBUTE)
+        timestamps = columns['timestamp']
+        for state in layout['series']:
+            values = columns[state['field']]
+            state['timestamps'], state['values'] = timestamps, values
+            width = int(state['line'].axes.bbox.width)
+            state['range'] = (0, len(timestamps), width)
+            x, y = downsample_minmax(timestamps, values, width) if self.downsample else (timestamps, values)
+            state['line'].set_data(x, y)
+            if state['fill_alpha']:
+                self._set_fill(state, x, y)
+                
+        filled = {state['line'].axes for state in layout['series'] if state['fill_alpha']}
+        for ax, autoscaley, ylim in layout['axes']:
+            ax.set_autoscalex_on(True)
+            if autoscaley:
+                ax.set_autoscaley_on(True)
+            else:
+                ax.set_ylim(ylim)
+            ax.relim()
+            ax.autoscale_view()
+            # Flächen reichen bis 0 (auto=None lässt die automatische Skalierung für die nächsten Daten an)
+            if autoscaley and ax in filled:
+                ax.set_ylim(bottom=0, auto=None)
+                
+        fig.tight_layout()
+        
+    @staticmethod
+    def _set_fill(state: Dict[str, Any], x: np.ndarray, y: np.ndarray):
+        """Setzt die Fläche unter einer Linie (ab matplotlib 3.10 in place, sonst neu angelegt)"""
+        fill = state['fill']
+        if fill is not None and hasattr(fill, 'set_data'):
+            fill.set_data(x, y, 0)
+            return
+        if fill is not None:
+            fill.remove()
+        state['fill'] = state['line'].axes.fill_between(x, y, alpha=state['fill_alpha'], color=state['color'])
+        
+    def _refresh_series(self, axes, state: Dict[str, Any]):
+        """Reduziert den sichtbaren Bereich (plus je ein Punkt links und rechts) aus den vollen Daten"""
+        timestamps, values = state['timestamps'], state['values']
+        if not self.downsample or timestamps is None:
+            return
+        lo, hi = (np.datetime64(mdates.num2date(limit).replace(tzinfo=None), 'us') for limit in axes.get_xlim())
+        start = max(0, int(np.searchsorted(timestamps, lo, side='left')) - 1)
+        end = min(len(timestamps), int(np.searchsorted(timestamps, hi, side='right')) + 1)
+        visible = (start, end, int(axes.bbox.width))
+        if visible == state['range'] or end - start < 2:
+            return
+        state['range'] = visible
+        
+        x, y = downsample_minmax(timestamps[start:end], values[start:end], visible[2])
+        state['line'].set_data(x, y)
+        # Fläche erst ab matplotlib 3.10 anpassbar; neu anlegen würde die geteilte Zeitachse zurücksetzen
+        if state['fill'] is not None and hasattr(state['fill'], 'set_data'):
+            state['fill'].set_data(x, y, 0)
             
-        return fig
+    @staticmethod
+    def _format_time_axis(ax):
+        """Passt Zeitachsen-Ticks an den Zeitraum an (Minuten bis Tage, z.B. bei Abfragen über mehrere Sitzungen)"""
+        locator = mdates.AutoDateLocator()
+        ax.xaxis.set_major_locator(locator)
+        ax.xaxis.set_major_formatter(mdates.ConciseDateFormatter(locator))
+        ax.tick_params(axis='x', labelrotation=45)
         
     def _create_empty_figure(self, message: str) -> Figure:
         """Erstellt eine leere Figure mit Nachricht"""
-        fig, ax = plt.subplots(figsize=(8, 6))
+        fig = Figure(figsize=(8, 6))
+        ax = fig.add_subplot()
         ax.text(0.5, 0.5, message, ha='center', va='center', 
                 transform=ax.transAxes, fontsize=14, fontweight='bold')
         ax.set_xlim(0, 1)
         ax.set_ylim(0, 1)
         ax.axis('off')
+        self._apply_theme(fig)
         return fig
         
-    def create_tkinter_window(self, data: List[Dict[str, Any]], 
-                             graph_type: str = "overview") -> tk.Toplevel:
-        """Erstellt ein Tkinter-Fenster mit Graphen"""
+    def create_tkinter_window(self, data: GraphData, 
+                             graph_type: str = "overview", fig: Optional[Figure] = None) -> tk.Toplevel:
+        """Erstellt ein Tkinter-Fenster mit Graphen (die Figure geht beim Schließen an den Pool zurück)
+        
+        Mit fig wird eine bereits (z.B. in einem GraphJob) aufgebaute Figure nur noch eingehängt.
+        """
         
         window = tk.Toplevel()
         window.title(f"SystemMonitorX - {graph_type.title()} Graph")
         window.geometry("1000x700")
         
         # Graph erstellen
-        if graph_type == "overview":
-            fig = self.create_system_overview_graph(data)
-        elif graph_type == "cpu":
-            fig = self.create_cpu_graph(data)
-        elif graph_type == "memory":
-            fig = self.create_memory_graph(data)
-        elif graph_type == "disk":
-            fig = self.create_disk_graph(data)
-        else:
+        if fig is None and graph_type in self.GRAPH_FIELDS:
+            fig = self.create_graph(graph_type, data)
+        elif fig is None:
             fig = self._create_empty_figure("Unbekannter Graph-Typ")
             
         # Canvas erstellen
         canvas = FigureCanvasTkAgg(fig, window)
-        canvas.draw()
+        # Gezeichnet wird im Leerlauf nach dem ersten Layout des Fensters (die Größenänderung zeichnet ohnehin neu)
+        canvas.draw_idle()
         canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
         
         # Toolbar
-        from matplotlib.backends.backend_tkagg import NavigationToolbar2Tk
         toolbar = NavigationToolbar2Tk(canvas, window)
         toolbar.update()
         
-        return window 
\ No newline at end of file
+        def close():
+            window.destroy()
+            self.release_figure(fig)
+            
+        window.protocol("WM_DELETE_WINDOW", close)
+        return window
+        
+    def create_live_window(self, system_monitor, window_seconds: float = 300,
+                           fps: float = 10) -> 'LiveGraphWindow':
+        """Erstellt ein Fenster, das die laufenden Messwerte als scrollendes Zeitfenster zeigt"""
+        return LiveGraphWindow(system_monitor, self.theme_manager, window_seconds, fps)
+
+class LiveGraphWindow:
+    """Live-Graph mit festem Zeitfenster, neu gezeichnet per Blitting statt vollständigem draw()
+    
+    Achsen, Gitter und Legende liegen in einem gespeicherten Hintergrund; pro Frame werden nur
+    die vier Linien darauf gezeichnet und der Achsenbereich auf die Leinwand kopiert.
+    """
+    
+    # (Feld, Beschriftung, Farbe); cpu_core_max ist die höchste Auslastung eines einzelnen Kerns
+    SERIES = (
+        ('cpu_percent', 'CPU', '#00ff00'),
+        ('cpu_core_max', 'CPU (max. Kern)', '#ffcc00'),
+        ('memory_percent', 'RAM', '#007acc'),
+        ('disk_percent', 'Festplatte', '#ff6600')
+    )
+    
+    def __init__(self, system_monitor, theme_manager=None, window_seconds: float = 300, fps: float = 10):
+        """Erstellt das Fenster, füllt es aus dem Verlauf und abonniert neue Messwerte"""
+        self.system_monitor = system_monitor
+        self.window_seconds = window_seconds
+        self.frame_interval = max(1, int(1000 / fps))
+        dark = theme_manager is not None and theme_manager.current_theme == "dark"
+        
+        # Ringpuffer mit Reserve, damit der linke Rand auch bei verzögerten Messwerten gefüllt bleibt
+        interval = getattr(system_monitor, 'update_interval', 1.0) or 1.0
+        self.buffer = RingBuffer(int(np.ceil(window_seconds / interval)) + 2, len(self.SERIES))
+        self.lock = threading.Lock()
+        self._row = np.empty(len(self.SERIES))
+        self._prefill()
+        
+        # Frame-Statistik
+        self.frame_count = 0
+        self.frame_time = 0.0  # Summe der Zeichenzeit in Sekunden
+        self._started = time.perf_counter()
+        
+        self.window = tk.Toplevel()
+        self.window.title("SystemMonitorX - Live-Graph")
+        self.window.geometry("1000x500")
+        
+        self.figure = Figure(figsize=(10, 5), facecolor='#1a1a1a' if dark else '#f0f0f0')
+        self.ax = self.figure.add_subplot(facecolor='#2b2b2b' if dark else '#ffffff')
+        text_color = '#ffffff' if dark else '#000000'
+        self.ax.set_title(f"Live - letzte {window_seconds:g} Sekunden", fontweight='bold', color=text_color)
+        self.ax.set_xlabel('Sekunden', fontweight='bold', color=text_color)
+        self.ax.set_ylabel('Auslastung (%)', fontweight='bold', color=text_color)
+        self.ax.tick_params(colors=text_color)
+        self.ax.set_xlim(-window_seconds, 0)
+        self.ax.set_ylim(0, 100)
+        self.ax.grid(True, alpha=0.3)
+        
+        # Animierte Linien werden von draw() ausgelassen und landen nicht im Hintergrund
+        self.lines = [self.ax.plot([], [], color=color, linewidth=2, label=label, animated=True)[0]
+                      for _, label, color in self.SERIES]
+        self.ax.legend(handles=self.lines, loc='upper left')
+        self.figure.tight_layout()
+        
+        self.canvas = FigureCanvasTkAgg(self.figure, self.window)
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.background = None
+        self._draw_connection = self.canvas.mpl_connect('draw_event', self._on_draw)
+        self.canvas.draw()
+        
+        self.subscription = system_monitor.add_callback(self._on_sample, policy="lossless", max_queue=100)
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        self._after_id = self.window.after(self.frame_interval, self._tick)
+        
+    def _prefill(self):
+        """Übernimmt das aktuelle Zeitfenster aus dem Verlaufsspeicher"""
+        history = getattr(self.system_monitor, 'history', None)
+        if history is None or history.is_empty():
+            return
+        fields = [field for field, _, _ in self.SERIES if field in history.METRICS]
+        series = history.get_series(fields, start=time.time() - self.window_seconds, resolution=0)
+        row = self._row
+        for i, timestamp in enumerate(series['timestamp']):
+            for column, (field, _, _) in enumerate(self.SERIES):
+                row[column] = series[field][i] if field in series else np.nan
+            self.buffer.append(timestamp, row)
+            
+    def _on_sample(self, sample):
+        """Nimmt einen Messwert auf (läuft im Zustell-Thread des Sample-Bus, ohne Tk-Aufrufe)"""
+        row = np.array([
+            sample.cpu_percent if sample.has_cpu else np.nan,
+            max(sample.cpu_per_core) if sample.has_cpu and sample.cpu_per_core else np.nan,
+            sample.memory_percent if sample.has_memory else np.nan,
+            sample.disk_percent if sample.has_disk else np.nan
+        ])
+        with self.lock:
+            self.buffer.append(sample.timestamp or time.time(), row)
+            
+    def _on_draw(self, event):
+        """Speichert den Hintergrund nach jedem vollständigen Zeichnen (auch nach Größenänderungen)"""
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_lines()
+        
+    def _draw_lines(self):
+        """Setzt die Liniendaten relativ zu jetzt und zeichnet nur die Linien über den Hintergrund"""
+        started = time.perf_counter()
+        with self.lock:
+            timestamps, values = self.buffer.snapshot()
+        offsets = timestamps - time.time()
+        
+        self.canvas.restore_region(self.background)
+        for column, line in enumerate(self.lines):
+            line.set_data(offsets, values[:, column])
+            self.ax.draw_artist(line)
+        self.canvas.blit(self.ax.bbox)
+        
+        self.frame_count += 1
+        self.frame_time += time.perf_counter() - started
+        
+    def _tick(self):
+        """Zeichnet einen Frame und plant den nächsten (im Tk-Hauptthread)"""
+        try:
+            if self.background is not None:
+                self._draw_lines()
+        except Exception as e:
+            print(f"Fehler beim Zeichnen des Live-Graphen: {e}")
+        self._after_id = self.window.after(self.frame_interval, self._tick)
+        
+    def get_stats(self) -> Dict[str, float]:
+        """Gibt erreichte Bildrate und mittlere Zeichenzeit pro Frame zurück"""
+        elapsed = time.perf_counter() - self._started
+        return {
+            'frames': self.frame_count,
+            'fps': self.frame_count / elapsed if elapsed > 0 else 0.0,
+            'frame_ms': 1000 * self.frame_time / self.frame_count if self.frame_count else 0.0
+        }
+        
+    def close(self):
+        """Beendet Abonnement und Zeichen-Timer und schließt das Fenster"""
+        if self._after_id is not None:
+            self.window.after_cancel(self._after_id)
+            self._after_id = None
+        if self.subscription is not None:
+            self.system_monitor.remove_callback(self.subscription)
+            self.subscription = None
+        self.canvas.mpl_disconnect(self._draw_connection)
+        self.window.destroy()
@@ -3,16 +3,20 @@ Dashboard-Klasse für die Hauptbenutzeroberfläche
 """
 
 import customtkinter as ctk
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import threading
 import time
 from .custom_widgets import ModernFrame, GradientButton, ModernLabel, SystemInfoCard, AnimatedProgressBar, GlassmorphismFrame
-from ..graph_viewer import GraphViewer
+from ..graph_job import GraphJob
 from ..icon_manager import IconManager
+from ..sample import SystemSample
 
 class Dashboard:
     """Hauptdashboard der SystemMonitorX Anwendung"""
     
+    # Wartezeit nach dem ersten Zeichnen, bevor matplotlib im Hintergrund geladen wird
+    GRAPH_PREWARM_DELAY_MS = 2000
+    
     def __init__(self, root, system_monitor, widget_manager, tray_manager=None, theme_manager=None, data_logger=None, config_manager=None):
         """Initialisiert das Dashboard"""
         self.root = root
@@ -22,18 +26,25 @@ class Dashboard:
         self.theme_manager = theme_manager
         self.data_logger = data_logger
         self.config_manager = config_manager
-        self.graph_viewer = GraphViewer(theme_manager)
+        # Graph-Viewer (und damit matplotlib) erst bei Bedarf laden, siehe _get_graph_viewer
+        self.graph_viewer = None
+        self._graph_viewer_lock = threading.Lock()
         self.icon_manager = IconManager(theme_manager)
-        self.data = {}
+        self.data: Optional[SystemSample] = None
         
         # GUI-Elemente
         self.cpu_card = None
         self.memory_card = None
         self.disk_card = None
         self.system_card = None
+        self.logging_status_label = None
+        self.graph_status_label = None
+        self.graph_cancel_button = None
+        self.graph_job: Optional[GraphJob] = None
         
         self._setup_ui()
         self._start_monitoring()
+        self._schedule_graph_prewarm()
         
     def _setup_ui(self):
         """Erstellt die moderne, responsive Benutzeroberfläche"""
@@ -239,6 +250,15 @@ class Dashboard:
         )
         stop_logging_button.pack(side="left", padx=5)
         
+        # Buffer-Füllstand und Verluste, falls das Schreiben nicht vorankommt
+        self.logging_status_label = ModernLabel(
+            logging_section,
+            self.theme_manager,
+            text="",
+            font_size=11
+        )
+        self.logging_status_label.pack(pady=(0, 10))
+        
         # Graph-Sektion (kompakter)
         graph_section = GlassmorphismFrame(controls_container, self.theme_manager)
         graph_section.pack(fill="x", pady=(0, 10))
@@ -302,6 +322,41 @@ class Dashboard:
         )
         disk_graph_button.pack(side="left", padx=5)
         
+        graph_row3 = ctk.CTkFrame(graph_buttons_frame, fg_color="transparent")
+        graph_row3.pack(pady=5)
+        
+        live_graph_button = GradientButton(
+            graph_row3,
+            self.theme_manager,
+            self.icon_manager,
+            "graph_icon",
+            text="Live-Graph",
+            command=self._show_live_graph
+        )
+        live_graph_button.pack(side="left", padx=5)
+        
+        # Fortschritt der Graph-Aufbereitung im Hintergrund
+        graph_status_frame = ctk.CTkFrame(graph_section, fg_color="transparent")
+        graph_status_frame.pack(pady=(0, 10))
+        
+        self.graph_status_label = ModernLabel(
+            graph_status_frame,
+            self.theme_manager,
+            text="",
+            font_size=11
+        )
+        self.graph_status_label.pack(side="left", padx=5)
+        
+        self.graph_cancel_button = GradientButton(
+            graph_status_frame,
+            self.theme_manager,
+            text="Abbrechen",
+            width=90,
+            command=self._cancel_graph,
+            state="disabled"
+        )
+        self.graph_cancel_button.pack(side="left", padx=5)
+        
         # Konfigurations-Sektion (kompakter)
         config_section = GlassmorphismFrame(controls_container, self.theme_manager)
         config_section.pack(fill="x")
@@ -357,52 +412,48 @@ class Dashboard:
         
     def _start_monitoring(self):
         """Startet das System-Monitoring"""
-        self.system_monitor.add_callback(self._update_ui)
+        # Jeder Abonnent bekommt eine eigene Queue: Logging verlustfrei, GUI nur den neuesten Wert
+        if self.data_logger:
+            self.system_monitor.add_callback(self.data_logger.log_data, policy="lossless")
+        if self.widget_manager:
+            self.system_monitor.add_callback(self.widget_manager.update_widget_data, policy="latest")
+        self.system_monitor.add_callback(self._update_ui, policy="latest")
         self.system_monitor.start()
         
-    def _update_ui(self, data: Dict[str, Any]):
+    def _update_ui(self, data: SystemSample):
         """Aktualisiert die Benutzeroberfläche mit neuen Daten"""
         self.data = data
         
-        # Daten loggen
-        if self.data_logger:
-            self.data_logger.log_data(data)
-        
-        # Widgets mit neuen Daten aktualisieren
-        if self.widget_manager:
-            self.widget_manager.update_widget_data(data)
-        
         # UI-Updates im Hauptthread ausführen
         self.root.after(0, self._update_labels)
         
     def _update_labels(self):
         """Aktualisiert die Karten mit aktuellen Daten und Progress-Bars"""
-        if not self.data:
+        sample = self.data
+        if not sample:
             return
             
         # CPU-Informationen
-        if 'cpu' in self.data:
-            cpu_info = self.data['cpu']
-            cpu_percent = cpu_info['percent']
+        if sample.has_cpu:
+            cpu_percent = sample.cpu_percent
             cpu_text = f"{cpu_percent:.1f}%"
             
-            if cpu_info.get('freq'):
-                freq = cpu_info['freq']['current'] / 1000  # MHz zu GHz
+            if sample.cpu_freq:
+                freq = sample.cpu_freq['current'] / 1000  # MHz zu GHz
                 cpu_text += f" | {freq:.1f} GHz"
                 
             self.cpu_card.update_value(cpu_text, cpu_percent / 100.0)
-            self.cpu_card.update_info(f"Kerne: {cpu_info['count']}")
+            self.cpu_card.update_info(f"Kerne: {sample.cpu_count}")
             
             # Tray-Icon aktualisieren (CPU)
             if self.tray_manager:
                 self.tray_manager.update_icon(cpu_percent=cpu_percent)
-            
+                
         # RAM-Informationen
-        if 'memory' in self.data:
-            mem_info = self.data['memory']
-            mem_percent = mem_info['percent']
-            used_gb = mem_info['used'] / (1024**3)
-            total_gb = mem_info['total'] / (1024**3)
+        if sample.has_memory:
+            mem_percent = sample.memory_percent
+            used_gb = sample.memory_used / (1024**3)
+            total_gb = sample.memory_total / (1024**3)
             mem_text = f"{mem_percent:.1f}% | {used_gb:.1f} GB"
             
             self.memory_card.update_value(mem_text, mem_percent / 100.0)
@@ -411,25 +462,31 @@ class Dashboard:
             # Tray-Icon aktualisieren (RAM)
             if self.tray_manager:
                 self.tray_manager.update_icon(memory_percent=mem_percent)
-            
+                
         # Festplatten-Informationen
-        if 'disk' in self.data:
-            disk_info = self.data['disk']
-            disk_percent = disk_info['percent']
-            used_gb = disk_info['used'] / (1024**3)
-            total_gb = disk_info['total'] / (1024**3)
+        if sample.has_disk:
+            disk_percent = sample.disk_percent
+            used_gb = sample.disk_used / (1024**3)
+            total_gb = sample.disk_total / (1024**3)
             disk_text = f"{disk_percent:.1f}% | {used_gb:.1f} GB"
             
             self.disk_card.update_value(disk_text, disk_percent / 100.0)
             self.disk_card.update_info(f"Gesamt: {total_gb:.1f} GB")
             
         # System-Informationen
-        if 'system' in self.data:
-            sys_info = self.data['system']
-            username = sys_info.get('username', 'Unknown')
-            sys_text = f"{sys_info['platform']} {sys_info['platform_version']}"
-            self.system_card.update_value(sys_text)
-            self.system_card.update_info(f"Online: {username}")
+        sys_text = f"{sample.platform} {sample.platform_version}"
+        self.system_card.update_value(sys_text)
+        self.system_card.update_info(f"Online: {sample.username}")
+        
+        # Logging-Buffer
+        if self.data_logger and self.logging_status_label:
+            stats = self.data_logger.get_buffer_stats()
+            status = f"Buffer: {stats['buffered']}/{stats['max_buffered']}"
+            if stats['spill_pending']:
+                status += f" | ausgelagert: {stats['spill_pending']}"
+            if stats['spilled'] or stats['dropped']:
+                status += f" | gesamt ausgelagert: {stats['spilled']} | verworfen: {stats['dropped']}"
+            self.logging_status_label.configure(text=status)
             
     def _create_widget(self, widget_type: str):
         """Erstellt ein Desktop-Widget"""
@@ -464,7 +521,7 @@ class Dashboard:
                 # Icon-Manager aktualisieren
                 if self.icon_manager:
                     self.icon_manager.update_theme()
-                
+                    
                 # Fenster-Transparenz aktualisieren
                 transparency = self.theme_manager.get_transparency()
                 self.root.attributes('-alpha', transparency)
@@ -477,7 +534,10 @@ class Dashboard:
         """Startet das Daten-Logging"""
         try:
             if self.data_logger:
-                self.data_logger.start_logging("both")  # CSV und JSON
+                log_format = "both"  # CSV und JSON Lines
+                if self.config_manager:
+                    log_format = self.config_manager.get_config("dashboard.log_format") or log_format
+                self.data_logger.start_logging(log_format)
                 print("Daten-Logging gestartet")
         except Exception as e:
             print(f"Fehler beim Starten des Loggings: {e}")
@@ -491,20 +551,104 @@ class Dashboard:
         except Exception as e:
             print(f"Fehler beim Stoppen des Loggings: {e}")
             
+    def _get_graph_viewer(self):
+        """Gibt den Graph-Viewer zurück und importiert ihn samt matplotlib beim ersten Aufruf"""
+        with self._graph_viewer_lock:
+            if self.graph_viewer is None:
+                from ..graph_viewer import GraphViewer
+                self.graph_viewer = GraphViewer(self.theme_manager)
+            return self.graph_viewer
+            
+    def _schedule_graph_prewarm(self):
+        """Lädt die Graph-Unterstützung nach dem ersten Zeichnen des Fensters im Hintergrund vor (dashboard.prewarm_graphs)"""
+        if self.config_manager and self.config_manager.get_config("dashboard.prewarm_graphs") is False:
+            return
+        # after_idle läuft erst, wenn das Fenster gezeichnet ist; die Wartezeit lässt die ersten Messwerte durch
+        self.root.after_idle(lambda: self.root.after(self.GRAPH_PREWARM_DELAY_MS, self._start_graph_prewarm))
+        
+    def _start_graph_prewarm(self):
+        """Startet das Vorladen in einem Hintergrund-Thread, damit die Oberfläche bedienbar bleibt"""
+        if self.graph_viewer is None:
+            threading.Thread(target=self._prewarm_graphs, name="GraphPrewarm", daemon=True).start()
+            
+    def _prewarm_graphs(self):
+        """Importiert matplotlib und lädt Schriften vor (Hintergrund-Thread, keine Tk-Aufrufe)"""
+        try:
+            self._get_graph_viewer().prewarm()
+        except Exception as e:
+            print(f"Fehler beim Vorladen der Graphen: {e}")
+            
     def _show_graph(self, graph_type: str):
-        """Zeigt einen Graphen an"""
+        """Bereitet einen Graphen im Hintergrund vor und zeigt ihn danach an (ein laufender Auftrag wird abgebrochen)"""
         try:
-            if self.data_logger:
-                # Neueste Log-Daten laden
-                data = self.data_logger.get_latest_log_data("csv")
-                if data:
-                    # Graph-Fenster erstellen
-                    self.graph_viewer.create_tkinter_window(data, graph_type)
-                else:
-                    print("Keine Log-Daten verfügbar. Starten Sie zuerst das Logging.")
+            self._cancel_graph()
+            # Ist der Graph-Viewer noch nicht geladen, importiert ihn der Worker-Thread
+            self.graph_job = GraphJob(self.graph_viewer or self._get_graph_viewer, graph_type, self._load_graph_data,
+                                      on_done=lambda job: self.root.after(0, self._attach_graph, job))
+            self.graph_job.start()
+            self.graph_cancel_button.configure(state="normal")
+            self._poll_graph_job()
+        except Exception as e:
+            print(f"Fehler beim Anzeigen des Graphen: {e}")
+            
+    def _load_graph_data(self, cancel_event, progress):
+        """Lädt die Graph-Daten (läuft im Worker-Thread des GraphJob, Abbruch und Fortschritt je Segment)"""
+        # Verlauf aus dem Arbeitsspeicher für den Zeitraum, den er abdeckt
+        history = self.system_monitor.history
+        recent = None
+        if not history.is_empty():
+            recent = history.get_series(start=time.time() - self.data_logger.GRAPH_RANGE) \
+                if self.data_logger else history.get_series()
+        if not self.data_logger:
+            return recent
+            
+        # Davor Log-Daten der letzten 24 Stunden über alle Dateien und Sitzungen (Aggregationsstufen, sonst Rohdaten)
+        data = self.data_logger.get_graph_data(cancel_event=cancel_event, progress=progress, recent=recent)
+        if not data and not cancel_event.is_set():
+            data = self.data_logger.get_latest_log_data("csv")
+        if not data:
+            print("Keine Log-Daten verfügbar. Starten Sie zuerst das Logging.")
+        return data
+        
+    def _poll_graph_job(self):
+        """Zeigt den Fortschritt des laufenden Auftrags an, solange er läuft"""
+        job = self.graph_job
+        if job is None or not job.active:
+            return
+        self.graph_status_label.configure(text=f"{job.message} ({job.progress:.0%})")
+        self.root.after(100, self._poll_graph_job)
+        
+    def _attach_graph(self, job: GraphJob):
+        """Hängt die fertige Figure in ein Fenster ein (Tk-Hauptthread)"""
+        if job is not self.graph_job:
+            # Von einem neueren Auftrag abgelöst
+            if job.figure is not None:
+                job.graph_viewer.release_figure(job.figure)
+            return
+        self.graph_job = None
+        self.graph_cancel_button.configure(state="disabled")
+        self.graph_status_label.configure(text="" if job.state == "done" else job.message)
+        try:
+            if job.state == "done" and not job.cancelled:
+                job.graph_viewer.create_tkinter_window(None, job.graph_type, fig=job.figure)
+            elif job.figure is not None:
+                job.graph_viewer.release_figure(job.figure)
         except Exception as e:
             print(f"Fehler beim Anzeigen des Graphen: {e}")
             
+    def _cancel_graph(self):
+        """Bricht die laufende Graph-Aufbereitung ab"""
+        if self.graph_job is not None and self.graph_job.active:
+            self.graph_job.cancel()
+            self.graph_status_label.configure(text="Abbrechen ...")
+            
+    def _show_live_graph(self):
+        """Zeigt die laufenden Messwerte als Live-Graph an"""
+        try:
+            self._get_graph_viewer().create_live_window(self.system_monitor)
+        except Exception as e:
+            print(f"Fehler beim Anzeigen des Live-Graphen: {e}")
+            
     def _save_config(self):
         """Speichert die aktuelle Konfiguration"""
         try:
@@ -0,0 +1,218 @@
+"""
+In-Memory-Verlauf für SystemMonitorX
+Ringpuffer mit festen Größen für Rohdaten und Aggregationsstufen (RRD-Prinzip)
+"""
+
+import math
+import threading
+import numpy as np
+from typing import Dict, List, Optional, Sequence
+from .sample import SystemSample
+
+class RingBuffer:
+    """Vorab allozierter Ringpuffer aus Zeitstempeln und einer festen Anzahl Spalten"""
+    
+    def __init__(self, capacity: int, width: int):
+        """Initialisiert den Ringpuffer"""
+        self.capacity = max(1, capacity)
+        self.timestamps = np.full(self.capacity, np.nan)
+        self.values = np.full((self.capacity, width), np.nan)
+        self.index = 0  # Nächste Schreibposition
+        self.size = 0
+        
+    def append(self, timestamp: float, row: np.ndarray):
+        """Schreibt eine Zeile und überschreibt bei vollem Puffer die älteste"""
+        self.timestamps[self.index] = timestamp
+        self.values[self.index] = row
+        self.index = (self.index + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        
+    def oldest_timestamp(self) -> Optional[float]:
+        """Gibt den ältesten gespeicherten Zeitstempel zurück"""
+        if self.size == 0:
+            return None
+        return float(self.timestamps[(self.index - self.size) % self.capacity])
+        
+    def snapshot(self, start: Optional[float] = None, end: Optional[float] = None):
+        """Gibt Zeitstempel und Werte chronologisch sortiert (als Kopie) zurück"""
+        if self.size < self.capacity:
+            timestamps = self.timestamps[:self.size]
+            values = self.values[:self.size]
+        else:
+            timestamps = np.concatenate((self.timestamps[self.index:], self.timestamps[:self.index]))
+            values = np.concatenate((self.values[self.index:], self.values[:self.index]))
+            
+        lo = 0 if start is None else int(np.searchsorted(timestamps, start, side='left'))
+        hi = len(timestamps) if end is None else int(np.searchsorted(timestamps, end, side='right'))
+        return timestamps[lo:hi].copy(), values[lo:hi].copy()
+        
+    @property
+    def nbytes(self) -> int:
+        """Belegter Speicher in Bytes"""
+        return self.timestamps.nbytes + self.values.nbytes
+
+class RollupLevel:
+    """Aggregationsstufe, die min, max und mean pro Zeit-Bucket inkrementell berechnet"""
+    
+    def __init__(self, bucket_seconds: float, retention_seconds: float, metric_count: int):
+        """Initialisiert die Aggregationsstufe"""
+        self.bucket_seconds = bucket_seconds
+        self.retention_seconds = retention_seconds
+        self.metric_count = metric_count
+        # Spalten: [min..., max..., mean...]
+        self.buffer = RingBuffer(int(math.ceil(retention_seconds / bucket_seconds)), 3 * metric_count)
+        
+        self.pending_bucket = None
+        self.pending_count = np.zeros(metric_count)  # Werte ohne NaN je Spalte
+        self.pending_min = np.empty(metric_count)
+        self.pending_max = np.empty(metric_count)
+        self.pending_sum = np.empty(metric_count)
+        
+    def add(self, timestamp: float, row: np.ndarray):
+        """Nimmt einen Rohwert in den aktuellen Bucket auf"""
+        bucket = math.floor(timestamp / self.bucket_seconds) * self.bucket_seconds
+        if self.pending_bucket is not None and bucket != self.pending_bucket:
+            self.commit()
+            
+        # Fehlende Messwerte (NaN) zählen wie bei min und max nicht mit
+        valid = ~np.isnan(row)
+        if self.pending_bucket is None:
+            self.pending_bucket = bucket
+            self.pending_count[:] = valid
+            self.pending_min[:] = row
+            self.pending_max[:] = row
+            self.pending_sum[:] = np.where(valid, row, 0.0)
+        else:
+            self.pending_count += valid
+            np.fmin(self.pending_min, row, out=self.pending_min)
+            np.fmax(self.pending_max, row, out=self.pending_max)
+            self.pending_sum += np.where(valid, row, 0.0)
+            
+    def _pending_row(self) -> np.ndarray:
+        """min, max und mean des offenen Buckets (mean NaN für Spalten ganz ohne Messwert)"""
+        mean = np.divide(self.pending_sum, self.pending_count, out=np.full(self.metric_count, np.nan),
+                         where=self.pending_count > 0)
+        return np.concatenate((self.pending_min, self.pending_max, mean))
+        
+    def commit(self):
+        """Schreibt den offenen Bucket in den Ringpuffer"""
+        if self.pending_bucket is None:
+            return
+        self.buffer.append(self.pending_bucket, self._pending_row())
+        self.pending_bucket = None
+        self.pending_count[:] = 0
+        
+    def snapshot(self, start: Optional[float] = None, end: Optional[float] = None):
+        """Gibt abgeschlossene Buckets und (falls vorhanden) den offenen Bucket zurück"""
+        timestamps, values = self.buffer.snapshot(start, end)
+        if self.pending_bucket is not None and (start is None or self.pending_bucket >= start) \
+                and (end is None or self.pending_bucket <= end):
+            timestamps = np.append(timestamps, self.pending_bucket)
+            values = np.vstack((values, self._pending_row()))
+        return timestamps, values
+
+class HistoryStore:
+    """Hält den Verlauf aller Metriken mit festem Speicherbedarf im Arbeitsspeicher"""
+    
+    # Gleiche Feldnamen wie in den Log-Dateien, damit Graphen beide Quellen lesen können
+    METRICS = (
+        'cpu_percent', 'memory_percent', 'memory_used_gb', 'memory_total_gb',
+        'disk_percent', 'disk_used_gb', 'disk_total_gb'
+    )
+    
+    # (Bucket-Größe, Aufbewahrung) in Sekunden
+    ROLLUPS = (
+        (10, 6 * 3600),
+        (60, 2 * 86400),
+        (300, 7 * 86400)
+    )
+    
+    def __init__(self, raw_seconds: float = 3600, sample_interval: float = 1.0):
+        """Initialisiert den Verlaufsspeicher"""
+        self.raw_seconds = raw_seconds
+        self.raw = RingBuffer(int(math.ceil(raw_seconds / sample_interval)), len(self.METRICS))
+        self.rollups = [RollupLevel(bucket, retention, len(self.METRICS)) for bucket, retention in self.ROLLUPS]
+        self.lock = threading.Lock()
+        self._row = np.empty(len(self.METRICS))
+        
+    def add_sample(self, sample: SystemSample):
+        """Nimmt einen Messwert in Rohdaten und alle Aggregationsstufen auf"""
+        gb = 1024**3
+        row = self._row
+        row[0] = sample.cpu_percent if sample.has_cpu else np.nan
+        if sample.has_memory:
+            row[1] = sample.memory_percent
+            row[2] = sample.memory_used / gb
+            row[3] = sample.memory_total / gb
+        else:
+            row[1:4] = np.nan
+        if sample.has_disk:
+            row[4] = sample.disk_percent
+            row[5] = sample.disk_used / gb
+            row[6] = sample.disk_total / gb
+        else:
+            row[4:7] = np.nan
+            
+        with self.lock:
+            self.raw.append(sample.timestamp, row)
+            for level in self.rollups:
+                level.add(sample.timestamp, row)
+                
+    def is_empty(self) -> bool:
+        """Gibt zurück, ob noch keine Messwerte vorliegen"""
+        return self.raw.size == 0
+        
+    def get_resolutions(self) -> List[float]:
+        """Gibt die verfügbaren Auflösungen zurück (0 = Rohdaten)"""
+        return [0] + [level.bucket_seconds for level in self.rollups]
+        
+    def choose_resolution(self, start: Optional[float]) -> float:
+        """Wählt die feinste Auflösung, die den gewünschten Zeitraum noch abdeckt"""
+        with self.lock:
+            oldest_raw = self.raw.oldest_timestamp()
+            if start is None or (oldest_raw is not None and start >= oldest_raw) or \
+                    self.raw.size < self.raw.capacity:
+                return 0
+            for level in self.rollups:
+                oldest = level.buffer.oldest_timestamp()
+                if level.buffer.size < level.buffer.capacity or (oldest is not None and start >= oldest):
+                    return level.bucket_seconds
+        return self.rollups[-1].bucket_seconds
+        
+    def get_series(self, fields: Optional[Sequence[str]] = None, start: Optional[float] = None,
+                   end: Optional[float] = None, resolution: Optional[float] = None) -> Dict[str, np.ndarray]:
+        """Gibt Spalten-Arrays für einen Zeitraum zurück (Zeitstempel als Epoch-Sekunden)
+        
+        Bei Aggregationsstufen enthält das Feld den Mittelwert, dazu kommen <feld>_min und <feld>_max.
+        """
+        if fields is None:
+            fields = self.METRICS
+        if resolution is None:
+            resolution = self.choose_resolution(start)
+            
+        with self.lock:
+            if not resolution:
+                timestamps, values = self.raw.snapshot(start, end)
+                rollup = False
+            else:
+                level = next((l for l in self.rollups if l.bucket_seconds == resolution), None)
+                if level is None:
+                    raise ValueError(f"Unbekannte Auflösung: {resolution}")
+                timestamps, values = level.snapshot(start, end)
+                rollup = True
+                
+        result = {'timestamp': timestamps}
+        metric_count = len(self.METRICS)
+        for field in fields:
+            i = self.METRICS.index(field)
+            if rollup:
+                result[field] = values[:, 2 * metric_count + i]
+                result[f"{field}_min"] = values[:, i]
+                result[f"{field}_max"] = values[:, metric_count + i]
+            else:
+                result[field] = values[:, i]
+        return result
+        
+    def get_memory_usage(self) -> int:
+        """Gibt den (festen) Speicherbedarf in Bytes zurück"""
+        return self.raw.nbytes + sum(level.buffer.nbytes for level in self.rollups)
@@ -0,0 +1,266 @@
+"""
+Katalog der Log-Dateien von SystemMonitorX
+Manifest logs/catalog.json mit Format, Zeitgrenzen, Zeilenanzahl und Feldern jeder Datei,
+damit Sitzungsauswahl und Zeitraum-Abfragen ohne Öffnen der Dateien auskommen
+
+Aufruf als Kommandozeilenwerkzeug:
+    python -m core.log_catalog --log-dir logs --rebuild
+"""
+
+import argparse
+import json
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional, Sequence, Tuple
+from . import log_reader
+from .log_recovery import atomic_write
+from .log_rotation import data_suffix, is_compressed, list_log_files
+
+CATALOG_FILE = "catalog.json"
+VERSION = 1
+
+def entry_name(path: Path) -> str:
+    """Name einer Log-Datei im Katalog (ohne Komprimierungsendung, die sich nach dem Schließen ändert)"""
+    path = Path(path)
+    return path.with_suffix('').name if is_compressed(path) else path.name
+
+def new_entry(path: Path, fields: Sequence[str] = (), is_open: bool = True) -> Dict[str, Any]:
+    """Katalogeintrag einer Datei ohne Zeitgrenzen"""
+    return {
+        'format': data_suffix(path).lstrip('.'),
+        'session': log_reader.part_key(path)[len("system_data_"):][:len("YYYYMMDD_HHMMSS")],
+        'first': None,
+        'last': None,
+        'rows': 0,
+        'fields': list(fields),
+        'open': is_open
+    }
+
+def scan_file(path: Path) -> Dict[str, Any]:
+    """Liest eine Log-Datei vollständig und gibt ihren Katalogeintrag zurück"""
+    entry = new_entry(path, is_open=False)
+    for record in log_reader.iter_file(path):
+        if entry['first'] is None:
+            entry['first'] = record['timestamp']
+            entry['fields'] = list(record)
+        entry['last'] = record['timestamp']
+        entry['rows'] += 1
+    return entry
+
+def estimate_entry(path: Path) -> Dict[str, Any]:
+    """Katalogeintrag mit günstig gelesenen Zeitgrenzen (log_reader.file_time_bounds), Zeilenanzahl unbekannt"""
+    entry = new_entry(path, is_open=False)
+    entry['first'], entry['last'] = log_reader.file_time_bounds(path)
+    entry['rows'] = None
+    return entry
+
+class LogCatalog:
+    """Verwaltet das Manifest eines Log-Verzeichnisses (geschrieben über temporäre Datei und rename)"""
+    
+    def __init__(self, log_dir: Path, fsync: bool = True):
+        """Initialisiert den Katalog (die Datei wird beim ersten Zugriff gelesen)"""
+        self.log_dir = Path(log_dir)
+        self.path = self.log_dir / CATALOG_FILE
+        self.fsync = fsync
+        self.lock = threading.Lock()
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self._loaded_mtime = None
+        
+    def _load(self):
+        """Liest die Katalogdatei, falls sie sich seit dem letzten Lesen geändert hat"""
+        try:
+            mtime = self.path.stat().st_mtime_ns
+        except FileNotFoundError:
+            self.files = {}
+            self._loaded_mtime = None
+            return
+        if mtime == self._loaded_mtime:
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+            self.files = data.get('files', {}) if data.get('version') == VERSION else {}
+        except (OSError, ValueError) as e:
+            print(f"Fehler beim Lesen des Log-Katalogs: {e}")
+            self.files = {}
+        self._loaded_mtime = mtime
+        
+    def _existing_names(self) -> Dict[str, Path]:
+        """Ordnet die Katalognamen aller vorhandenen Log-Dateien ihrem aktuellen Pfad zu (ein Verzeichnisdurchlauf)"""
+        return {entry_name(path): path for path in list_log_files(self.log_dir)}
+        
+    def _save(self):
+        """Schreibt den Katalog ohne Einträge gelöschter Dateien (Aufruf mit gehaltenem Lock)"""
+        existing = self._existing_names()
+        self.files = {name: entry for name, entry in sorted(self.files.items()) if name in existing}
+        data = {'version': VERSION, 'updated': datetime.now().isoformat(), 'files': self.files}
+        try:
+            atomic_write(self.path, json.dumps(data, indent=1).encode('utf-8'), fsync=self.fsync)
+            self._loaded_mtime = self.path.stat().st_mtime_ns
+        except OSError as e:
+            print(f"Fehler beim Schreiben des Log-Katalogs: {e}")
+            
+    def add_files(self, paths: Iterable[Path], fields: Sequence[str]):
+        """Trägt neu geöffnete Dateien ein (Zeitgrenzen folgen beim Schließen)"""
+        with self.lock:
+            self._load()
+            for path in paths:
+                self.files[entry_name(path)] = new_entry(path, fields)
+            self._save()
+            
+    def close_files(self, paths: Iterable[Path], first: Optional[float], last: Optional[float], rows: int):
+        """Trägt Zeitgrenzen und Zeilenanzahl geschlossener Dateien ein"""
+        with self.lock:
+            self._load()
+            for path in paths:
+                entry = self.files.setdefault(entry_name(path), new_entry(path))
+                entry.update({'first': first, 'last': last, 'rows': rows, 'open': False})
+            self._save()
+            
+    def refresh(self, paths: Optional[Iterable[Path]] = None) -> int:
+        """Liest Dateien neu ein, die noch als geöffnet gelten (Abbruch beim Schreiben) oder angegeben sind"""
+        with self.lock:
+            self._load()
+            existing = self._existing_names()
+            names = {entry_name(path) for path in paths or []}
+            names |= {name for name, entry in self.files.items() if entry.get('open')}
+            names &= set(existing)
+            for name in names:
+                self.files[name] = scan_file(existing[name])
+            if names or set(self.files) - set(existing):
+                self._save()
+            return len(names)
+            
+    def add_estimated(self, paths: Iterable[Path]) -> int:
+        """Trägt noch nicht katalogisierte Dateien ohne vollständiges Lesen ein (z.B. Logs älterer Versionen)
+        
+        Zeitgrenzen genügen für find_segments; die Zeilenanzahl bleibt unbekannt, bis rebuild() sie zählt.
+        """
+        with self.lock:
+            self._load()
+            names = {entry_name(path): path for path in paths}
+            added = 0
+            for name, path in names.items():
+                if name in self.files:
+                    continue
+                try:
+                    self.files[name] = estimate_entry(path)
+                    added += 1
+                except Exception as e:
+                    print(f"Fehler beim Einlesen von {path.name}: {e}")
+            if added:
+                self._save()
+            return added
+            
+    def rebuild(self) -> int:
+        """Erstellt den Katalog aus allen vorhandenen Log-Dateien neu"""
+        with self.lock:
+            self.files = {}
+            for path in list_log_files(self.log_dir):
+                try:
+                    self.files[entry_name(path)] = scan_file(path)
+                except Exception as e:
+                    print(f"Fehler beim Einlesen von {path.name}: {e}")
+            self._save()
+            return len(self.files)
+            
+    def unclean_files(self) -> List[Path]:
+        """Gibt die Dateien zurück, die nicht sauber geschlossen wurden (im Katalog offen) oder ihm fehlen"""
+        with self.lock:
+            self._load()
+            files = dict(self.files)
+        return [path for name, path in self._existing_names().items()
+                if name not in files or files[name].get('open')]
+                
+    def get_entries(self) -> Dict[Path, Dict[str, Any]]:
+        """Gibt die Einträge aller vorhandenen Dateien zurück, mit ihrem aktuellen (ggf. komprimierten) Pfad"""
+        with self.lock:
+            self._load()
+            files = dict(self.files)
+        return {path: files[name] for name, path in self._existing_names().items() if name in files}
+        
+    def find_segments(self, start: Optional[float] = None,
+                      end: Optional[float] = None) -> List[Tuple[float, float, Path]]:
+        """Wie log_reader.find_segments, die Zeitgrenzen kommen aber aus dem Katalog
+        
+        Nur geöffnete und nicht katalogisierte Dateien (z.B. ältere Logs vor dem ersten Rebuild) werden gelesen.
+        """
+        with self.lock:
+            self._load()
+            files = dict(self.files)
+            
+        segments = []
+        for path in log_reader.select_log_files(self.log_dir):
+            entry = files.get(entry_name(path))
+            if entry and not entry.get('open') and entry.get('first') is not None:
+                first, last = entry['first'], entry['last']
+            elif entry and not entry.get('open') and entry.get('rows') == 0:
+                # Leere Datei
+                continue
+            else:
+                first, last = log_reader.file_time_bounds(path)
+            if first is not None and end is not None and first > end:
+                continue
+            if last is not None and start is not None and last < start:
+                continue
+            segments.append((first if first is not None else 0.0, last if last is not None else float('inf'), path))
+        segments.sort(key=lambda segment: (segment[0], segment[2].name))
+        return segments
+        
+    def get_sessions(self) -> List[Dict[str, Any]]:
+        """Fasst die Dateien pro Sitzung zusammen (Formate, Zeitgrenzen, Zeilen), neueste zuerst"""
+        entries = self.get_entries()
+        # Zeilen einmal pro Teil zählen, auch wenn er in mehreren Formaten vorliegt (CSV + JSONL)
+        counted = set(log_reader.select_log_files(self.log_dir))
+        sessions: Dict[str, Dict[str, Any]] = {}
+        for path, entry in entries.items():
+            session = sessions.setdefault(entry['session'], {
+                'session': entry['session'], 'formats': [], 'first': None, 'last': None,
+                'rows': 0, 'files': [], 'open': False
+            })
+            if entry['format'] not in session['formats']:
+                session['formats'].append(entry['format'])
+            session['files'].append(path)
+            session['open'] = session['open'] or entry.get('open', False)
+            # Zeilenanzahl unbekannt (nur geschätzte Zeitgrenzen): die Sitzung hat dann keine Summe (None)
+            if path in counted and session['rows'] is not None:
+                session['rows'] = None if entry.get('rows') is None else session['rows'] + entry['rows']
+            if entry.get('first') is not None:
+                session['first'] = entry['first'] if session['first'] is None else min(session['first'], entry['first'])
+                session['last'] = entry['last'] if session['last'] is None else max(session['last'], entry['last'])
+        return sorted(sessions.values(), key=lambda session: session['session'], reverse=True)
+        
+    def latest_file(self, suffix: str) -> Optional[Path]:
+        """Gibt die neueste Datei eines Formats zurück (None, wenn der Katalog keine kennt)"""
+        paths = [path for path, entry in self.get_entries().items() if entry['format'] == suffix.lstrip('.')]
+        return max(paths, key=lambda path: path.name) if paths else None
+
+def main(argv: Optional[List[str]] = None):
+    """Kommandozeile: Katalog neu erstellen oder die Sitzungen daraus auflisten"""
+    parser = argparse.ArgumentParser(prog="python -m core.log_catalog",
+                                     description="Zeigt oder erstellt den Katalog eines Log-Verzeichnisses")
+    parser.add_argument('--log-dir', default="logs", help="Log-Verzeichnis (Standard: logs)")
+    parser.add_argument('--rebuild', action='store_true', help="Katalog aus allen Log-Dateien neu erstellen")
+    args = parser.parse_args(argv)
+    
+    if not Path(args.log_dir).is_dir():
+        print(f"Log-Verzeichnis nicht gefunden: {args.log_dir}")
+        return 1
+        
+    catalog = LogCatalog(args.log_dir)
+    if args.rebuild:
+        count = catalog.rebuild()
+        print(f"Katalog neu erstellt: {count} Dateien in {catalog.path}")
+        
+    for session in catalog.get_sessions():
+        first = datetime.fromtimestamp(session['first']).strftime("%Y-%m-%d %H:%M:%S") if session['first'] else "-"
+        last = datetime.fromtimestamp(session['last']).strftime("%Y-%m-%d %H:%M:%S") if session['last'] else "-"
+        state = " (offen)" if session['open'] else ""
+        rows = "?" if session['rows'] is None else session['rows']
+        print(f"{session['session']}  {first} bis {last}  {rows:>10} Zeilen  "
+              f"{len(session['files']):>3} Dateien  {', '.join(session['formats'])}{state}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+"""
+Log-Abfragen über viele Sitzungsdateien für SystemMonitorX
+Liest Segmente parallel in einem Prozess-Pool als NumPy-Spalten und führt sie zeitlich sortiert zusammen
+
+Aufruf als Kommandozeilenwerkzeug:
+    python -m core.log_query --log-dir logs --hours 168 --fields cpu_percent memory_percent
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+import numpy as np
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+from . import block_store, columnar_store, log_reader
+from .log_catalog import LogCatalog
+from .log_rotation import data_suffix
+from .sqlite_store import DEFAULT_FILE, SQLiteLogStore
+
+# Numerische Felder, die abgefragt werden können
+NUMERIC_FIELDS = [
+    'cpu_percent', 'cpu_count', 'memory_percent', 'memory_used_gb', 'memory_total_gb',
+    'disk_percent', 'disk_used_gb', 'disk_total_gb'
+]
+
+# Zeitstempel, die näher beieinander liegen, gelten als derselbe Messwert (überlappende Sitzungen)
+DUPLICATE_TOLERANCE = 1e-3
+
+# Wie oft (Sekunden) beim Warten auf Worker-Prozesse der Abbruch geprüft wird
+CANCEL_POLL_INTERVAL = 0.1
+
+class QueryCancelled(Exception):
+    """Die Abfrage wurde über das Abbruch-Event beendet"""
+
+def load_segment(path: str, start: Optional[float], end: Optional[float],
+                 fields: Sequence[str]) -> Dict[str, np.ndarray]:
+    """Liest eine Log-Datei im Zeitraum als Spalten-Arrays (läuft im Worker-Prozess)"""
+    path = Path(path)
+    suffix = data_suffix(path)
+    
+    if suffix == columnar_store.FILE_SUFFIX:
+        columns = columnar_store.read_segment(path, start, end, fields)
+    elif suffix == block_store.FILE_SUFFIX:
+        columns = block_store.read_block_file(path, start, end, fields)
+    else:
+        values = {name: [] for name in ['timestamp'] + list(fields)}
+        for record in log_reader.iter_file(path, start, end, fields):
+            for name, column in values.items():
+                value = record.get(name)
+                column.append(np.nan if value is None else value)
+        columns = values
+        
+    # Kopien statt Views auf gemappte Dateien, damit das Ergebnis zwischen Prozessen übertragbar ist
+    return {name: np.array(columns.get(name, np.full(len(columns['timestamp']), np.nan)), dtype=float)
+            for name in ['timestamp'] + list(fields)}
+
+def merge_segments(parts: List[Dict[str, np.ndarray]], fields: Sequence[str]) -> Dict[str, np.ndarray]:
+    """Führt zeitlich sortierte Segmente zusammen und entfernt doppelte Messwerte überlappender Sitzungen"""
+    names = ['timestamp'] + list(fields)
+    parts = [part for part in parts if len(part['timestamp'])]
+    if not parts:
+        return {name: np.empty(0) for name in names}
+        
+    parts.sort(key=lambda part: part['timestamp'][0])
+    merged = {name: np.concatenate([part[name] for part in parts]) for name in names}
+    
+    # Überschneiden sich Segmente, stabil nach Zeit sortieren: die stabile Sortierung von NumPy
+    # (Timsort) erkennt die k bereits sortierten Segmente als Läufe und führt sie nur zusammen
+    timestamps = merged['timestamp']
+    if len(parts) > 1 and np.any(timestamps[1:] < timestamps[:-1]):
+        order = np.argsort(timestamps, kind='stable')
+        merged = {name: values[order] for name, values in merged.items()}
+        timestamps = merged['timestamp']
+        
+    keep = np.ones(len(timestamps), dtype=bool)
+    keep[1:] = np.diff(timestamps) > DUPLICATE_TOLERANCE
+    if not keep.all():
+        merged = {name: values[keep] for name, values in merged.items()}
+    return merged
+
+def check_cancelled(cancel_event: Optional[threading.Event]):
+    """Löst QueryCancelled aus, wenn der Abbruch angefordert wurde"""
+    if cancel_event is not None and cancel_event.is_set():
+        raise QueryCancelled()
+
+class LogQueryEngine:
+    """Fragt Zeiträume über alle Log-Dateien ab, ein Segment pro Aufgabe im Prozess-Pool"""
+    
+    def __init__(self, log_dir: Path, max_workers: Optional[int] = None):
+        """Initialisiert die Abfrage-Engine (der Pool wird erst bei Bedarf gestartet)"""
+        self.log_dir = Path(log_dir)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.catalog = LogCatalog(self.log_dir)
+        self.executor = None
+        self._sqlite_store = None
+        
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Gibt den Prozess-Pool zurück und startet ihn beim ersten Aufruf"""
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self.executor
+        
+    def query(self, start: Optional[float] = None, end: Optional[float] = None,
+              fields: Optional[Sequence[str]] = None, parallel: bool = True,
+              cancel_event: Optional[threading.Event] = None,
+              progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, np.ndarray]:
+        """Gibt einen Zeitraum aller Sitzungen als Spalten-Arrays zurück (Zeitstempel als Epoch-Sekunden)
+        
+        progress(erledigt, gesamt) wird nach jedem gelesenen Segment aufgerufen. Ist cancel_event gesetzt,
+        werden noch nicht gestartete Segmente verworfen und QueryCancelled ausgelöst.
+        Unbekannte Felder lösen ValueError aus.
+        """
+        fields = list(fields or NUMERIC_FIELDS)
+        unknown = [field for field in fields if field not in NUMERIC_FIELDS]
+        if unknown:
+            raise ValueError(f"Unbekannte Felder: {', '.join(unknown)} (möglich: {', '.join(NUMERIC_FIELDS)})")
+        paths = [str(path) for _, _, path in self.catalog.find_segments(start, end)]
+        store, sessions = self._get_sqlite_sessions(start, end)
+        total = len(paths) + len(sessions)
+        parts = []
+        
+        def segment_done():
+            if progress:
+                progress(len(parts), total)
+                
+        if parallel and len(paths) > 1 and self.max_workers > 1:
+            executor = self._get_executor()
+            pending = {executor.submit(load_segment, path, start, end, fields) for path in paths}
+            try:
+                while pending:
+                    check_cancelled(cancel_event)
+                    done, pending = wait(pending, timeout=CANCEL_POLL_INTERVAL, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        parts.append(future.result())
+                        segment_done()
+            finally:
+                # Bei Abbruch oder Fehler keine weiteren Segmente starten (laufende enden im Worker-Prozess)
+                for future in pending:
+                    future.cancel()
+        else:
+            for path in paths:
+                check_cancelled(cancel_event)
+                parts.append(load_segment(path, start, end, fields))
+                segment_done()
+                
+        # SQLite-Sitzungen (die Datenbank erledigt den Zeitraum selbst über den Zeitindex)
+        for session_id, _, _ in sessions:
+            check_cancelled(cancel_event)
+            parts.append(store.query_range(start, end, fields, session_id=session_id))
+            segment_done()
+            
+        check_cancelled(cancel_event)
+        return merge_segments(parts, fields)
+        
+    def _get_sqlite_sessions(self, start: Optional[float], end: Optional[float]):
+        """Gibt die SQLite-Datenbank und ihre Sitzungen im Zeitraum zurück (ohne Datenbank: None, [])
+        
+        Die Datenbank wird einmal schreibgeschützt geöffnet und weiterverwendet.
+        """
+        if self._sqlite_store is None:
+            db_path = self.log_dir / DEFAULT_FILE
+            if not db_path.exists():
+                return None, []
+            self._sqlite_store = SQLiteLogStore(db_path, read_only=True)
+        store = self._sqlite_store
+        return store, store.get_sessions(start, end)
+        
+    def close(self):
+        """Beendet den Prozess-Pool"""
+        if self.executor:
+            self.executor.shutdown()
+            self.executor = None
+
+def main(argv: Optional[List[str]] = None):
+    """Kommandozeile: Zeitraum abfragen, zusammenfassen, als CSV exportieren oder als Graph speichern"""
+    parser = argparse.ArgumentParser(prog="python -m core.log_query",
+                                     description="Fragt einen Zeitraum über alle Log-Dateien ab")
+    parser.add_argument('--log-dir', default="logs", help="Log-Verzeichnis (Standard: logs)")
+    parser.add_argument('--hours', type=float, default=24, help="Zeitraum bis jetzt in Stunden (Standard: 24)")
+    parser.add_argument('--start', type=float, help="Beginn als Epoch-Sekunden (statt --hours)")
+    parser.add_argument('--end', type=float, help="Ende als Epoch-Sekunden (Standard: jetzt)")
+    parser.add_argument('--fields', nargs='+', default=None, help="Felder (Standard: alle numerischen)")
+    parser.add_argument('--workers', type=int, default=None, help="Anzahl Worker-Prozesse")
+    parser.add_argument('--serial', action='store_true', help="Ohne Prozess-Pool lesen")
+    parser.add_argument('--csv', help="Ergebnis als CSV-Datei speichern")
+    parser.add_argument('--graph', help="Übersichtsgraph als Bild speichern (z.B. graph.png)")
+    args = parser.parse_args(argv)
+    
+    end = args.end if args.end is not None else time.time()
+    start = args.start if args.start is not None else end - args.hours * 3600
+    
+    engine = LogQueryEngine(args.log_dir, args.workers)
+    try:
+        started = time.perf_counter()
+        result = engine.query(start, end, args.fields, parallel=not args.serial)
+        elapsed = time.perf_counter() - started
+    except ValueError as e:
+        print(f"Fehler: {e}")
+        return 1
+    finally:
+        engine.close()
+        
+    count = len(result['timestamp'])
+    print(f"{count} Einträge in {elapsed:.3f}s")
+    for name, values in result.items():
+        if name != 'timestamp' and count:
+            print(f"  {name:<18} min {np.nanmin(values):10.2f}  mittel {np.nanmean(values):10.2f}  "
+                  f"max {np.nanmax(values):10.2f}")
+                  
+    if args.csv:
+        names = list(result)
+        np.savetxt(args.csv, np.column_stack([result[name] for name in names]), delimiter=',',
+                   header=','.join(names), comments='', fmt='%.6f')
+        print(f"CSV gespeichert: {args.csv}")
+        
+    if args.graph:
+        missing = [field for field in ('cpu_percent', 'memory_percent', 'disk_percent') if field not in result]
+        if missing:
+            print(f"Für den Graphen fehlen Felder: {', '.join(missing)}")
+            return 1
+        import matplotlib
+        matplotlib.use('Agg')
+        from .graph_viewer import GraphViewer
+        GraphViewer().create_system_overview_graph(result, save_path=args.graph)
+        print(f"Graph gespeichert: {args.graph}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
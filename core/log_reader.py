@@ -0,0 +1,380 @@
+"""
+Zeitraum-Abfragen über alle Log-Dateien von SystemMonitorX
+Überspringt ganze Dateien anhand ihrer Zeitgrenzen und liest nur die angeforderten Spalten
+"""
+
+import csv
+import io
+import json
+import re
+import numpy as np
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Iterator, Optional, Sequence, Tuple
+from . import block_store, columnar_store, csv_index
+from .log_rotation import data_suffix, is_compressed, list_log_files, open_log_file, part_key
+
+# Textfelder eines Log-Eintrags, alle anderen Felder sind numerisch
+TEXT_FIELDS = ('platform', 'machine')
+
+# Bevorzugtes Format, wenn ein Teil einer Sitzung in mehreren Formaten vorliegt (CSV + JSONL)
+FORMAT_PREFERENCE = (columnar_store.FILE_SUFFIX, block_store.FILE_SUFFIX, '.csv', '.jsonl', '.json')
+
+# Bytes, die für den letzten Eintrag vom Dateiende gelesen werden
+TAIL_BYTES = 64 * 1024
+
+# Zeilen pro Block beim Lesen von Binär-Segmenten
+BINARY_CHUNK_ROWS = 4096
+
+# Abstand der Stützstellen, an denen ein Wechsel der UTC-Abweichung (Sommerzeit) gesucht wird
+OFFSET_PROBE_SECONDS = 6 * 3600
+
+_NAME_PATTERN = re.compile(r'system_data_(\d{8}_\d{6})')
+
+def parse_timestamp(value: Any) -> float:
+    """Wandelt einen Zeitstempel (Epoch-Sekunden, auch als Text, oder ISO-String älterer Logs) in Epoch-Sekunden um"""
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return datetime.fromisoformat(value).timestamp()
+    return float(value)
+
+def to_datetime64(timestamps) -> np.ndarray:
+    """Wandelt eine ganze Zeitstempel-Spalte in einem Schritt in lokale datetime64-Werte um
+    
+    Akzeptiert Epoch-Sekunden (auch als Text, z.B. aus CSV-Zeilen) und ISO-Strings älterer Logs.
+    """
+    values = np.asarray(timestamps)
+    if values.dtype.kind in 'US':
+        try:
+            values = values.astype(float)
+        except ValueError:
+            # ISO-Zeitstempel älterer Logs sind bereits lokale Zeit
+            return values.astype('datetime64[us]')
+    elif values.dtype.kind == 'O':
+        values = np.array([parse_timestamp(value) for value in values])
+    if len(values) == 0:
+        return values.astype('datetime64[us]')
+    # Epoch-Sekunden (UTC) in lokale Zeit, wie sie Achsen und ältere Logs zeigen
+    return np.round((values + _local_offsets(values)) * 1e6).astype('datetime64[us]')
+
+def _utc_offset(timestamp: float) -> float:
+    """UTC-Abweichung der lokalen Zeit zu einem Zeitpunkt in Sekunden"""
+    return datetime.fromtimestamp(timestamp).astimezone().utcoffset().total_seconds()
+
+def _local_offsets(values: np.ndarray) -> np.ndarray:
+    """UTC-Abweichung je Wert, auch über Sommerzeit-Umstellungen im Zeitraum hinweg
+    
+    Die Abweichung wird nur an Stützstellen bestimmt; wo sie sich zwischen zwei Stützstellen
+    ändert, wird der Umstellungszeitpunkt sekundengenau gesucht und jeder Wert seinem Abschnitt zugeordnet.
+    """
+    finite = values[np.isfinite(values)]
+    if len(finite) == 0:
+        return np.zeros(len(values))
+    first, last = int(np.floor(finite.min())), int(np.ceil(finite.max()))
+    
+    probes = list(range(first, last, OFFSET_PROBE_SECONDS)) + [last]
+    offsets = [_utc_offset(probes[0])]
+    transitions = []
+    for low, high in zip(probes, probes[1:]):
+        high_offset = _utc_offset(high)
+        if high_offset == offsets[-1]:
+            continue
+        # Erste Sekunde mit der neuen Abweichung suchen
+        while high - low > 1:
+            middle = (low + high) // 2
+            if _utc_offset(middle) == offsets[-1]:
+                low = middle
+            else:
+                high = middle
+        transitions.append(high)
+        offsets.append(high_offset)
+        
+    if not transitions:
+        return np.full(len(values), offsets[0])
+    segment = np.searchsorted(np.array(transitions, dtype=float), values, side='right')
+    return np.array(offsets)[segment]
+
+def _name_time(path: Path) -> Optional[float]:
+    """Startzeit der Sitzung aus dem Dateinamen (untere Grenze für alle Teile)"""
+    match = _NAME_PATTERN.search(Path(path).name)
+    if not match:
+        return None
+    return datetime.strptime(match.group(1), "%Y%m%d_%H%M%S").timestamp()
+
+def _last_line(path: Path) -> Optional[str]:
+    """Liest die letzte vollständige Zeile einer unkomprimierten Textdatei"""
+    with open(path, 'rb') as handle:
+        handle.seek(0, io.SEEK_END)
+        size = handle.tell()
+        handle.seek(max(0, size - TAIL_BYTES))
+        lines = handle.read().splitlines()
+    for line in reversed(lines):
+        if line.strip():
+            return line.decode('utf-8', errors='replace')
+    return None
+
+def _text_bounds(path: Path, suffix: str) -> Tuple[Optional[float], Optional[float]]:
+    """Erster und letzter Zeitstempel einer CSV- oder JSON-Lines-Datei (Kopf und Ende)"""
+    first = last = None
+    with open_log_file(path) as handle:
+        if suffix == '.csv':
+            reader = csv.reader(handle)
+            header = next(reader, None)
+            row = next(reader, None)
+            if header and row and 'timestamp' in header:
+                index = header.index('timestamp')
+                first = parse_timestamp(row[index])
+        else:
+            for line in handle:
+                record = json.loads(line) if line.strip() else {}
+                if 'timestamp' in record:
+                    first = parse_timestamp(record['timestamp'])
+                    break
+                    
+    if first is None or is_compressed(path):
+        return first, None
+        
+    line = _last_line(path)
+    if line is not None:
+        try:
+            if suffix == '.csv':
+                last = parse_timestamp(next(csv.reader([line]))[index])
+            else:
+                last = parse_timestamp(json.loads(line)['timestamp'])
+        except (ValueError, KeyError, IndexError, StopIteration):
+            # Letzte Zeile unvollständig oder Kopfzeile
+            last = None
+    return first, last
+
+def _binary_bounds(path: Path) -> Tuple[Optional[float], Optional[float]]:
+    """Erster und letzter Zeitstempel eines Binär-Segments"""
+    header = columnar_store.read_segment_header(path)
+    row_count = min(header['row_count'], header['capacity'])
+    if row_count == 0:
+        return None, None
+        
+    if is_compressed(path):
+        # Der erste Zeitstempel steht direkt hinter dem Header, das Ende müsste entpackt werden
+        with open_log_file(path, 'rb') as handle:
+            handle.read(columnar_store.DATA_OFFSET)
+            return float(np.frombuffer(handle.read(8), dtype='float64')[0]), None
+            
+    timestamps = np.memmap(path, dtype='float64', mode='r', offset=columnar_store.DATA_OFFSET, shape=(row_count,))
+    return float(timestamps[0]), float(timestamps[-1])
+
+def _block_bounds(path: Path) -> Tuple[Optional[float], Optional[float]]:
+    """Erster und letzter Zeitstempel einer Block-Datei (nur die Block-Header werden gelesen)"""
+    first = last = None
+    for _, _, block_first, block_last in block_store.iter_block_headers(path):
+        if first is None:
+            first = block_first
+        last = block_last
+    return first, last
+
+def file_time_bounds(path: Path) -> Tuple[Optional[float], Optional[float]]:
+    """Gibt (erster, letzter) Zeitstempel einer Log-Datei zurück, ohne sie vollständig zu lesen
+    
+    Wo eine Grenze nicht günstig lesbar ist, wird sie abgeschätzt: unten durch die Startzeit
+    im Dateinamen, oben durch die Änderungszeit (komprimierte Dateien entstehen erst nach dem Schließen).
+    """
+    path = Path(path)
+    suffix = data_suffix(path)
+    first = last = None
+    try:
+        if suffix == columnar_store.FILE_SUFFIX:
+            first, last = _binary_bounds(path)
+        elif suffix == block_store.FILE_SUFFIX:
+            first, last = _block_bounds(path)
+        elif suffix in ('.csv', '.jsonl'):
+            first, last = _text_bounds(path, suffix)
+    except Exception as e:
+        print(f"Fehler beim Lesen der Zeitgrenzen von {path.name}: {e}")
+        
+    if first is None:
+        first = _name_time(path)
+    if last is None:
+        last = path.stat().st_mtime
+    return first, last
+
+def select_log_files(log_dir: Path) -> List[Path]:
+    """Wählt pro Sitzungsteil eine Datei aus (bevorzugt Binär, dann CSV, JSON Lines, JSON)"""
+    parts: Dict[str, Path] = {}
+    for path in list_log_files(log_dir):
+        key = part_key(path)
+        current = parts.get(key)
+        if current is None or \
+                FORMAT_PREFERENCE.index(data_suffix(path)) < FORMAT_PREFERENCE.index(data_suffix(current)):
+            parts[key] = path
+    return list(parts.values())
+
+def _convert(field: str, value: Any) -> Any:
+    """Wandelt einen gelesenen Wert in seinen Typ um (Textfelder bleiben unverändert)"""
+    if field in TEXT_FIELDS or value is None:
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+def _iter_csv(path: Path, start: Optional[float], end: Optional[float],
+              fields: Optional[Sequence[str]]) -> Iterator[Dict[str, Any]]:
+    """Liest die Zeilen einer CSV-Datei im Zeitraum, nur die angeforderten Spalten
+    
+    Mit Startzeit wird über den Sparse-Index direkt zur ersten relevanten Zeile gesprungen.
+    """
+    with open_log_file(path, 'rb') as raw:
+        header = next(csv.reader([raw.readline().decode('utf-8')]), None)
+        if not header or 'timestamp' not in header:
+            return
+        if start is not None:
+            index = csv_index.load_index(path)
+            if index is not None and len(index):
+                raw.seek(max(raw.tell(), csv_index.find_offset(index, start)))
+        handle = io.TextIOWrapper(raw, encoding='utf-8', newline='')
+        reader = csv.reader(handle)
+        time_index = header.index('timestamp')
+        wanted = [(name, i) for i, name in enumerate(header)
+                  if name != 'timestamp' and (fields is None or name in fields)]
+                  
+        for row in reader:
+            if len(row) != len(header):
+                continue
+            timestamp = parse_timestamp(row[time_index])
+            if end is not None and timestamp > end:
+                return
+            if start is not None and timestamp < start:
+                continue
+            record = {'timestamp': timestamp}
+            for name, i in wanted:
+                record[name] = _convert(name, row[i])
+            yield record
+
+def _iter_json_records(records: Iterator[Dict[str, Any]], start: Optional[float],
+                       end: Optional[float], fields: Optional[Sequence[str]]) -> Iterator[Dict[str, Any]]:
+    """Filtert JSON-Einträge nach Zeitraum und Feldern"""
+    for entry in records:
+        if 'timestamp' not in entry:
+            continue
+        timestamp = parse_timestamp(entry['timestamp'])
+        if end is not None and timestamp > end:
+            return
+        if start is not None and timestamp < start:
+            continue
+        record = {'timestamp': timestamp}
+        for name in (fields if fields is not None else entry):
+            if name != 'timestamp' and name in entry:
+                record[name] = _convert(name, entry[name])
+        yield record
+
+def _line_timestamp(line: bytes) -> Optional[float]:
+    """Zeitstempel einer JSON-Lines-Zeile (None bei Kopfzeile oder unvollständiger Zeile)"""
+    try:
+        record = json.loads(line)
+        return parse_timestamp(record['timestamp']) if 'timestamp' in record else None
+    except (ValueError, KeyError):
+        return None
+
+def _parse_lines(handle) -> Iterator[Dict[str, Any]]:
+    """Parst JSON-Lines-Zeilen und überspringt eine unvollständige letzte Zeile"""
+    for line in handle:
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+def _seek_jsonl(handle, start: float):
+    """Springt per Bisektion über die Byte-Offsets an den Anfang des Zeitraums (Zeilen sind zeitlich sortiert)"""
+    handle.seek(0, io.SEEK_END)
+    lo, hi = 0, handle.tell()
+    while hi - lo > TAIL_BYTES:
+        mid = (lo + hi) // 2
+        handle.seek(mid)
+        handle.readline()  # Angeschnittene Zeile überspringen
+        timestamp = _line_timestamp(handle.readline())
+        if timestamp is not None and timestamp < start:
+            lo = mid
+        else:
+            hi = mid
+    handle.seek(lo)
+    if lo:
+        handle.readline()
+
+def _iter_jsonl(path: Path, start: Optional[float], end: Optional[float],
+                fields: Optional[Sequence[str]]) -> Iterator[Dict[str, Any]]:
+    """Liest die Einträge einer JSON-Lines-Datei im Zeitraum"""
+    with open_log_file(path, 'rb') as handle:
+        if start is not None and not is_compressed(path):
+            _seek_jsonl(handle, start)
+        yield from _iter_json_records(_parse_lines(handle), start, end, fields)
+
+def _iter_json(path: Path, start: Optional[float], end: Optional[float],
+               fields: Optional[Sequence[str]]) -> Iterator[Dict[str, Any]]:
+    """Liest die Einträge einer (alten) JSON-Datei im Zeitraum; das Format erlaubt kein Streamen"""
+    with open_log_file(path) as handle:
+        data = json.load(handle).get('data', [])
+    yield from _iter_json_records(iter(data), start, end, fields)
+
+def _iter_binary(path: Path, start: Optional[float], end: Optional[float],
+                 fields: Optional[Sequence[str]]) -> Iterator[Dict[str, Any]]:
+    """Liest die Zeilen eines Binär-Segments im Zeitraum blockweise aus den Spalten"""
+    columns = columnar_store.read_segment(path, start, end, fields)
+    constants = columns.pop('constants', {})
+    names = [name for name in columns if name != 'timestamp']
+    extra = {name: value for name, value in constants.items() if fields is None or name in fields}
+    
+    timestamps = columns['timestamp']
+    for lo in range(0, len(timestamps), BINARY_CHUNK_ROWS):
+        hi = lo + BINARY_CHUNK_ROWS
+        chunk = [timestamps[lo:hi].tolist()] + [columns[name][lo:hi].astype(float).tolist() for name in names]
+        for values in zip(*chunk):
+            record = dict(zip(['timestamp'] + names, values))
+            record.update(extra)
+            yield record
+
+def _iter_block(path: Path, start: Optional[float], end: Optional[float],
+                fields: Optional[Sequence[str]]) -> Iterator[Dict[str, Any]]:
+    """Liest die Zeilen einer Block-Datei im Zeitraum; Blöcke außerhalb werden nicht entpackt"""
+    for block in block_store.iter_blocks(path, start, end, fields):
+        constants = block.pop('constants', {})
+        names = list(block)
+        columns = [block[name].tolist() if isinstance(block[name], np.ndarray) else block[name] for name in names]
+        for values in zip(*columns):
+            record = dict(zip(names, values))
+            record.update(constants)
+            yield record
+
+_READERS = {
+    columnar_store.FILE_SUFFIX: _iter_binary,
+    block_store.FILE_SUFFIX: _iter_block,
+    '.csv': _iter_csv,
+    '.jsonl': _iter_jsonl,
+    '.json': _iter_json
+}
+
+def iter_file(path: Path, start: Optional[float] = None, end: Optional[float] = None,
+              fields: Optional[Sequence[str]] = None) -> Iterator[Dict[str, Any]]:
+    """Liest die Einträge einer Log-Datei im Zeitraum (Zeitstempel als Epoch-Sekunden)"""
+    reader = _READERS.get(data_suffix(path))
+    if reader is None:
+        return
+    try:
+        yield from reader(Path(path), start, end, fields)
+    except Exception as e:
+        print(f"Fehler beim Lesen von {Path(path).name}: {e}")
+
+def find_segments(log_dir: Path, start: Optional[float] = None,
+                  end: Optional[float] = None) -> List[Tuple[float, float, Path]]:
+    """Gibt die Log-Dateien zurück, deren Zeitgrenzen den Zeitraum überschneiden, zeitlich sortiert"""
+    segments = []
+    for path in select_log_files(log_dir):
+        first, last = file_time_bounds(path)
+        if first is not None and end is not None and first > end:
+            continue
+        if last is not None and start is not None and last < start:
+            continue
+        segments.append((first if first is not None else 0.0, last if last is not None else float('inf'), path))
+    segments.sort(key=lambda segment: (segment[0], segment[2].name))
+    return segments
@@ -0,0 +1,245 @@
+"""
+Absturzsicherheit der Log-Dateien von SystemMonitorX
+Atomares Ersetzen neu geschriebener Dateien und Wiederherstellung nach einem Abbruch beim Schreiben
+"""
+
+import json
+import os
+import struct
+import zlib
+import numpy as np
+from pathlib import Path
+from typing import List, Optional
+from . import block_store, columnar_store, csv_index
+from .log_rotation import COMPRESSION_SUFFIXES, is_compressed, list_log_files, sidecar_path
+
+# fsync-Strategien: nach jedem Schreiben, höchstens alle fsync_interval Sekunden, nie (Betriebssystem entscheidet)
+FSYNC_POLICIES = ("always", "interval", "never")
+
+def fsync_directory(directory: Path):
+    """Schreibt den Verzeichniseintrag auf die Platte (nötig, damit ein rename einen Stromausfall übersteht)"""
+    if os.name != 'posix':
+        return
+    descriptor = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+def atomic_write(path: Path, data: bytes, fsync: bool = True):
+    """Schreibt eine Datei über eine temporäre Datei und rename; Leser sehen immer die alte oder die neue Fassung"""
+    path = Path(path)
+    temp = path.with_name(path.name + '.tmp')
+    with open(temp, 'wb') as handle:
+        handle.write(data)
+        handle.flush()
+        if fsync:
+            os.fsync(handle.fileno())
+    os.replace(temp, path)
+    if fsync:
+        fsync_directory(path.parent)
+
+def _truncate(path: Path, size: int) -> bool:
+    """Kürzt eine Datei auf size Bytes (True, wenn etwas abgeschnitten wurde)"""
+    if path.stat().st_size <= size:
+        return False
+    with open(path, 'r+b') as handle:
+        handle.truncate(size)
+    return True
+
+def _recover_lines(path: Path, min_size: int = 0) -> bool:
+    """Schneidet bei zeilenbasierten Formaten eine unvollständige letzte Zeile ab"""
+    size = path.stat().st_size
+    if size == 0:
+        return False
+    with open(path, 'rb') as handle:
+        # Vom Ende rückwärts bis zum letzten Zeilenumbruch suchen
+        position = size
+        while position > 0:
+            step = min(64 * 1024, position)
+            handle.seek(position - step)
+            chunk = handle.read(step)
+            index = chunk.rfind(b'\n')
+            if index >= 0:
+                end = position - step + index + 1
+                break
+            position -= step
+        else:
+            end = 0
+    return _truncate(path, max(end, min_size))
+
+def _recover_jsonl(path: Path) -> bool:
+    """Schneidet eine unvollständige oder ungültige letzte JSON-Lines-Zeile ab"""
+    changed = _recover_lines(path)
+    size = path.stat().st_size
+    if size == 0:
+        return changed
+    with open(path, 'rb') as handle:
+        handle.seek(max(0, size - 64 * 1024))
+        lines = handle.read().splitlines(keepends=True)
+    try:
+        json.loads(lines[-1])
+    except ValueError:
+        return _truncate(path, size - len(lines[-1])) or changed
+    return changed
+
+def _recover_csv(path: Path) -> bool:
+    """Schneidet eine unvollständige letzte CSV-Zeile ab und entfernt Index-Einträge dahinter"""
+    with open(path, 'rb') as handle:
+        header_size = len(handle.readline())
+    changed = _recover_lines(path, header_size)
+    
+    index = csv_index.read_index(path)
+    size = path.stat().st_size
+    if index is not None and len(index) and index['offset'][-1] >= size:
+        valid = index[index['offset'] < size]
+        with open(csv_index.index_path(path), 'rb') as handle:
+            header = handle.read(csv_index.HEADER_SIZE)
+        atomic_write(csv_index.index_path(path), header + valid.tobytes())
+        changed = True
+    return changed
+
+def _salvage_json(text: str) -> dict:
+    """Rettet aus einer abgebrochenen JSON-Datei Metadaten und alle vollständigen Einträge"""
+    decoder = json.JSONDecoder()
+    metadata = {}
+    start = text.find('"metadata"')
+    if start >= 0:
+        try:
+            metadata, _ = decoder.raw_decode(text, text.index('{', start))
+        except ValueError:
+            metadata = {}
+            
+    data = []
+    position = text.find('"data"')
+    if position >= 0:
+        position = text.find('[', position) + 1
+    while position > 0:
+        # Bis zum nächsten Eintrag springen
+        while position < len(text) and text[position] in ' \t\r\n,':
+            position += 1
+        if position >= len(text) or text[position] != '{':
+            break
+        try:
+            entry, position = decoder.raw_decode(text, position)
+        except ValueError:
+            break
+        data.append(entry)
+    return {'metadata': metadata, 'data': data}
+
+def _recover_json(path: Path) -> bool:
+    """Stellt eine unvollständig geschriebene JSON-Datei aus ihren vollständigen Einträgen wieder her"""
+    text = path.read_text(encoding='utf-8', errors='replace')
+    try:
+        json.loads(text)
+        return False
+    except ValueError:
+        pass
+    atomic_write(path, json.dumps(_salvage_json(text), indent=2).encode('utf-8'))
+    return True
+
+def _recover_blocks(path: Path) -> bool:
+    """Schneidet einen unvollständigen letzten Block ab"""
+    end = None
+    with open(path, 'rb') as handle:
+        prefix = handle.read(12)
+        if len(prefix) < 12 or prefix[:4] != block_store.MAGIC:
+            return False
+        _, _, header_len = struct.unpack('<HHI', prefix[4:12])
+        end = 12 + header_len
+        handle.seek(end)
+        while True:
+            raw = handle.read(block_store.BLOCK_HEADER.size)
+            if len(raw) < block_store.BLOCK_HEADER.size:
+                break
+            magic, payload_len, _, crc, _, _ = block_store.BLOCK_HEADER.unpack(raw)
+            payload = handle.read(payload_len)
+            if magic != block_store.BLOCK_MAGIC or len(payload) < payload_len or zlib.crc32(payload) != crc:
+                break
+            end = handle.tell()
+    return _truncate(path, end)
+
+def _recover_columnar(path: Path) -> bool:
+    """Setzt die Zeilenanzahl eines Binär-Segments auf die letzte gültige Zeile zurück
+    
+    Gültig sind Zeilen mit Zeitstempel ungleich 0 und nicht fallend; ohne fsync kann nach einem Stromausfall
+    die Zeilenanzahl auf der Platte sein, die Daten aber nicht (vorab allozierte Nullen).
+    """
+    header = columnar_store.read_segment_header(path)
+    capacity = header['capacity']
+    row_count = min(header['row_count'], capacity)
+    if row_count == 0:
+        return False
+    index = next(i for i, (name, _) in enumerate(header['columns']) if name == 'timestamp')
+    timestamps = np.fromfile(path, dtype='<f8', count=row_count,
+                             offset=columnar_store.DATA_OFFSET + index * capacity * 8)
+                             
+    valid = (timestamps != 0) & np.isfinite(timestamps)
+    valid[1:] &= timestamps[1:] >= timestamps[:-1]
+    invalid = np.flatnonzero(~valid)
+    valid_rows = int(invalid[0]) if len(invalid) else len(timestamps)
+    if valid_rows == header['row_count']:
+        return False
+        
+    with open(path, 'r+b') as handle:
+        handle.seek(columnar_store.ROW_COUNT_OFFSET)
+        handle.write(struct.pack('<Q', valid_rows))
+        handle.flush()
+        os.fsync(handle.fileno())
+    return True
+
+_RECOVERERS = {
+    '.csv': _recover_csv,
+    '.jsonl': _recover_jsonl,
+    '.json': _recover_json,
+    columnar_store.FILE_SUFFIX: _recover_columnar,
+    block_store.FILE_SUFFIX: _recover_blocks
+}
+
+def recover_file(path: Path) -> bool:
+    """Repariert eine Log-Datei nach einem Abbruch (True, wenn sie geändert wurde)"""
+    path = Path(path)
+    recoverer = _RECOVERERS.get(path.suffix)
+    if recoverer is None or is_compressed(path):
+        return False
+    try:
+        return recoverer(path)
+    except Exception as e:
+        print(f"Fehler bei der Wiederherstellung von {path.name}: {e}")
+        return False
+
+def recover_log_dir(log_dir: Path, skip: Optional[List[Path]] = None,
+                    only: Optional[List[Path]] = None) -> List[Path]:
+    """Repariert die Log-Dateien eines Verzeichnisses und räumt Reste abgebrochener Vorgänge auf
+    
+    Mit only werden nur diese Dateien gelesen (z.B. die laut Katalog nicht sauber geschlossenen).
+    Darf nicht laufen, während ein LogCompressor arbeitet: dessen temporäre Dateien werden gelöscht.
+    """
+    log_dir = Path(log_dir)
+    skip = {Path(path).resolve() for path in (skip or [])}
+    only = None if only is None else {Path(path).resolve() for path in only}
+    repaired = []
+    
+    # Reste eines abgebrochenen atomaren Schreibens oder einer Komprimierung
+    for temp in log_dir.glob("*.tmp"):
+        try:
+            temp.unlink()
+        except OSError as e:
+            print(f"Fehler beim Löschen von {temp.name}: {e}")
+            
+    for path in list_log_files(log_dir):
+        if path.resolve() in skip:
+            continue
+        # Abbruch zwischen rename und Löschen des Originals: die komprimierte Fassung ist vollständig
+        if not is_compressed(path) and any(sidecar_path(path, suffix).exists()
+                                           for suffix in COMPRESSION_SUFFIXES.values()):
+            path.unlink()
+            continue
+        if only is not None and path.resolve() not in only:
+            continue
+        if recover_file(path):
+            repaired.append(path)
+            
+    if repaired:
+        print(f"Log-Dateien nach Abbruch repariert: {', '.join(path.name for path in repaired)}")
+    return repaired
@@ -0,0 +1,205 @@
+"""
+Log-Rotation für SystemMonitorX
+Komprimierung abgeschlossener Log-Dateien, Aufbewahrungsregeln und transparentes Lesen
+"""
+
+import gzip
+import lzma
+import os
+import queue
+import shutil
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Iterable
+
+# Endungen komprimierter Log-Dateien
+COMPRESSION_SUFFIXES = {'gzip': '.gz', 'lzma': '.xz'}
+
+# Endungen der Log-Datenformate (ohne Komprimierung)
+LOG_SUFFIXES = ('.csv', '.json', '.jsonl', '.smxc', '.smxt')
+
+# Formate, die bereits komprimiert geschrieben werden
+PRECOMPRESSED_SUFFIXES = ('.smxt',)
+
+# Endungen von Begleitdateien, die mit ihrer Log-Datei gelöscht werden
+SIDECAR_SUFFIXES = ('.idx',)
+
+def is_compressed(path: Path) -> bool:
+    """Gibt zurück, ob die Datei komprimiert ist"""
+    return Path(path).suffix in COMPRESSION_SUFFIXES.values()
+
+def data_suffix(path: Path) -> str:
+    """Gibt die Endung des Datenformats zurück (system_data_x.csv.gz -> .csv)"""
+    path = Path(path)
+    if is_compressed(path):
+        path = path.with_suffix('')
+    return path.suffix
+
+def sidecar_path(path: Path, suffix: str) -> Path:
+    """Gibt den Pfad einer Begleitdatei zurück, unabhängig von der Komprimierung (x.csv.gz -> x.csv.idx)"""
+    path = Path(path)
+    if is_compressed(path):
+        path = path.with_suffix('')
+    return path.with_name(path.name + suffix)
+
+def open_log_file(path: Path, mode: str = 'rt'):
+    """Öffnet eine Log-Datei und entpackt komprimierte Dateien dabei als Stream"""
+    path = Path(path)
+    kwargs = {'encoding': 'utf-8', 'newline': ''} if 't' in mode else {}
+    if path.suffix == '.gz':
+        return gzip.open(path, mode, **kwargs)
+    if path.suffix == '.xz':
+        return lzma.open(path, mode, **kwargs)
+    return open(path, mode, **kwargs)
+
+def reopen_truncated(handle, path: Path, size: int, mode: str = 'ab', **open_args):
+    """Verwirft einen fehlgeschlagenen Anhängevorgang und gibt einen neuen Handle zum Anhängen zurück
+    
+    Der alte Handle wird samt ungeschriebenem Pufferinhalt geschlossen (sonst landete der Rest beim nächsten
+    flush doch noch in der Datei), dann wird die Datei auf die Größe vor dem Schreiben gekürzt.
+    """
+    try:
+        handle.close()
+    except (OSError, ValueError):
+        pass
+    os.truncate(path, size)
+    return open(path, mode, **open_args)
+
+def glob_logs(log_dir: Path, suffix: str) -> List[Path]:
+    """Findet Log-Dateien eines Formats, komprimiert oder nicht"""
+    files = list(Path(log_dir).glob(f"system_data_*{suffix}"))
+    for compressed in COMPRESSION_SUFFIXES.values():
+        files += list(Path(log_dir).glob(f"system_data_*{suffix}{compressed}"))
+    return files
+
+def list_log_files(log_dir: Path) -> List[Path]:
+    """Gibt alle Log-Datendateien chronologisch (nach Sitzung und Teil) sortiert zurück"""
+    files = []
+    for suffix in LOG_SUFFIXES:
+        files += glob_logs(log_dir, suffix)
+    return sorted(files, key=lambda file: file.name)
+
+def part_key(path: Path) -> str:
+    """Gibt den Namen eines Sitzungsteils ohne Format- und Komprimierungsendung zurück"""
+    path = Path(path)
+    if is_compressed(path):
+        path = path.with_suffix('')
+    return path.name[:-len(path.suffix)] if path.suffix else path.name
+
+def _lower_thread_priority():
+    """Senkt die Priorität des aktuellen Threads, soweit das Betriebssystem es erlaubt"""
+    try:
+        if sys.platform == 'win32':
+            import ctypes
+            THREAD_PRIORITY_LOWEST = -2
+            kernel32 = ctypes.windll.kernel32
+            kernel32.SetThreadPriority(kernel32.GetCurrentThread(), THREAD_PRIORITY_LOWEST)
+        elif sys.platform.startswith('linux'):
+            # Nur unter Linux wirkt PRIO_PROCESS mit Thread-ID auf diesen Thread; auf anderen Systemen
+            # wäre es die ID eines (fremden) Prozesses
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+    except (OSError, AttributeError) as e:
+        print(f"Fehler beim Senken der Thread-Priorität: {e}")
+
+class LogCompressor:
+    """Komprimiert abgeschlossene Log-Dateien in einem Hintergrund-Thread mit niedriger Priorität"""
+    
+    def __init__(self, method: str = 'gzip'):
+        """Initialisiert den Kompressor (method: gzip, lzma oder none)"""
+        self.method = method
+        self.queue = queue.Queue()
+        self.thread = None
+        self.lock = threading.Lock()
+        self.pending = set()  # Eingereihte und gerade komprimierte Dateien
+        
+    def submit(self, path: Path):
+        """Reiht eine geschlossene Log-Datei zur Komprimierung ein"""
+        if self.method not in COMPRESSION_SUFFIXES:
+            return
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, name="LogCompressor", daemon=True)
+                self.thread.start()
+            self.pending.add(Path(path))
+        self.queue.put(Path(path))
+        
+    def pending_paths(self) -> List[Path]:
+        """Gibt die eingereihten und gerade komprimierten Dateien zurück"""
+        with self.lock:
+            return list(self.pending)
+            
+    def wait(self):
+        """Wartet, bis alle eingereihten Dateien komprimiert sind"""
+        self.queue.join()
+        
+    def _run(self):
+        """Arbeitet die Warteschlange ab"""
+        _lower_thread_priority()
+        while True:
+            path = self.queue.get()
+            try:
+                self.compress_file(path)
+            except Exception as e:
+                print(f"Fehler beim Komprimieren von {path.name}: {e}")
+            finally:
+                with self.lock:
+                    self.pending.discard(path)
+                self.queue.task_done()
+                
+    def compress_file(self, path: Path) -> Optional[Path]:
+        """Komprimiert eine Datei; das Original wird erst nach vollständigem Schreiben ersetzt"""
+        if not path.exists() or is_compressed(path) or path.suffix in PRECOMPRESSED_SUFFIXES:
+            return None
+            
+        target = path.with_name(path.name + COMPRESSION_SUFFIXES[self.method])
+        temp = target.with_name(target.name + '.tmp')
+        opener = gzip.open if self.method == 'gzip' else lzma.open
+        
+        with open(temp, 'wb') as raw:
+            with open(path, 'rb') as source, opener(raw, 'wb') as destination:
+                shutil.copyfileobj(source, destination, 1024 * 1024)
+            # Erst vollständig auf der Platte, dann umbenennen und das Original löschen
+            raw.flush()
+            os.fsync(raw.fileno())
+        os.replace(temp, target)
+        path.unlink()
+        return target
+
+def apply_retention(log_dir: Path, max_files: Optional[int] = None, max_total_bytes: Optional[int] = None,
+                    keep: Iterable[Path] = ()) -> List[Path]:
+    """Löscht die ältesten Sitzungsteile, bis Anzahl und Gesamtgröße in den Grenzen liegen
+    
+    max_files zählt Teile (CSV + JSONL eines Teils zählen einmal); Teile mit einer Datei aus keep
+    (geöffnet oder beim Kompressor eingereiht) bleiben vollständig erhalten.
+    """
+    keep = {Path(path).resolve() for path in keep}
+    parts: Dict[str, List[Path]] = {}
+    for file in list_log_files(log_dir):
+        parts.setdefault(part_key(file), []).append(file)
+    sizes = {file: file.stat().st_size for files in parts.values() for file in files}
+    total = sum(sizes.values())
+    count = len(parts)
+    
+    deleted = []
+    for files in parts.values():
+        too_many = max_files is not None and count > max_files
+        too_large = max_total_bytes is not None and total > max_total_bytes
+        if not (too_many or too_large):
+            break
+        if any(file.resolve() in keep for file in files):
+            continue
+        for file in files:
+            try:
+                file.unlink()
+                for suffix in SIDECAR_SUFFIXES:
+                    sidecar = sidecar_path(file, suffix)
+                    if sidecar.exists():
+                        sidecar.unlink()
+                deleted.append(file)
+                total -= sizes[file]
+            except OSError as e:
+                # z.B. unter Windows noch von einem Leser gemappt
+                print(f"Fehler beim Löschen von {file.name}: {e}")
+        count -= 1
+    return deleted
@@ -0,0 +1,266 @@
+"""
+Aggregationsstufen der Log-Daten von SystemMonitorX
+1-Minuten-, 15-Minuten- und 1-Stunden-Werte (count, min, max, mean, last), beim Schreiben inkrementell berechnet
+"""
+
+import json
+import struct
+import threading
+import time
+import numpy as np
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Sequence
+from .log_recovery import atomic_write
+
+# Aufbau einer Rollup-Datei:
+#   0 magic (4 Bytes) | 4 version (u16) | 6 reserviert (u16) | 8 header_len (u32) | 12 JSON-Header
+#   HEADER_SIZE: Datensätze fester Länge (timestamp, count, je Metrik min/max/mean/last)
+MAGIC = b'SMXR'
+VERSION = 1
+HEADER_SIZE = 512
+FILE_SUFFIX = '.smxr'
+
+# Aggregierte Metriken (gleiche Namen wie in den Log-Dateien)
+METRICS = (
+    'cpu_percent', 'memory_percent', 'memory_used_gb', 'memory_total_gb',
+    'disk_percent', 'disk_used_gb', 'disk_total_gb'
+)
+
+# Statistiken pro Metrik und Bucket
+STATS = ('min', 'max', 'mean', 'last')
+
+def record_dtype(metrics: Sequence[str]) -> np.dtype:
+    """Datentyp eines Datensatzes"""
+    fields = [('timestamp', '<f8'), ('count', '<i8')]
+    for metric in metrics:
+        fields += [(f"{metric}_{stat}", '<f8') for stat in STATS]
+    return np.dtype(fields)
+
+class RollupStream:
+    """Eine Aggregationsstufe: offener Bucket im Speicher, abgeschlossene Buckets in einer Datei"""
+    
+    def __init__(self, path: Path, bucket_seconds: float, retention_seconds: float,
+                 metrics: Sequence[str] = METRICS):
+        """Initialisiert die Aggregationsstufe (die Datei wird erst mit open() angelegt)"""
+        self.path = Path(path)
+        self.bucket_seconds = bucket_seconds
+        self.retention_seconds = retention_seconds
+        self.metrics = list(metrics)
+        self.dtype = record_dtype(self.metrics)
+        self.lock = threading.Lock()
+        self.handle = None
+        
+        # Offener Bucket
+        self.pending_bucket = None
+        self.pending_count = 0
+        self.pending_valid = np.zeros(len(self.metrics))  # Werte ohne NaN je Metrik (für den Mittelwert)
+        self.pending_min = np.empty(len(self.metrics))
+        self.pending_max = np.empty(len(self.metrics))
+        self.pending_sum = np.empty(len(self.metrics))
+        self.pending_last = np.empty(len(self.metrics))
+        
+    def open(self):
+        """Öffnet die Datei zum Anhängen und entfernt dabei Buckets außerhalb der Aufbewahrung"""
+        if self.path.exists():
+            self._check_header()
+            self._compact()
+        else:
+            self._write_header()
+        self.handle = open(self.path, 'ab')
+        
+    def _write_header(self):
+        """Schreibt den Header einer neuen Rollup-Datei"""
+        header = json.dumps({'bucket_seconds': self.bucket_seconds, 'metrics': self.metrics}).encode('utf-8')
+        prefix = MAGIC + struct.pack('<HHI', VERSION, 0, len(header)) + header
+        if len(prefix) > HEADER_SIZE:
+            raise ValueError("Header der Rollup-Datei zu groß")
+        with open(self.path, 'wb') as handle:
+            handle.write(prefix.ljust(HEADER_SIZE, b'\0'))
+            
+    def _check_header(self):
+        """Prüft, ob eine vorhandene Datei zu Bucket-Größe und Metriken passt"""
+        with open(self.path, 'rb') as handle:
+            prefix = handle.read(12)
+            if len(prefix) < 12 or prefix[:4] != MAGIC:
+                raise ValueError(f"Keine gültige Rollup-Datei: {self.path}")
+            _, _, header_len = struct.unpack('<HHI', prefix[4:12])
+            header = json.loads(handle.read(header_len).decode('utf-8'))
+        if header.get('bucket_seconds') != self.bucket_seconds or header.get('metrics') != self.metrics:
+            raise ValueError(f"Rollup-Datei passt nicht zur Konfiguration: {self.path}")
+            
+    def _row_count(self) -> int:
+        """Anzahl vollständiger Datensätze (ein abgeschnittener letzter Datensatz wird ignoriert)"""
+        return max(0, (self.path.stat().st_size - HEADER_SIZE) // self.dtype.itemsize)
+        
+    def _compact(self):
+        """Schreibt die Datei ohne Buckets neu, die älter als die Aufbewahrung sind"""
+        count = self._row_count()
+        if count == 0:
+            return
+        records = np.fromfile(self.path, dtype=self.dtype, count=count, offset=HEADER_SIZE)
+        cutoff = time.time() - self.retention_seconds
+        if records['timestamp'][0] >= cutoff and self.path.stat().st_size == HEADER_SIZE + count * self.dtype.itemsize:
+            return
+            
+        with open(self.path, 'rb') as handle:
+            header = handle.read(HEADER_SIZE)
+        atomic_write(self.path, header + records[records['timestamp'] >= cutoff].tobytes())
+        
+    def add(self, timestamps: np.ndarray, values: np.ndarray):
+        """Nimmt zeitlich sortierte Werte (n Zeilen x Metriken) auf, abgeschlossene Buckets werden angehängt"""
+        if len(timestamps) == 0:
+            return
+        buckets = np.floor(timestamps / self.bucket_seconds) * self.bucket_seconds
+        starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        ends = np.r_[starts[1:], len(buckets)]
+        
+        # Alle Buckets eines Blocks in einem Schritt
+        counts = ends - starts
+        mins = np.fmin.reduceat(values, starts, axis=0)
+        maxs = np.fmax.reduceat(values, starts, axis=0)
+        # Fehlende Werte (NaN) gehen wie bei min und max nicht in den Mittelwert ein
+        valid = ~np.isnan(values)
+        sums = np.add.reduceat(np.where(valid, values, 0.0), starts, axis=0)
+        valid_counts = np.add.reduceat(valid, starts, axis=0)
+        lasts = values[ends - 1]
+        
+        with self.lock:
+            completed = []
+            for i, bucket in enumerate(buckets[starts]):
+                if self.pending_bucket is not None and bucket == self.pending_bucket:
+                    self.pending_count += counts[i]
+                    self.pending_valid += valid_counts[i]
+                    np.fmin(self.pending_min, mins[i], out=self.pending_min)
+                    np.fmax(self.pending_max, maxs[i], out=self.pending_max)
+                    self.pending_sum += sums[i]
+                    self.pending_last[:] = lasts[i]
+                    continue
+                    
+                if self.pending_bucket is not None:
+                    completed.append(self._pending_record())
+                self.pending_bucket = float(bucket)
+                self.pending_count = int(counts[i])
+                self.pending_valid[:] = valid_counts[i]
+                self.pending_min[:] = mins[i]
+                self.pending_max[:] = maxs[i]
+                self.pending_sum[:] = sums[i]
+                self.pending_last[:] = lasts[i]
+                
+            if completed:
+                self._append(np.concatenate(completed))
+                
+    def _pending_record(self) -> np.ndarray:
+        """Gibt den offenen Bucket als Datensatz zurück"""
+        record = np.zeros(1, dtype=self.dtype)
+        record['timestamp'] = self.pending_bucket
+        record['count'] = self.pending_count
+        mean = np.divide(self.pending_sum, self.pending_valid, out=np.full(len(self.metrics), np.nan),
+                         where=self.pending_valid > 0)
+        for i, metric in enumerate(self.metrics):
+            record[f"{metric}_min"] = self.pending_min[i]
+            record[f"{metric}_max"] = self.pending_max[i]
+            record[f"{metric}_mean"] = mean[i]
+            record[f"{metric}_last"] = self.pending_last[i]
+        return record
+        
+    def _append(self, records: np.ndarray):
+        """Hängt abgeschlossene Buckets an die Datei an"""
+        if self.handle:
+            self.handle.write(records.tobytes())
+            self.handle.flush()
+            
+    def close(self):
+        """Schreibt den offenen Bucket und schließt die Datei"""
+        with self.lock:
+            if self.pending_bucket is not None:
+                self._append(self._pending_record())
+                self.pending_bucket = None
+                self.pending_count = 0
+            if self.handle:
+                self.handle.close()
+                self.handle = None
+                
+    def read(self, start: Optional[float] = None, end: Optional[float] = None,
+             fields: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+        """Gibt die Buckets eines Zeitraums als Spalten zurück
+        
+        Das Feld enthält den Mittelwert, dazu kommen <feld>_min, <feld>_max, <feld>_last und count.
+        """
+        fields = [field for field in (fields or self.metrics) if field in self.metrics]
+        records = np.zeros(0, dtype=self.dtype)
+        if self.path.exists():
+            count = self._row_count()
+            if count:
+                records = np.memmap(self.path, dtype=self.dtype, mode='r', offset=HEADER_SIZE, shape=(count,))
+                lo = 0 if start is None else int(np.searchsorted(records['timestamp'], start, side='left'))
+                hi = count if end is None else int(np.searchsorted(records['timestamp'], end, side='right'))
+                records = records[lo:hi]
+                
+        with self.lock:
+            if self.pending_bucket is not None and (start is None or self.pending_bucket >= start) \
+                    and (end is None or self.pending_bucket <= end):
+                records = np.concatenate((records, self._pending_record()))
+                
+        result = {'timestamp': np.array(records['timestamp']), 'count': np.array(records['count'])}
+        for field in fields:
+            result[field] = np.array(records[f"{field}_mean"])
+            for stat in ('min', 'max', 'last'):
+                result[f"{field}_{stat}"] = np.array(records[f"{field}_{stat}"])
+        return result
+
+class RollupStore:
+    """Verwaltet die Aggregationsstufen eines Log-Verzeichnisses"""
+    
+    # (Bucket-Größe, Aufbewahrung) in Sekunden
+    LEVELS = (
+        (60, 30 * 86400),
+        (900, 365 * 86400),
+        (3600, 5 * 365 * 86400)
+    )
+    
+    def __init__(self, log_dir: Path, metrics: Sequence[str] = METRICS):
+        """Initialisiert die Aggregationsstufen (Dateien rollup_<sekunden>s.smxr)"""
+        self.log_dir = Path(log_dir)
+        self.metrics = list(metrics)
+        self.streams = [
+            RollupStream(self.log_dir / f"rollup_{bucket}s{FILE_SUFFIX}", bucket, retention, self.metrics)
+            for bucket, retention in self.LEVELS
+        ]
+        
+    def open(self):
+        """Öffnet alle Stufen zum Schreiben"""
+        for stream in self.streams:
+            stream.open()
+            
+    def close(self):
+        """Schreibt offene Buckets und schließt alle Stufen"""
+        for stream in self.streams:
+            stream.close()
+            
+    def add_entries(self, entries: List[Dict[str, Any]]):
+        """Nimmt Log-Einträge (Zeitstempel als Epoch-Sekunden) in alle Stufen auf"""
+        if not entries:
+            return
+        timestamps = np.fromiter((entry['timestamp'] for entry in entries), dtype=float, count=len(entries))
+        values = np.array([[entry.get(metric, np.nan) for metric in self.metrics] for entry in entries], dtype=float)
+        for stream in self.streams:
+            stream.add(timestamps, values)
+            
+    def get_resolutions(self) -> List[float]:
+        """Gibt die verfügbaren Bucket-Größen zurück"""
+        return [stream.bucket_seconds for stream in self.streams]
+        
+    def choose_resolution(self, start: float, end: float, min_points: int) -> float:
+        """Wählt die gröbste Stufe, die im Zeitraum noch mindestens min_points Werte liefert (0 = Rohdaten)"""
+        for stream in reversed(self.streams):
+            if (end - start) / stream.bucket_seconds >= min_points:
+                return stream.bucket_seconds
+        return 0
+        
+    def read(self, resolution: float, start: Optional[float] = None, end: Optional[float] = None,
+             fields: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+        """Liest eine Stufe im Zeitraum"""
+        stream = next((stream for stream in self.streams if stream.bucket_seconds == resolution), None)
+        if stream is None:
+            raise ValueError(f"Unbekannte Auflösung: {resolution}")
+        return stream.read(start, end, fields)
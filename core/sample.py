@@ -0,0 +1,117 @@
+"""
+Kompakter Messwert-Datensatz für SystemMonitorX
+"""
+
+from typing import Dict, Any, Optional, List
+
+class SystemSample:
+    """Ein Messwert-Datensatz mit festem Schema (ein Objekt statt verschachtelter Dicts pro Tick)"""
+    
+    __slots__ = (
+        'timestamp', 'monotonic',
+        'cpu_percent', 'cpu_per_core', 'cpu_count', 'cpu_freq',
+        'memory_total', 'memory_available', 'memory_percent', 'memory_used', 'memory_free',
+        'disk_total', 'disk_used', 'disk_free', 'disk_percent',
+        'platform', 'platform_version', 'machine', 'processor', 'username'
+    )
+    
+    def __init__(self):
+        """Initialisiert einen leeren Datensatz (None = Gruppe nicht erfasst)"""
+        self.timestamp = 0.0
+        self.monotonic = 0.0
+        
+        self.cpu_percent: Optional[float] = None
+        self.cpu_per_core: Optional[List[float]] = None
+        self.cpu_count: Optional[int] = None
+        self.cpu_freq: Optional[Dict[str, float]] = None
+        
+        self.memory_total: Optional[int] = None
+        self.memory_available: Optional[int] = None
+        self.memory_percent: Optional[float] = None
+        self.memory_used: Optional[int] = None
+        self.memory_free: Optional[int] = None
+        
+        self.disk_total: Optional[int] = None
+        self.disk_used: Optional[int] = None
+        self.disk_free: Optional[int] = None
+        self.disk_percent: Optional[float] = None
+        
+        self.platform = ''
+        self.platform_version = ''
+        self.machine = ''
+        self.processor = ''
+        self.username = 'Unknown'
+        
+    @property
+    def has_cpu(self) -> bool:
+        """Gibt zurück, ob CPU-Werte erfasst wurden"""
+        return self.cpu_percent is not None
+        
+    @property
+    def has_memory(self) -> bool:
+        """Gibt zurück, ob RAM-Werte erfasst wurden"""
+        return self.memory_percent is not None
+        
+    @property
+    def has_disk(self) -> bool:
+        """Gibt zurück, ob Festplatten-Werte erfasst wurden"""
+        return self.disk_percent is not None
+        
+    def as_dict(self) -> Dict[str, Any]:
+        """Gibt den Datensatz im bisherigen verschachtelten Dict-Format zurück"""
+        data = {}
+        
+        if self.has_cpu:
+            data['cpu'] = {
+                'percent': self.cpu_percent,
+                'per_cpu': self.cpu_per_core,
+                'count': self.cpu_count,
+                'freq': self.cpu_freq
+            }
+            
+        if self.has_memory:
+            data['memory'] = {
+                'total': self.memory_total,
+                'available': self.memory_available,
+                'percent': self.memory_percent,
+                'used': self.memory_used,
+                'free': self.memory_free
+            }
+            
+        if self.has_disk:
+            data['disk'] = {
+                'total': self.disk_total,
+                'used': self.disk_used,
+                'free': self.disk_free,
+                'percent': self.disk_percent
+            }
+            
+        data['system'] = {
+            'platform': self.platform,
+            'platform_version': self.platform_version,
+            'machine': self.machine,
+            'processor': self.processor,
+            'username': self.username
+        }
+        data['timestamp'] = self.timestamp
+        data['monotonic'] = self.monotonic
+        return data
+        
+    # Dict-Kompatibilität für Code, der noch mit data['cpu'] usw. arbeitet
+    def __getitem__(self, key: str) -> Any:
+        return self.as_dict()[key]
+        
+    def __contains__(self, key: str) -> bool:
+        if key == 'cpu':
+            return self.has_cpu
+        if key == 'memory':
+            return self.has_memory
+        if key == 'disk':
+            return self.has_disk
+        return key in ('system', 'timestamp', 'monotonic')
+        
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.as_dict().get(key, default)
+        
+    def keys(self):
+        return self.as_dict().keys()
@@ -0,0 +1,179 @@
+"""
+Sample-Bus für SystemMonitorX
+Verteilt Messwerte an Abonnenten, jeder mit eigener Queue und eigenem Zustell-Thread
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, List, Callable, Optional
+
+class Subscription:
+    """Ein Abonnent des Sample-Bus mit eigener, begrenzter Queue"""
+    
+    # latest:   nur der neueste Wert wird zugestellt (GUI)
+    # lossless: jeder Wert wird zugestellt; bei voller Queue wartet der Veröffentlicher bis zu
+    #           put_timeout Sekunden auf Platz, erst danach wird der älteste Wert verworfen (Logging)
+    # batch:    Werte werden in Listen zu batch_size Einträgen zugestellt, bei voller Queue
+    #           wird der älteste Wert verworfen
+    POLICIES = ("latest", "lossless", "batch")
+    
+    def __init__(self, callback: Callable, policy: str = "latest", batch_size: int = 10,
+                 max_queue: int = 1000, name: Optional[str] = None, put_timeout: float = 1.0):
+        """Initialisiert das Abonnement und startet den Zustell-Thread"""
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unbekannte Zustell-Strategie: {policy}")
+            
+        self.callback = callback
+        self.policy = policy
+        self.batch_size = max(1, batch_size)
+        self.max_queue = max(self.batch_size, max_queue)
+        self.name = name or getattr(callback, '__qualname__', repr(callback))
+        self.put_timeout = put_timeout
+        
+        self.queue = deque()
+        self.condition = threading.Condition()
+        self.running = True
+        
+        # Zähler
+        self.published_count = 0
+        self.delivered_count = 0
+        self.dropped_count = 0
+        self.blocked_count = 0  # Veröffentlichungen, die auf Platz in der Queue warten mussten
+        self.last_lag = 0.0  # Sekunden zwischen Veröffentlichung und Zustellung
+        self.max_lag = 0.0
+        
+        self.thread = threading.Thread(target=self._delivery_loop, name=f"SampleBus-{self.name}", daemon=True)
+        self.thread.start()
+        
+    def put(self, sample: Any):
+        """Reiht einen Messwert ein (lossless: wartet bei voller Queue höchstens put_timeout Sekunden)"""
+        with self.condition:
+            if not self.running:
+                return
+                
+            self.published_count += 1
+            if self.policy == "latest":
+                # Nicht abgeholte Werte durch den neuesten ersetzen
+                self.dropped_count += len(self.queue)
+                self.queue.clear()
+            elif len(self.queue) >= self.max_queue:
+                if self.policy == "lossless":
+                    # Veröffentlicher bremsen, bis der Zustell-Thread Platz geschaffen hat
+                    self.blocked_count += 1
+                    self.condition.wait_for(lambda: not self.running or len(self.queue) < self.max_queue,
+                                            self.put_timeout)
+                    if not self.running:
+                        return
+                if len(self.queue) >= self.max_queue:
+                    self.queue.popleft()
+                    self.dropped_count += 1
+                    if self.policy == "lossless" and self.dropped_count == 1:
+                        print(f"Warnung: Abonnent {self.name} kommt nicht nach, ältester Wert verworfen")
+                        
+            self.queue.append((time.monotonic(), sample))
+            self.condition.notify_all()
+            
+    def _take(self) -> List[Any]:
+        """Wartet auf zustellbare Einträge und entnimmt sie der Queue"""
+        with self.condition:
+            while self.running and (not self.queue or
+                                    (self.policy == "batch" and len(self.queue) < self.batch_size)):
+                self.condition.wait()
+                
+            count = self.batch_size if self.policy == "batch" else 1
+            items = [self.queue.popleft() for _ in range(min(count, len(self.queue)))]
+            # Wartende Veröffentlicher (lossless) wecken
+            self.condition.notify_all()
+            return items
+            
+    def _delivery_loop(self):
+        """Stellt Einträge auf dem eigenen Thread zu"""
+        while True:
+            items = self._take()
+            if not items:
+                # Gestoppt und Queue leer
+                return
+                
+            try:
+                if self.policy == "batch":
+                    self.callback([sample for _, sample in items])
+                else:
+                    self.callback(items[0][1])
+            except Exception as e:
+                print(f"Fehler im Abonnenten {self.name}: {e}")
+                
+            self.delivered_count += len(items)
+            self.last_lag = time.monotonic() - items[0][0]
+            self.max_lag = max(self.max_lag, self.last_lag)
+            
+    def stop(self, timeout: Optional[float] = 5.0):
+        """Stoppt die Zustellung, verbleibende Einträge werden noch ausgeliefert"""
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        if self.thread is not threading.current_thread():
+            self.thread.join(timeout)
+            
+    def get_stats(self) -> Dict[str, Any]:
+        """Gibt Queue-Länge, Verzögerung und Verlustzähler zurück"""
+        with self.condition:
+            queued = len(self.queue)
+            oldest = self.queue[0][0] if self.queue else None
+            
+        return {
+            'name': self.name,
+            'policy': self.policy,
+            'queued': queued,
+            'published': self.published_count,
+            'delivered': self.delivered_count,
+            'dropped': self.dropped_count,
+            'blocked': self.blocked_count,
+            'lag': time.monotonic() - oldest if oldest is not None else 0.0,
+            'last_lag': self.last_lag,
+            'max_lag': self.max_lag
+        }
+
+class SampleBus:
+    """Verteilt Messwerte an alle Abonnenten (nur lossless-Abonnenten dürfen den Sammler kurz aufhalten)"""
+    
+    def __init__(self):
+        """Initialisiert den Sample-Bus"""
+        self.subscriptions: List[Subscription] = []
+        self.lock = threading.Lock()
+        
+    def subscribe(self, callback: Callable, policy: str = "latest", batch_size: int = 10,
+                  max_queue: int = 1000, name: Optional[str] = None, put_timeout: float = 1.0) -> Subscription:
+        """Registriert einen Abonnenten mit eigener Queue und Zustell-Strategie"""
+        subscription = Subscription(callback, policy, batch_size, max_queue, name, put_timeout)
+        with self.lock:
+            self.subscriptions.append(subscription)
+        return subscription
+        
+    def unsubscribe(self, subscription: Subscription):
+        """Entfernt einen Abonnenten und stoppt dessen Zustellung"""
+        with self.lock:
+            if subscription in self.subscriptions:
+                self.subscriptions.remove(subscription)
+        subscription.stop()
+        
+    def publish(self, sample: Any):
+        """Reiht einen Messwert bei allen Abonnenten ein"""
+        with self.lock:
+            subscriptions = list(self.subscriptions)
+        for subscription in subscriptions:
+            subscription.put(sample)
+            
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """Gibt die Statistik aller Abonnenten zurück"""
+        with self.lock:
+            subscriptions = list(self.subscriptions)
+        return [subscription.get_stats() for subscription in subscriptions]
+        
+    def stop(self):
+        """Stoppt alle Abonnenten"""
+        with self.lock:
+            subscriptions = list(self.subscriptions)
+            self.subscriptions.clear()
+        for subscription in subscriptions:
+            subscription.stop()
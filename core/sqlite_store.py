@@ -0,0 +1,293 @@
+"""
+SQLite-Backend für die Log-Daten von SystemMonitorX
+WAL-Modus, Zeitindex und Aggregation direkt in SQL
+"""
+
+import sqlite3
+import threading
+import time
+import numpy as np
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional, Sequence
+
+# Dateiname der gemeinsamen Datenbank im Log-Verzeichnis
+DEFAULT_FILE = "system_data.sqlite"
+
+class SQLiteLogStore:
+    """Speichert Log-Einträge aller Sitzungen in einer SQLite-Datenbank"""
+    
+    NUMERIC_FIELDS = [
+        'cpu_percent', 'cpu_count', 'memory_percent', 'memory_used_gb', 'memory_total_gb',
+        'disk_percent', 'disk_used_gb', 'disk_total_gb'
+    ]
+    
+    def __init__(self, db_path: Path, read_only: bool = False):
+        """Initialisiert die Datenbank und legt bei Bedarf Tabellen und Index an
+        
+        Mit read_only werden nur Lese-Verbindungen (mode=ro) geöffnet und keine Migrationen
+        ausgeführt, Abfragen schreiben dann nie in die Datenbank des laufenden Loggers.
+        """
+        self.db_path = Path(db_path)
+        self.read_only = read_only
+        self.session_id = None
+        self.lock = threading.Lock()
+        self._write_connection = None
+        self._has_bounds = True
+        
+        if read_only:
+            # Ältere, noch nicht migrierte Datenbank: Zeitgrenzen in get_sessions aus samples bilden
+            with closing(self._connect()) as connection:
+                session_columns = {row[1] for row in connection.execute("PRAGMA table_info(sessions)")}
+            self._has_bounds = {'first_ts', 'last_ts'} <= session_columns
+            return
+            
+        with closing(self._connect()) as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, started REAL, ended REAL, "
+                "platform TEXT, machine TEXT)"
+            )
+            columns = ", ".join(f"{field} REAL" for field in self.NUMERIC_FIELDS)
+            connection.execute(
+                f"CREATE TABLE IF NOT EXISTS samples (session_id INTEGER NOT NULL, timestamp REAL NOT NULL, {columns})"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS idx_samples_timestamp ON samples(timestamp)")
+            connection.execute("CREATE INDEX IF NOT EXISTS idx_samples_session ON samples(session_id, timestamp)")
+            
+            # Zeitgrenzen je Sitzung (ältere Datenbanken: Spalten ergänzen und einmalig aus samples füllen)
+            session_columns = {row[1] for row in connection.execute("PRAGMA table_info(sessions)")}
+            for column in ('first_ts', 'last_ts'):
+                if column not in session_columns:
+                    connection.execute(f"ALTER TABLE sessions ADD COLUMN {column} REAL")
+            connection.execute(
+                "UPDATE sessions SET "
+                "first_ts = (SELECT MIN(timestamp) FROM samples WHERE session_id = sessions.id), "
+                "last_ts = (SELECT MAX(timestamp) FROM samples WHERE session_id = sessions.id) "
+                "WHERE first_ts IS NULL"
+            )
+            connection.commit()
+            
+    def _connect(self) -> sqlite3.Connection:
+        """Öffnet eine Verbindung im WAL-Modus (Leser blockieren den Schreiber nicht)"""
+        if self.read_only:
+            uri = f"{self.db_path.resolve().as_uri()}?mode=ro"
+            return sqlite3.connect(uri, uri=True, timeout=10, check_same_thread=False)
+        connection = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+        
+    def _check_fields(self, fields: Sequence[str]):
+        """Lässt nur bekannte Spaltennamen in SQL-Ausdrücke"""
+        for field in fields:
+            if field not in self.NUMERIC_FIELDS:
+                raise ValueError(f"Unbekanntes Feld: {field}")
+                
+    # Schreiben
+    
+    def open_session(self, platform: str = '', machine: str = '') -> int:
+        """Beginnt eine neue Logging-Sitzung"""
+        if self.read_only:
+            raise sqlite3.OperationalError("Datenbank ist schreibgeschützt geöffnet")
+        with self.lock:
+            if self._write_connection is None:
+                self._write_connection = self._connect()
+            cursor = self._write_connection.execute(
+                "INSERT INTO sessions (started, platform, machine) VALUES (?, ?, ?)",
+                (time.time(), platform, machine)
+            )
+            self._write_connection.commit()
+            self.session_id = cursor.lastrowid
+            return self.session_id
+            
+    def insert(self, entries: List[Dict[str, Any]]):
+        """Schreibt Einträge (mit Epoch-Zeitstempel) gebündelt in einer Transaktion"""
+        if not entries:
+            return
+        if self.session_id is None:
+            self.open_session(entries[0].get('platform', ''), entries[0].get('machine', ''))
+            
+        placeholders = ", ".join("?" for _ in range(len(self.NUMERIC_FIELDS) + 2))
+        rows = [
+            (self.session_id, entry['timestamp'], *[entry.get(field) for field in self.NUMERIC_FIELDS])
+            for entry in entries
+        ]
+        first = min(row[1] for row in rows)
+        last = max(row[1] for row in rows)
+        with self.lock:
+            with self._write_connection:
+                self._write_connection.executemany(
+                    f"INSERT INTO samples (session_id, timestamp, {', '.join(self.NUMERIC_FIELDS)}) "
+                    f"VALUES ({placeholders})",
+                    rows
+                )
+                # Zeitgrenzen in derselben Transaktion nachführen (MIN/MAX mit NULL ergibt NULL)
+                self._write_connection.execute(
+                    "UPDATE sessions SET first_ts = COALESCE(MIN(first_ts, ?), ?), "
+                    "last_ts = COALESCE(MAX(last_ts, ?), ?) WHERE id = ?",
+                    (first, first, last, last, self.session_id)
+                )
+                
+    def close_session(self):
+        """Beendet die aktuelle Sitzung und schließt die Schreib-Verbindung"""
+        with self.lock:
+            if self._write_connection is None:
+                return
+            if self.session_id is not None:
+                # Zeitgrenzen abschließend exakt aus den Zeilen der Sitzung (Index auf session_id, timestamp)
+                self._write_connection.execute(
+                    "UPDATE sessions SET ended = ?, "
+                    "first_ts = (SELECT MIN(timestamp) FROM samples WHERE session_id = sessions.id), "
+                    "last_ts = (SELECT MAX(timestamp) FROM samples WHERE session_id = sessions.id) "
+                    "WHERE id = ?", (time.time(), self.session_id)
+                )
+                self._write_connection.commit()
+            self._write_connection.close()
+            self._write_connection = None
+            self.session_id = None
+            
+    # Lesen
+    
+    def get_latest_session_id(self) -> Optional[int]:
+        """Gibt die ID der neuesten Sitzung mit Daten zurück"""
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                "SELECT session_id FROM samples ORDER BY timestamp DESC LIMIT 1"
+            ).fetchone()
+        return row[0] if row else None
+        
+    def get_time_bounds(self, session_id: Optional[int] = None) -> Optional[tuple]:
+        """Gibt (erster, letzter Zeitstempel, Anzahl) zurück"""
+        query = "SELECT MIN(timestamp), MAX(timestamp), COUNT(*) FROM samples"
+        params = ()
+        if session_id is not None:
+            query += " WHERE session_id = ?"
+            params = (session_id,)
+        with closing(self._connect()) as connection:
+            row = connection.execute(query, params).fetchone()
+        return row if row and row[2] else None
+        
+    def get_sessions(self, start: Optional[float] = None, end: Optional[float] = None) -> List[tuple]:
+        """Gibt (Sitzung, erster, letzter Zeitstempel) aller Sitzungen zurück, die den Zeitraum überschneiden
+        
+        Die Zeitgrenzen stehen in der Tabelle sessions, samples wird dafür nicht gelesen
+        (außer bei schreibgeschützt geöffneten, noch nicht migrierten Datenbanken).
+        """
+        conditions = ["first_ts IS NOT NULL"]
+        params = []
+        if start is not None:
+            conditions.append("last_ts >= ?")
+            params.append(start)
+        if end is not None:
+            conditions.append("first_ts <= ?")
+            params.append(end)
+        table = "sessions"
+        if not self._has_bounds:
+            table = ("(SELECT session_id AS id, MIN(timestamp) AS first_ts, MAX(timestamp) AS last_ts "
+                     "FROM samples GROUP BY session_id)")
+        with closing(self._connect()) as connection:
+            return connection.execute(
+                f"SELECT id, first_ts, last_ts FROM {table} WHERE {' AND '.join(conditions)} ORDER BY first_ts",
+                params
+            ).fetchall()
+            
+    def iter_range(self, start: Optional[float] = None, end: Optional[float] = None,
+                   fields: Optional[Sequence[str]] = None, session_id: Optional[int] = None,
+                   chunk_size: int = 4096) -> Iterator[Dict[str, Any]]:
+        """Liest die Zeilen eines Zeitraums blockweise als Einträge (ohne das Ergebnis ganz zu laden)"""
+        fields = list(fields) if fields is not None else list(self.NUMERIC_FIELDS)
+        self._check_fields(fields)
+        names = ['timestamp'] + fields
+        
+        where, params = self._where(start, end, session_id)
+        with closing(self._connect()) as connection:
+            cursor = connection.execute(f"SELECT {', '.join(names)} FROM samples{where} ORDER BY timestamp", params)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    return
+                for row in rows:
+                    yield dict(zip(names, row))
+                    
+    def query_range(self, start: Optional[float] = None, end: Optional[float] = None,
+                    fields: Optional[Sequence[str]] = None, session_id: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Gibt die Rohwerte eines Zeitraums als Spalten-Arrays zurück (nutzt den Zeitindex)"""
+        fields = list(fields) if fields is not None else list(self.NUMERIC_FIELDS)
+        self._check_fields(fields)
+        
+        where, params = self._where(start, end, session_id)
+        query = f"SELECT timestamp, {', '.join(fields)} FROM samples{where} ORDER BY timestamp" if fields \
+            else f"SELECT timestamp FROM samples{where} ORDER BY timestamp"
+        with closing(self._connect()) as connection:
+            rows = connection.execute(query, params).fetchall()
+            
+        return self._to_columns(rows, ['timestamp'] + fields)
+        
+    def query_aggregate(self, fields: Sequence[str], bucket_seconds: float, start: Optional[float] = None,
+                        end: Optional[float] = None, percentiles: Sequence[int] = (),
+                        session_id: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Aggregiert pro Zeit-Bucket in SQL: <feld> (Mittelwert), <feld>_min, <feld>_max, <feld>_p<N>"""
+        fields = list(fields)
+        self._check_fields(fields)
+        where, params = self._where(start, end, session_id)
+        bucket = "CAST(timestamp / ? AS INTEGER)"
+        
+        aggregates = ", ".join(f"AVG({f}), MIN({f}), MAX({f})" for f in fields)
+        query = f"SELECT {bucket} AS bucket, COUNT(*), {aggregates} FROM samples{where} GROUP BY bucket ORDER BY bucket"
+        with closing(self._connect()) as connection:
+            rows = connection.execute(query, (bucket_seconds, *params)).fetchall()
+            
+            names = ['bucket', 'count']
+            for f in fields:
+                names += [f, f"{f}_min", f"{f}_max"]
+            result = self._to_columns(rows, names)
+            
+            # Perzentile (Nearest-Rank) über Fensterfunktionen pro Bucket
+            for f in fields:
+                for p in percentiles:
+                    p = int(p)
+                    ranked = (
+                        f"SELECT {bucket} AS bucket, {f} AS value, "
+                        f"ROW_NUMBER() OVER (PARTITION BY {bucket} ORDER BY {f}) AS rn, "
+                        f"COUNT(*) OVER (PARTITION BY {bucket}) AS cnt "
+                        f"FROM samples{where}"
+                    )
+                    query = (
+                        f"SELECT bucket, value FROM ({ranked}) "
+                        f"WHERE rn = MAX(1, (? * cnt + 99) / 100) ORDER BY bucket"
+                    )
+                    rows = connection.execute(
+                        query, (bucket_seconds, bucket_seconds, bucket_seconds, *params, p)
+                    ).fetchall()
+                    values = dict(rows)
+                    result[f"{f}_p{p}"] = np.array(
+                        [values.get(b, np.nan) for b in result['bucket']], dtype=float
+                    )
+                    
+        result['timestamp'] = result.pop('bucket') * bucket_seconds
+        return result
+        
+    def _where(self, start: Optional[float], end: Optional[float], session_id: Optional[int]):
+        """Baut die WHERE-Klausel für Zeitraum und Sitzung"""
+        conditions = []
+        params = []
+        if start is not None:
+            conditions.append("timestamp >= ?")
+            params.append(start)
+        if end is not None:
+            conditions.append("timestamp <= ?")
+            params.append(end)
+        if session_id is not None:
+            conditions.append("session_id = ?")
+            params.append(session_id)
+        where = (" WHERE " + " AND ".join(conditions)) if conditions else ""
+        return where, params
+        
+    @staticmethod
+    def _to_columns(rows: List[tuple], names: List[str]) -> Dict[str, np.ndarray]:
+        """Wandelt Ergebniszeilen in Spalten-Arrays um"""
+        if not rows:
+            return {name: np.empty(0) for name in names}
+        matrix = np.array(rows, dtype=float)
+        return {name: matrix[:, i] for i, name in enumerate(names)}
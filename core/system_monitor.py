@@ -6,96 +6,305 @@ import psutil
 import platform
 import threading
 import time
-from typing import Dict, Any, Callable
+from typing import Dict, Any, Callable, Optional
+from .sample import SystemSample
+from .sample_bus import SampleBus, Subscription
+from .history_store import HistoryStore
+
+class MetricGroup:
+    """Eine Gruppe von Messwerten mit eigenem Aktualisierungsintervall"""
+    
+    def __init__(self, name: str, collector: Callable[[], Any], interval: Optional[float] = None, enabled: bool = True):
+        """Initialisiert die Metrik-Gruppe (interval=None: nur einmal beim Start abfragen)"""
+        self.name = name
+        self.collector = collector
+        self.interval = interval
+        self.enabled = enabled
+        self.value = None
+        self.last_update = None
+        
+    def is_due(self, now: float, tolerance: float = 0.0) -> bool:
+        """Prüft, ob die Gruppe neu abgefragt werden muss"""
+        if not self.enabled:
+            return False
+        if self.last_update is None:
+            return True
+        if self.interval is None:
+            return False
+        return now - self.last_update + tolerance >= self.interval
+        
+    def refresh(self, now: float):
+        """Fragt die Werte der Gruppe neu ab"""
+        self.value = self.collector()
+        self.last_update = now
+
+class CollectionScheduler:
+    """Fragt jede Metrik-Gruppe nur in ihrem eigenen Intervall ab und liefert sonst den Cache"""
+    
+    def __init__(self, tolerance: float = 0.0):
+        """Initialisiert den Scheduler"""
+        self.groups: Dict[str, MetricGroup] = {}
+        # Toleranz, damit Intervalle = Tick-Intervall durch Jitter nicht jeden zweiten Tick ausfallen
+        self.tolerance = tolerance
+        
+    def add_group(self, name: str, collector: Callable[[], Any], interval: Optional[float] = None, enabled: bool = True):
+        """Registriert eine Metrik-Gruppe"""
+        self.groups[name] = MetricGroup(name, collector, interval, enabled)
+        
+    def set_enabled(self, name: str, enabled: bool):
+        """Aktiviert/Deaktiviert eine Metrik-Gruppe"""
+        if name in self.groups:
+            self.groups[name].enabled = enabled
+            
+    def collect(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """Aktualisiert fällige Gruppen und gibt die neuesten Werte aller aktiven Gruppen zurück"""
+        if now is None:
+            now = time.monotonic()
+            
+        values = {}
+        for group in self.groups.values():
+            if not group.enabled:
+                continue
+            if group.is_due(now, self.tolerance):
+                try:
+                    group.refresh(now)
+                except Exception as e:
+                    print(f"Fehler beim Abfragen der Metrik-Gruppe {group.name}: {e}")
+            if group.last_update is not None:
+                values[group.name] = group.value
+        return values
 
 class SystemMonitor:
     """Überwacht Systemdaten wie CPU, RAM, Festplatte"""
     
-    def __init__(self):
+    # Aktualisierungsintervalle der Metrik-Gruppen in Sekunden (None = nur beim Start)
+    DEFAULT_INTERVALS = {
+        'cpu': 0.25,
+        'cpu_freq': 5.0,
+        'memory': 1.0,
+        'disk': 30.0,
+        'static': None,
+        'username': 60.0
+    }
+    
+    def __init__(self, config_manager=None):
         """Initialisiert den System-Monitor"""
+        self.config_manager = config_manager
         self.running = False
         self.update_interval = 1.0  # Sekunden
-        self.callbacks = []
+        self.bus = SampleBus()
         self.monitor_thread = None
+        self._stop_event = threading.Event()
+        
+        # Tick-Statistik (verpasste Deadlines werden gezählt statt die Periode zu strecken)
+        self.tick_count = 0
+        self.overrun_count = 0
+        
+        if self.config_manager:
+            self.update_interval = self.config_manager.get_config("monitoring.update_frequency") or 1.0
+            
+        # Letzte CPU-Zeiten als Basis für die Delta-Berechnung
+        self._last_cpu_times = psutil.cpu_times()
+        self._last_per_cpu_times = psutil.cpu_times(percpu=True)
         
+        # Verlauf im Arbeitsspeicher (Rohdaten der letzten Stunde + Aggregationsstufen)
+        self.history = HistoryStore(sample_interval=self.update_interval)
+        
+        self.scheduler = CollectionScheduler(tolerance=self.update_interval / 2)
+        self._setup_scheduler()
+        
+    def _setup_scheduler(self):
+        """Registriert die Metrik-Gruppen und übernimmt die *_enabled-Flags aus der Konfiguration"""
+        collectors = {
+            'cpu': self._collect_cpu,
+            'cpu_freq': self._collect_cpu_freq,
+            'memory': self._collect_memory,
+            'disk': self._collect_disk,
+            'static': self._collect_static,
+            'username': self._collect_username
+        }
+        enabled_keys = {
+            'cpu': "monitoring.cpu_enabled",
+            'cpu_freq': "monitoring.cpu_enabled",
+            'memory': "monitoring.memory_enabled",
+            'disk': "monitoring.disk_enabled"
+        }
+        
+        for name, collector in collectors.items():
+            enabled = True
+            if self.config_manager and name in enabled_keys:
+                enabled = self.config_manager.get_config(enabled_keys[name]) is not False
+            self.scheduler.add_group(name, collector, self.DEFAULT_INTERVALS[name], enabled)
+            
     def start(self):
         """Startet das Monitoring"""
         if not self.running:
             self.running = True
+            self._stop_event.clear()
             self.monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
             self.monitor_thread.start()
             
     def stop(self):
         """Stoppt das Monitoring"""
         self.running = False
+        self._stop_event.set()
         if self.monitor_thread:
             self.monitor_thread.join()
+        self.bus.stop()
             
-    def add_callback(self, callback: Callable[[Dict[str, Any]], None]):
-        """Fügt einen Callback für Datenaktualisierungen hinzu"""
-        self.callbacks.append(callback)
+    def add_callback(self, callback: Callable[[SystemSample], None], policy: str = "latest",
+                     batch_size: int = 10, max_queue: int = 1000) -> Subscription:
+        """Abonniert die Messwerte (policy: latest, lossless oder batch)"""
+        return self.bus.subscribe(callback, policy, batch_size, max_queue)
         
-    def get_system_info(self) -> Dict[str, Any]:
-        """Sammelt aktuelle Systemdaten"""
-        try:
-            # CPU-Auslastung
-            cpu_percent = psutil.cpu_percent(interval=0.1)
-            
-            # RAM-Informationen
-            memory = psutil.virtual_memory()
-            
-            # Festplatten-Informationen
-            disk = psutil.disk_usage('/')
+    def remove_callback(self, subscription: Subscription):
+        """Beendet ein Abonnement"""
+        self.bus.unsubscribe(subscription)
+        
+    @staticmethod
+    def _cpu_total_time(times) -> float:
+        """Summiert alle CPU-Zeiten (Guest-Zeiten sind unter Linux bereits in user/nice enthalten)"""
+        total = sum(times)
+        total -= getattr(times, 'guest', 0)
+        total -= getattr(times, 'guest_nice', 0)
+        return total
+        
+    @classmethod
+    def _calculate_cpu_percent(cls, before, after) -> float:
+        """Berechnet die CPU-Auslastung aus zwei cpu_times-Snapshots (wie psutil im Intervall-Modus)"""
+        delta = type(after)(*[max(0, a - b) for a, b in zip(after, before)])
+        all_delta = cls._cpu_total_time(delta)
+        if all_delta <= 0:
+            return 0.0
             
-            # System-Informationen
-            system_info = {
-                'platform': platform.system(),
-                'platform_version': platform.version(),
-                'machine': platform.machine(),
-                'processor': platform.processor(),
-                'username': psutil.users()[0].name if psutil.users() else 'Unknown'
-            }
+        busy_delta = all_delta - delta.idle - getattr(delta, 'iowait', 0)
+        busy_percent = (busy_delta / all_delta) * 100
+        return round(min(max(0.0, busy_percent), 100.0), 1)
+        
+    def _sample_cpu(self):
+        """Liefert die CPU-Auslastung gesamt und pro Kern seit dem letzten Aufruf, ohne zu blockieren"""
+        cpu_times = psutil.cpu_times()
+        per_cpu_times = psutil.cpu_times(percpu=True)
+        
+        cpu_percent = self._calculate_cpu_percent(self._last_cpu_times, cpu_times)
+        per_cpu_percent = [
+            self._calculate_cpu_percent(before, after)
+            for before, after in zip(self._last_per_cpu_times, per_cpu_times)
+        ]
+        
+        self._last_cpu_times = cpu_times
+        self._last_per_cpu_times = per_cpu_times
+        return cpu_percent, per_cpu_percent
+        
+    def _collect_cpu(self):
+        """Sammelt die CPU-Auslastung (gesamt, pro Kern)"""
+        return self._sample_cpu()
+        
+    def _collect_cpu_freq(self) -> Optional[Dict[str, float]]:
+        """Sammelt die CPU-Frequenz"""
+        freq = psutil.cpu_freq()
+        return freq._asdict() if freq else None
+        
+    def _collect_memory(self):
+        """Sammelt die RAM-Informationen"""
+        return psutil.virtual_memory()
+        
+    def _collect_disk(self):
+        """Sammelt die Festplatten-Informationen"""
+        return psutil.disk_usage('/')
+        
+    def _collect_static(self) -> Dict[str, Any]:
+        """Sammelt Werte, die sich zur Laufzeit nicht ändern"""
+        return {
+            'platform': platform.system(),
+            'platform_version': platform.version(),
+            'machine': platform.machine(),
+            'processor': platform.processor(),
+            'cpu_count': psutil.cpu_count()
+        }
+        
+    def _collect_username(self) -> str:
+        """Ermittelt den angemeldeten Benutzer"""
+        users = psutil.users()
+        return users[0].name if users else 'Unknown'
+        
+    def get_stats(self) -> Dict[str, Any]:
+        """Gibt die Tick-Statistik des Monitor-Loops zurück"""
+        return {
+            'ticks': self.tick_count,
+            'overruns': self.overrun_count,
+            'update_interval': self.update_interval,
+            'subscribers': self.bus.get_stats()
+        }
+        
+    def get_system_info(self, monotonic_time: Optional[float] = None) -> Optional[SystemSample]:
+        """Sammelt aktuelle Systemdaten aus den zuletzt aktualisierten Metrik-Gruppen"""
+        try:
+            if monotonic_time is None:
+                monotonic_time = time.monotonic()
+            values = self.scheduler.collect(monotonic_time)
+            sample = SystemSample()
             
-            return {
-                'cpu': {
-                    'percent': cpu_percent,
-                    'count': psutil.cpu_count(),
-                    'freq': psutil.cpu_freq()._asdict() if psutil.cpu_freq() else None
-                },
-                'memory': {
-                    'total': memory.total,
-                    'available': memory.available,
-                    'percent': memory.percent,
-                    'used': memory.used,
-                    'free': memory.free
-                },
-                'disk': {
-                    'total': disk.total,
-                    'used': disk.used,
-                    'free': disk.free,
-                    'percent': (disk.used / disk.total) * 100
-                },
-                'system': system_info,
-                'timestamp': time.time()
-            }
+            static = values.get('static')
+            if static:
+                sample.platform = static['platform']
+                sample.platform_version = static['platform_version']
+                sample.machine = static['machine']
+                sample.processor = static['processor']
+                sample.cpu_count = static['cpu_count']
+                
+            if 'username' in values:
+                sample.username = values['username']
+                
+            if 'cpu' in values:
+                sample.cpu_percent, sample.cpu_per_core = values['cpu']
+                sample.cpu_freq = values.get('cpu_freq')
+                
+            memory = values.get('memory')
+            if memory is not None:
+                sample.memory_total = memory.total
+                sample.memory_available = memory.available
+                sample.memory_percent = memory.percent
+                sample.memory_used = memory.used
+                sample.memory_free = memory.free
+                
+            disk = values.get('disk')
+            if disk is not None:
+                sample.disk_total = disk.total
+                sample.disk_used = disk.used
+                sample.disk_free = disk.free
+                sample.disk_percent = (disk.used / disk.total) * 100
+                
+            # Wanduhrzeit auf den (gleichmäßigen) Tick-Zeitpunkt zurückrechnen
+            sample.timestamp = time.time() - (time.monotonic() - monotonic_time)
+            sample.monotonic = monotonic_time
+            return sample
         except Exception as e:
             print(f"Fehler beim Sammeln der Systemdaten: {e}")
-            return {}
+            return None
             
     def _monitor_loop(self):
-        """Hauptschleife für kontinuierliches Monitoring"""
+        """Hauptschleife mit festen Deadlines auf der monotonen Uhr"""
+        next_tick = time.monotonic()
         while self.running:
             try:
-                data = self.get_system_info()
+                data = self.get_system_info(next_tick)
                 if data:
-                    # Callbacks aufrufen
-                    for callback in self.callbacks:
-                        try:
-                            callback(data)
-                        except Exception as e:
-                            print(f"Fehler im Callback: {e}")
-                            
-                time.sleep(self.update_interval)
+                    self.history.add_sample(data)
+                    
+                    # An die Abonnenten verteilen (blockiert nicht)
+                    self.bus.publish(data)
             except Exception as e:
                 print(f"Fehler im Monitor-Loop: {e}")
-                time.sleep(self.update_interval) 
\ No newline at end of file
+                
+            self.tick_count += 1
+            next_tick += self.update_interval
+            now = time.monotonic()
+            
+            # Verpasste Deadlines überspringen und als Overrun zählen
+            if now > next_tick:
+                missed = int((now - next_tick) // self.update_interval) + 1
+                self.overrun_count += missed
+                next_tick += missed * self.update_interval
+                
+            self._stop_event.wait(next_tick - now)
@@ -3,8 +3,9 @@ Widget-Manager für Desktop-Widgets
 """
 
 import threading
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from widgets.desktop_widget import DesktopWidget
+from .sample import SystemSample
 
 class WidgetManager:
     """Verwaltet Desktop-Widgets"""
@@ -16,7 +17,7 @@ class WidgetManager:
         self.active_widgets: List[DesktopWidget] = []
         self.widget_lock = threading.Lock()
         
-    def create_widget(self, widget_type: str, data: Dict[str, Any], parent_window=None) -> DesktopWidget:
+    def create_widget(self, widget_type: str, data: Optional[SystemSample], parent_window=None) -> DesktopWidget:
         """Erstellt ein neues Desktop-Widget"""
         try:
             widget = DesktopWidget(widget_type, data, parent_window, self.config_manager, self.theme_manager)
@@ -73,7 +74,7 @@ class WidgetManager:
         with self.widget_lock:
             return self.active_widgets.copy()
             
-    def update_widget_data(self, data: Dict[str, Any]):
+    def update_widget_data(self, data: SystemSample):
         """Aktualisiert alle Widgets mit neuen Daten"""
         try:
             with self.widget_lock:
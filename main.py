@@ -6,6 +6,7 @@ Hauptanwendung mit CustomTkinter GUI und Desktop-Widgets
 
 import sys
 import os
+import multiprocessing
 from pathlib import Path
 
 # Projektpfade hinzufügen
@@ -24,4 +25,6 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
+    # Für die Worker-Prozesse der Log-Abfragen in der gepackten .exe
+    multiprocessing.freeze_support()
     main() 
\ No newline at end of file
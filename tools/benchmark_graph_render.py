@@ -0,0 +1,68 @@
+"""
+Benchmark der Graph-Darstellung von SystemMonitorX
+Misst Aufbau und Zeichnen der Systemübersicht mit und ohne Reduktion auf die Pixelbreite (min/max je Spalte)
+
+Aufruf: python tools/benchmark_graph_render.py [--rows 3600 86400 604800]
+"""
+
+import argparse
+import sys
+import time
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.graph_viewer import GraphViewer
+
+def generate_columns(rows: int, seed: int = 42) -> dict:
+    """Erzeugt Spalten wie aus dem Verlaufsspeicher (1 Hz, mit einzelnen Lastspitzen)"""
+    rng = np.random.default_rng(seed)
+    cpu = np.clip(20 + np.cumsum(rng.normal(0, 1, rows)) % 30 + rng.normal(0, 3, rows), 0, 100)
+    cpu[rng.integers(0, rows, max(1, rows // 5000))] = 100.0
+    return {
+        'timestamp': time.time() - rows + np.arange(rows, dtype=float),
+        'cpu_percent': cpu,
+        'memory_percent': np.clip(55 + np.cumsum(rng.normal(0, 0.05, rows)), 0, 100),
+        'disk_percent': np.full(rows, 42.0)
+    }
+
+def measure(viewer: GraphViewer, columns: dict) -> tuple:
+    """Gibt (Aufbau + erstes Zeichnen, Zeichnen nach Verschieben, Punkte je Linie) in Sekunden zurück"""
+    started = time.perf_counter()
+    fig = viewer.create_system_overview_graph(columns)
+    FigureCanvasAgg(fig).draw()
+    build = time.perf_counter() - started
+    
+    # Verschieben um ein Zehntel wie mit der Toolbar
+    ax = fig.axes[0]
+    lo, hi = ax.get_xlim()
+    started = time.perf_counter()
+    ax.set_xlim(lo + (hi - lo) / 10, hi + (hi - lo) / 10)
+    fig.canvas.draw()
+    pan = time.perf_counter() - started
+    
+    points = len(ax.lines[0].get_xdata())
+    return build, pan, points
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark der Graph-Darstellung")
+    parser.add_argument('--rows', type=int, nargs='+', default=[3600, 86400, 604800],
+                        help="Anzahl Messwerte (Standard: 1 Stunde, 1 Tag, 1 Woche bei 1 Hz)")
+    args = parser.parse_args()
+    
+    # Ohne Pool, damit jede Messung den Aufbau der Figure enthält
+    viewer = GraphViewer(pool_size=0)
+    print(f"{'Zeilen':>10}  {'Reduktion':<10}{'Aufbau':>10}{'Verschieben':>13}{'Punkte':>10}")
+    for rows in args.rows:
+        columns = generate_columns(rows)
+        for downsample in (False, True):
+            viewer.downsample = downsample
+            build, pan, points = measure(viewer, columns)
+            print(f"{rows:>10,}  {'an' if downsample else 'aus':<10}{build:>9.3f}s{pan:>12.3f}s{points:>10,}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark des Live-Graphen von SystemMonitorX
+Misst die Zeit pro Frame mit vollständigem draw() und mit Blitting (Hintergrund + vier Linien)
+
+Aufruf: python tools/benchmark_live_graph.py [--frames 200] [--window 300]
+"""
+
+import argparse
+import sys
+import time
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.graph_viewer import LiveGraphWindow
+
+def build_figure(window: int, animated: bool):
+    """Erstellt die Figure wie im Live-Fenster (1000x500 Pixel)"""
+    figure = Figure(figsize=(10, 5))
+    FigureCanvasAgg(figure)
+    ax = figure.add_subplot()
+    ax.set_xlim(-window, 0)
+    ax.set_ylim(0, 100)
+    ax.grid(True, alpha=0.3)
+    lines = [ax.plot([], [], color=color, linewidth=2, label=label, animated=animated)[0]
+             for _, label, color in LiveGraphWindow.SERIES]
+    ax.legend(handles=lines, loc='upper left')
+    figure.tight_layout()
+    return figure, ax, lines
+
+def run(frames: int, window: int, blit: bool) -> float:
+    """Gibt die mittlere Zeit pro Frame in Sekunden zurück"""
+    rng = np.random.default_rng(42)
+    values = rng.uniform(0, 100, (window + 2, len(LiveGraphWindow.SERIES)))
+    offsets = np.arange(-window - 1, 1, dtype=float)
+    figure, ax, lines = build_figure(window, blit)
+    canvas = figure.canvas
+    canvas.draw()
+    background = canvas.copy_from_bbox(figure.bbox)
+    
+    started = time.perf_counter()
+    for frame in range(frames):
+        # Zeitfenster wie im Live-Fenster pro Frame weiterschieben
+        shift = (frame % 10) / 10
+        if blit:
+            canvas.restore_region(background)
+        for column, line in enumerate(lines):
+            line.set_data(offsets - shift, values[:, column])
+            if blit:
+                ax.draw_artist(line)
+        if blit:
+            canvas.blit(ax.bbox)
+        else:
+            canvas.draw()
+    return (time.perf_counter() - started) / frames
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des Live-Graphen")
+    parser.add_argument('--frames', type=int, default=200, help="Anzahl Frames (Standard: 200)")
+    parser.add_argument('--window', type=int, default=300, help="Zeitfenster in Sekunden bei 1 Hz (Standard: 300)")
+    args = parser.parse_args()
+    
+    print(f"{'Verfahren':<12}{'ms/Frame':>10}{'max. FPS':>10}")
+    for blit in (False, True):
+        frame_time = run(args.frames, args.window, blit)
+        print(f"{'Blitting' if blit else 'draw()':<12}{1000 * frame_time:>10.2f}{1 / frame_time:>10.1f}")
+
+if __name__ == "__main__":
+    main()
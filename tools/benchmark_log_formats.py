@@ -0,0 +1,115 @@
+"""
+Benchmark der Log-Formate von SystemMonitorX
+Vergleicht Dateigröße und Lesegeschwindigkeit von CSV (auch gzip) und dem komprimierten Block-Format
+
+Aufruf: python tools/benchmark_log_formats.py [--rows 86400] [--block-rows 60 600 3600]
+"""
+
+import argparse
+import csv
+import gzip
+import sys
+import tempfile
+import time
+import numpy as np
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core import block_store, log_reader
+from core.data_logger import DataLogger
+
+def generate_entries(rows: int, seed: int = 42) -> list:
+    """Erzeugt realistische Log-Einträge (1 Hz mit Jitter, psutil-typische Auflösung)"""
+    rng = np.random.default_rng(seed)
+    gb = 1024**3
+    start = time.time() - rows
+    timestamps = start + np.arange(rows) + rng.normal(0, 0.003, rows)
+    cpu = np.clip(np.cumsum(rng.normal(0, 2, rows)) % 100, 0, 100).round(1)
+    memory_total = 16 * gb
+    memory_used = (8 * gb + np.cumsum(rng.integers(-256, 257, rows)) * 4096).astype(np.int64)
+    disk_total = 476 * gb
+    disk_used = (200 * gb + np.cumsum(rng.random(rows) < 0.01) * 1024 * 1024).astype(np.int64)
+    
+    entries = []
+    for i in range(rows):
+        entries.append({
+            'timestamp': float(timestamps[i]),
+            'cpu_percent': float(cpu[i]),
+            'cpu_count': 8,
+            'memory_percent': round(memory_used[i] / memory_total * 100, 1),
+            'memory_used_gb': memory_used[i] / gb,
+            'memory_total_gb': memory_total / gb,
+            'disk_percent': round(disk_used[i] / disk_total * 100, 1),
+            'disk_used_gb': disk_used[i] / gb,
+            'disk_total_gb': disk_total / gb,
+            'platform': 'Windows',
+            'machine': 'AMD64'
+        })
+    return entries
+
+def write_log(log_dir: Path, format_type: str, entries: list, block_rows: int) -> Path:
+    """Schreibt die Einträge über den DataLogger in Flushes zu block_rows Einträgen"""
+    logger = DataLogger(str(log_dir))
+    logger.compressor.method = 'none'
+    logger.start_logging(format_type)
+    path = logger.csv_file or logger.block_file
+    for i in range(0, len(entries), block_rows):
+        with logger.buffer_condition:
+            logger.data_buffer = entries[i:i + block_rows]
+        logger._flush_buffer()
+    logger.stop_logging()
+    return path
+
+def read_csv_columns(path: Path) -> dict:
+    """Liest eine CSV-Datei vollständig in Spalten (wie ein Graph sie braucht)"""
+    columns = {}
+    for record in log_reader.iter_file(path):
+        for name, value in record.items():
+            columns.setdefault(name, []).append(value)
+    return {name: np.array(values) for name, values in columns.items()}
+
+def measure(function, repeat: int = 3) -> float:
+    """Beste Laufzeit aus mehreren Durchläufen"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark der Log-Formate")
+    parser.add_argument('--rows', type=int, default=86400, help="Anzahl Einträge (Standard: 1 Tag bei 1 Hz)")
+    parser.add_argument('--block-rows', type=int, nargs='+', default=[60, 600, 3600],
+                        help="Einträge pro Flush bzw. Block")
+    args = parser.parse_args()
+    
+    print(f"Erzeuge {args.rows} Einträge ...")
+    entries = generate_entries(args.rows)
+    
+    with tempfile.TemporaryDirectory() as temp:
+        temp = Path(temp)
+        csv_path = write_log(temp / 'csv', 'csv', entries, 1000)
+        gz_path = csv_path.with_name(csv_path.name + '.gz')
+        with open(csv_path, 'rb') as source, gzip.open(gz_path, 'wb') as target:
+            target.write(source.read())
+            
+        csv_size = csv_path.stat().st_size
+        csv_time = measure(lambda: read_csv_columns(csv_path), 1)
+        print(f"\n{'Format':<28}{'Größe':>12}{'Faktor':>9}{'Lesen':>10}{'Zeilen/s':>14}")
+        print(f"{'CSV':<28}{csv_size / 1024:>10.0f}KB{1:>9.1f}{csv_time:>9.3f}s{args.rows / csv_time:>14,.0f}")
+        print(f"{'CSV + gzip':<28}{gz_path.stat().st_size / 1024:>10.0f}KB"
+              f"{csv_size / gz_path.stat().st_size:>9.1f}{'':>10}{'':>14}")
+              
+        for block_rows in args.block_rows:
+            block_path = write_log(temp / f'block_{block_rows}', 'compressed', entries, block_rows)
+            size = block_path.stat().st_size
+            seconds = measure(lambda: block_store.read_block_file(block_path))
+            columns = block_store.read_block_file(block_path)
+            assert len(columns['timestamp']) == args.rows
+            print(f"{f'Block ({block_rows} Zeilen)':<28}{size / 1024:>10.0f}KB{csv_size / size:>9.1f}"
+                  f"{seconds:>9.3f}s{args.rows / seconds:>14,.0f}")
+
+if __name__ == "__main__":
+    main()
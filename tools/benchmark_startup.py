@@ -0,0 +1,77 @@
+"""
+Start-Benchmark von SystemMonitorX
+Misst die Zeit vom Prozessstart bis zum ersten gezeichneten Hauptfenster, jeweils in einem neuen Interpreter,
+einmal mit verzögert geladener Graph-Unterstützung und einmal mit matplotlib beim Start (wie vor dem Lazy-Import)
+
+Aufruf: python tools/benchmark_startup.py [--runs 5]
+Benötigt ein Display und die Abhängigkeiten aus requirements.txt.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+def child(eager: bool):
+    """Startet die Anwendung, meldet das erste Zeichnen des Hauptfensters und beendet sich"""
+    sys.path.insert(0, str(PROJECT_ROOT))
+    if eager:
+        # Früherer Stand: das Dashboard importierte den Graph-Viewer beim Laden des Moduls
+        import core.graph_viewer
+        
+    import customtkinter as ctk
+    from core.app import SystemMonitorX
+    
+    def first_paint(root, *args):
+        # Ausstehende Map- und Expose-Ereignisse abarbeiten: danach ist das Fenster gezeichnet
+        root.update()
+        loaded = 'matplotlib' in sys.modules
+        print(f"PAINTED {time.time():.6f} {int(loaded)}", flush=True)
+        app.cleanup()
+        os._exit(0)
+        
+    ctk.CTk.mainloop = first_paint
+    app = SystemMonitorX()
+    app.run()
+
+def run_once(eager: bool) -> tuple:
+    """Gibt (Sekunden bis zum ersten Zeichnen, matplotlib geladen) für einen neuen Prozess zurück"""
+    args = [sys.executable, __file__, '--child'] + (['--eager'] if eager else [])
+    started = time.time()
+    result = subprocess.run(args, capture_output=True, text=True, cwd=PROJECT_ROOT, timeout=120)
+    for line in result.stdout.splitlines():
+        if line.startswith("PAINTED "):
+            _, painted, loaded = line.split()
+            return float(painted) - started, loaded == "1"
+    raise RuntimeError(f"Kein Fenster gezeichnet: {result.stderr.strip()[-500:]}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Start-Benchmark")
+    parser.add_argument('--runs', type=int, default=5, help="Starts pro Variante (Standard: 5)")
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--eager', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.child:
+        child(args.eager)
+        return 0
+        
+    print(f"{'Variante':<22}{'Median':>10}{'Min':>10}{'Max':>10}  matplotlib beim Zeichnen")
+    for eager in (True, False):
+        times = []
+        loaded = False
+        for _ in range(args.runs):
+            elapsed, loaded = run_once(eager)
+            times.append(elapsed)
+        name = "vorher (matplotlib)" if eager else "nachher (verzögert)"
+        print(f"{name:<22}{statistics.median(times):>9.3f}s{min(times):>9.3f}s{max(times):>9.3f}s  "
+              f"{'geladen' if loaded else 'nicht geladen'}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+"""
+Fault-Injection für das Logging von SystemMonitorX
+Startet einen Schreib-Prozess, beendet ihn zu zufälligen Zeitpunkten hart (kill) und prüft danach,
+dass jede Log-Datei nach der Wiederherstellung lesbar ist und eine lückenlose Folge der geschriebenen Einträge enthält.
+Zusätzlich wird das Ende der zuletzt geschriebenen Datei an einer zufälligen Stelle abgeschnitten
+(wie ein Stromausfall mitten im Schreiben), sofern --no-tear nicht gesetzt ist.
+
+Aufruf: python tools/fault_injection.py [--runs 30] [--formats csv jsonl json binary compressed both]
+"""
+
+import argparse
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core import columnar_store, log_reader
+from core.data_logger import DataLogger
+from core.log_recovery import recover_log_dir
+from core.log_rotation import data_suffix, list_log_files
+from core.sample import SystemSample
+
+FORMATS = ["csv", "jsonl", "json", "binary", "compressed", "both"]
+
+def run_writer(log_dir: str, format_type: str, fsync: str):
+    """Schreib-Prozess: loggt fortlaufend nummerierte Einträge (cpu_percent = laufende Nummer)"""
+    logger = DataLogger(log_dir)
+    logger.save_interval = 0.01
+    logger.max_buffer_size = 50
+    logger.max_file_size_mb = 0.05  # Häufige Rotation, damit auch Komprimierung unterbrochen wird
+    logger.max_log_files = 100000
+    logger.max_total_size_mb = 100000
+    logger.fsync_policy = fsync
+    logger.BINARY_SEGMENT_ROWS = 500
+    logger.start_logging(format_type)
+    
+    gb = 1024**3
+    number = 0
+    while True:
+        sample = SystemSample()
+        sample.cpu_percent = float(number)
+        sample.cpu_count = 8
+        sample.memory_total, sample.memory_used, sample.memory_percent = 16 * gb, 8 * gb, 50.0
+        sample.disk_total, sample.disk_used, sample.disk_percent = 500 * gb, 200 * gb, 40.0
+        sample.platform, sample.machine = 'Test', 'x86_64'
+        logger.log_data(sample)
+        number += 1
+        if number % 20 == 0:
+            time.sleep(0.001)
+
+def tear_segment(path: Path, rng: random.Random) -> str:
+    """Nullt die Zeitstempel der letzten Zeilen eines Binär-Segments (Zeilenanzahl auf der Platte, Daten nicht)"""
+    header = columnar_store.read_segment_header(path)
+    row_count = min(header['row_count'], header['capacity'])
+    if row_count == 0:
+        return f"{path.suffix}-0R"
+    lost = rng.randint(1, min(50, row_count))
+    index = next(i for i, (name, _) in enumerate(header['columns']) if name == 'timestamp')
+    with open(path, 'r+b') as handle:
+        handle.seek(columnar_store.DATA_OFFSET + (index * header['capacity'] + row_count - lost) * 8)
+        handle.write(bytes(8 * lost))
+    return f"{path.suffix}-{lost}R"
+
+def tear_last_file(log_dir: Path, rng: random.Random) -> str:
+    """Schneidet die zuletzt geschriebene Datei jedes Formats an einer zufälligen Stelle der letzten 4 KB ab
+    
+    Binär-Segmente sind vorab alloziert und werden nie kürzer, dort gehen stattdessen die letzten Zeilen verloren.
+    """
+    torn = []
+    latest = {}
+    for path in list_log_files(log_dir):
+        # Komprimierte Dateien entstehen per rename und sind immer vollständig
+        if path.suffix != data_suffix(path):
+            continue
+        latest[data_suffix(path)] = max(latest.get(data_suffix(path), path), path, key=lambda file: file.name)
+    for path in latest.values():
+        if path.suffix == columnar_store.FILE_SUFFIX:
+            torn.append(tear_segment(path, rng))
+            continue
+        size = path.stat().st_size
+        cut = rng.randint(1, min(4096, max(1, size // 2)))
+        with open(path, 'r+b') as handle:
+            handle.truncate(size - cut)
+        torn.append(f"{path.suffix}-{cut}B")
+    return ','.join(torn)
+
+def verify(log_dir: Path) -> tuple:
+    """Prüft je Format, dass die gelesenen Nummern bei 0 beginnen und lückenlos sind"""
+    files = {}
+    for path in list_log_files(log_dir):
+        files.setdefault(data_suffix(path), []).append(path)
+        
+    counts = {}
+    for suffix, paths in files.items():
+        expected = 0
+        for path in sorted(paths, key=lambda file: log_reader.part_key(file)):
+            for record in log_reader.iter_file(path, fields=['cpu_percent']):
+                if int(record['cpu_percent']) != expected:
+                    return False, f"{path.name}: Nummer {int(record['cpu_percent'])} statt {expected}"
+                expected += 1
+        counts[suffix] = expected
+    return True, counts
+
+def main():
+    parser = argparse.ArgumentParser(description="Fault-Injection für das Logging")
+    parser.add_argument('--runs', type=int, default=30, help="Anzahl Abbrüche")
+    parser.add_argument('--formats', nargs='+', default=FORMATS, choices=FORMATS)
+    parser.add_argument('--fsync', default="always", choices=["always", "interval", "never"])
+    parser.add_argument('--min-delay', type=float, default=0.3, help="Frühester Abbruch in Sekunden")
+    parser.add_argument('--max-delay', type=float, default=2.0, help="Spätester Abbruch in Sekunden")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--no-tear', action='store_true', help="Dateien nach dem Abbruch nicht zusätzlich abschneiden")
+    parser.add_argument('--writer', nargs=3, metavar=('LOG_DIR', 'FORMAT', 'FSYNC'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.writer:
+        run_writer(*args.writer)
+        return 0
+        
+    rng = random.Random(args.seed)
+    failures = 0
+    for run in range(args.runs):
+        format_type = args.formats[run % len(args.formats)]
+        delay = rng.uniform(args.min_delay, args.max_delay)
+        with tempfile.TemporaryDirectory() as temp:
+            log_dir = Path(temp) / "logs"
+            process = subprocess.Popen([sys.executable, __file__, '--writer', str(log_dir), format_type, args.fsync],
+                                       stdout=subprocess.DEVNULL)
+            time.sleep(delay)
+            process.kill()
+            process.wait()
+            
+            torn = "" if args.no_tear else tear_last_file(log_dir, rng)
+            repaired = recover_log_dir(log_dir)
+            ok, result = verify(log_dir)
+            status = "OK    " if ok else "FEHLER"
+            print(f"{status} Lauf {run + 1:3d}  {format_type:<10} Abbruch nach {delay:5.2f}s  {torn:<22} "
+                  f"repariert: {len(repaired)}  {result}")
+            failures += not ok
+            
+    print(f"\n{args.runs - failures}/{args.runs} Läufe ohne Datenverlust außer dem abgebrochenen Ende")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""
+Dauertest der Graph-Fenster von SystemMonitorX
+Öffnet und schließt viele Graph-Fenster und prüft, dass Speicher und Anzahl lebender Figures konstant bleiben.
+Es sind jeweils mehrere Fenster gleichzeitig offen (mehr als der Pool aufnimmt), damit auch verworfene
+Figures freigegeben werden müssen.
+
+Aufruf: python tools/soak_graph_windows.py [--windows 100] [--open 5] [--rows 3600] [--headless]
+Ohne Display (oder mit --headless) werden die Fenster durch eine Agg-Leinwand ersetzt.
+"""
+
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+import numpy as np
+import psutil
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+GRAPH_TYPES = ("overview", "cpu", "memory", "disk")
+
+def generate_columns(rows: int, seed: int = 42) -> dict:
+    """Erzeugt Spalten wie aus dem Verlaufsspeicher (1 Hz)"""
+    rng = np.random.default_rng(seed)
+    return {
+        'timestamp': time.time() - rows + np.arange(rows, dtype=float),
+        'cpu_percent': rng.uniform(0, 100, rows),
+        'memory_percent': rng.uniform(40, 60, rows),
+        'memory_used_gb': rng.uniform(6, 10, rows),
+        'memory_total_gb': np.full(rows, 16.0),
+        'disk_percent': np.full(rows, 42.0),
+        'disk_used_gb': np.full(rows, 210.0),
+        'disk_total_gb': np.full(rows, 500.0)
+    }
+
+def open_tk(viewer, root, columns: dict, graph_type: str):
+    """Öffnet ein echtes Graph-Fenster und zeichnet es"""
+    window = viewer.create_tkinter_window(columns, graph_type)
+    root.update()
+    return window
+
+def close_tk(viewer, root, window):
+    """Schließt ein Graph-Fenster über den Fenster-Schließen-Knopf"""
+    window.tk.eval(window.protocol("WM_DELETE_WINDOW"))
+    root.update()
+
+def open_headless(viewer, root, columns: dict, graph_type: str):
+    """Wie open_tk, mit Agg-Leinwand statt Fenster"""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    fig = getattr(viewer, f"create_{'system_overview' if graph_type == 'overview' else graph_type}_graph")(columns)
+    FigureCanvasAgg(fig).draw()
+    return fig
+
+def close_headless(viewer, root, fig):
+    """Gibt die Figure wie beim Schließen des Fensters zurück"""
+    viewer.release_figure(fig)
+
+def measure() -> tuple:
+    """Gibt (Python-Heap in Bytes, RSS in Bytes, lebende Figures) nach einer vollständigen Garbage Collection zurück"""
+    from matplotlib.figure import Figure
+    gc.collect()
+    figures = sum(1 for obj in gc.get_objects() if isinstance(obj, Figure))
+    return tracemalloc.get_traced_memory()[0], psutil.Process().memory_info().rss, figures
+
+def main():
+    parser = argparse.ArgumentParser(description="Dauertest der Graph-Fenster")
+    parser.add_argument('--windows', type=int, default=100, help="Anzahl Fenster (Standard: 100)")
+    parser.add_argument('--open', type=int, default=5,
+                        help="Gleichzeitig offene Fenster je Graph-Typ (Standard: 5, mehr als der Pool hält)")
+    parser.add_argument('--rows', type=int, default=3600, help="Messwerte pro Graph (Standard: 3600)")
+    parser.add_argument('--headless', action='store_true', help="Ohne Tk-Fenster testen")
+    parser.add_argument('--max-growth', type=float, default=1.0,
+                        help="Erlaubter Zuwachs des Python-Heaps in MB (Standard: 1.0)")
+    args = parser.parse_args()
+    
+    root = None
+    if not args.headless:
+        import tkinter as tk
+        try:
+            root = tk.Tk()
+            root.withdraw()
+        except tk.TclError:
+            print("Kein Display verfügbar, teste ohne Tk-Fenster")
+    if root is None:
+        import matplotlib
+        matplotlib.use('Agg')
+        
+    from core.graph_viewer import GraphViewer
+    viewer = GraphViewer()
+    columns = generate_columns(args.rows)
+    
+    open_window, close_window = (open_tk, close_tk) if root is not None else (open_headless, close_headless)
+    
+    def cycle(count: int):
+        # Fenster gruppenweise öffnen und erst dann alle schließen (je Graph-Typ mehr als der Pool hält)
+        group = args.open * len(GRAPH_TYPES)
+        for first in range(0, count, group):
+            windows = [open_window(viewer, root, columns, GRAPH_TYPES[i % len(GRAPH_TYPES)])
+                       for i in range(first, min(count, first + group))]
+            for window in windows:
+                close_window(viewer, root, window)
+            del windows
+            
+    # Aufwärmen: Pool füllen, Schriften und Caches laden
+    tracemalloc.start()
+    cycle(args.open * len(GRAPH_TYPES))
+    heap_before, rss_before, figures_before = measure()
+    
+    started = time.perf_counter()
+    cycle(args.windows)
+    elapsed = time.perf_counter() - started
+    heap_after, rss_after, figures_after = measure()
+    tracemalloc.stop()
+    
+    growth = (heap_after - heap_before) / 1024**2
+    print(f"{args.windows} Fenster in {elapsed:.1f}s ({1000 * elapsed / args.windows:.0f} ms pro Fenster)")
+    print(f"Python-Heap: {heap_before / 1024**2:.1f} MB -> {heap_after / 1024**2:.1f} MB ({growth:+.2f} MB)")
+    print(f"RSS:         {rss_before / 1024**2:.1f} MB -> {rss_after / 1024**2:.1f} MB")
+    print(f"Figures:     {figures_before} -> {figures_after}")
+    print(f"Pool:        {viewer.pool.get_stats()}")
+    
+    if figures_after > figures_before or growth > args.max_growth:
+        print("FEHLER: Speicher wächst mit der Anzahl geöffneter Fenster")
+        return 1
+    print("OK")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,6 +6,7 @@ from typing import Dict, Any, Optional
 from PIL import Image, ImageTk, ImageDraw
 import os
 from pathlib import Path
+from core.sample import SystemSample
 
 class RoundedWidgetFrame(tk.Frame):
     def __init__(self, parent, bg_color="#1a1a1a", corner_radius=20, **kwargs):
@@ -43,7 +44,7 @@ class RoundedWidgetFrame(tk.Frame):
         super().configure(**kwargs)
 
 class DesktopWidget:
-    def __init__(self, widget_type: str, data: Dict[str, Any], parent_window=None, config_manager=None, theme_manager=None):
+    def __init__(self, widget_type: str, data: Optional[SystemSample], parent_window=None, config_manager=None, theme_manager=None):
         self.widget_type = widget_type
         self.data = data
         self.parent_window = parent_window
@@ -263,38 +264,32 @@ class DesktopWidget:
 
     def _update_display(self):
         try:
-            if not self.data:
+            sample = self.data
+            if not sample:
                 return
                 
-            if self.widget_type == "cpu" and 'cpu' in self.data:
-                cpu_info = self.data['cpu']
-                usage_percent = cpu_info['percent']
+            if self.widget_type == "cpu" and sample.has_cpu:
+                usage_percent = sample.cpu_percent
                 self.value_label.configure(text=f"{usage_percent:.1f}%")
                 self._update_progress_bar(usage_percent)
                 
-            elif self.widget_type == "memory" and 'memory' in self.data:
-                mem_info = self.data['memory']
-                usage_percent = mem_info['percent']
-                used_gb = mem_info['used'] / (1024**3)  # Bytes zu GB
-                total_gb = mem_info['total'] / (1024**3)  # Bytes zu GB
+            elif self.widget_type == "memory" and sample.has_memory:
+                usage_percent = sample.memory_percent
+                total_gb = sample.memory_total / (1024**3)  # Bytes zu GB
                 self.value_label.configure(text=f"{usage_percent:.1f}%")
                 self.info_label.configure(text=f"Gesamt: {total_gb:.1f} GB")
                 self._update_progress_bar(usage_percent)
                 
-            elif self.widget_type == "disk" and 'disk' in self.data:
-                disk_info = self.data['disk']
-                usage_percent = disk_info['percent']
-                used_gb = disk_info['used'] / (1024**3)  # Bytes zu GB
-                total_gb = disk_info['total'] / (1024**3)  # Bytes zu GB
+            elif self.widget_type == "disk" and sample.has_disk:
+                usage_percent = sample.disk_percent
+                total_gb = sample.disk_total / (1024**3)  # Bytes zu GB
                 self.value_label.configure(text=f"{usage_percent:.1f}%")
                 self.info_label.configure(text=f"Gesamt: {total_gb:.1f} GB")
                 self._update_progress_bar(usage_percent)
                 
-            elif self.widget_type == "system" and 'system' in self.data:
-                sys_info = self.data['system']
-                username = sys_info.get('username', 'Unknown')
+            elif self.widget_type == "system":
                 self.value_label.configure(text="Online")
-                self.info_label.configure(text=f"Online: {username}")
+                self.info_label.configure(text=f"Online: {sample.username}")
                 
         except Exception as e:
             print(f"Fehler beim Aktualisieren des Widgets: {e}")
@@ -325,7 +320,7 @@ class DesktopWidget:
         except Exception as e:
             print(f"Fehler beim Aktualisieren der Progress Bar: {e}")
 
-    def update_data(self, data: Dict[str, Any]):
+    def update_data(self, data: SystemSample):
         self.data = data
 
     def destroy(self):